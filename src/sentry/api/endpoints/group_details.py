@@ -400,6 +400,7 @@ class GroupDetailsEndpoint(GroupEndpoint, EnvironmentMixin):
                 project_id=group.project_id,
                 group__id=group.id,
             ).delete()
+            GroupHash.objects.clear_project_cache(group.project_id)
 
             delete_groups.apply_async(
                 kwargs={
@@ -274,6 +274,7 @@ def handle_discard(request, group_list, projects, user):
                 )
 
     for project in projects:
+        GroupHash.objects.clear_project_cache(project.id)
         _delete_groups(request, project, groups_to_delete.get(project.id), delete_type='discard')
 
     return Response(status=204)
@@ -302,6 +303,7 @@ def _delete_groups(request, project, group_list, delete_type):
         project_id=project.id,
         group__id__in=group_ids,
     ).delete()
+    GroupHash.objects.clear_project_cache(project.id)
 
     delete_groups_task.apply_async(
         kwargs={
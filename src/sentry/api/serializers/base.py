@@ -1,9 +1,32 @@
 from __future__ import absolute_import
 
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections, connections
+
+from sentry.utils import metrics
 
 registry = {}
 
+# Worker pools for ``run_loaders``, keyed by their size. They live for the
+# life of the process so that worker threads can keep their database
+# connections between requests.
+_loader_executors = {}
+_loader_executors_lock = threading.Lock()
+
+
+def _get_loader_executor(max_workers):
+    with _loader_executors_lock:
+        executor = _loader_executors.get(max_workers)
+        if executor is None:
+            executor = _loader_executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers,
+            )
+        return executor
+
 
 def serialize(objects, user=None, serializer=None, *args, **kwargs):
     if user is None:
@@ -42,6 +65,41 @@ def serialize(objects, user=None, serializer=None, *args, **kwargs):
     return [serializer(o, attrs=attrs.get(o, {}), user=user, *args, **kwargs) for o in objects]
 
 
+def run_loaders(loaders, name):
+    """
+    Calls each of the given ``{key: loader}`` callables, which must not depend
+    on each other, and returns a dictionary mapping every key to the result of
+    its loader. Every loader is timed as ``serializers.loader``, tagged with
+    the ``name`` of the serializer and the key.
+
+    The loaders are called on a process wide pool of
+    ``SENTRY_SERIALIZER_CONCURRENCY`` threads, each with its own database
+    connections. Inside of a transaction, the loaders are called one after
+    another instead, as other connections would not see its changes.
+    """
+    def _load(key):
+        with metrics.timer('serializers.loader', tags={'serializer': name, 'loader': key}):
+            return loaders[key]()
+
+    def _load_in_thread(key):
+        try:
+            return _load(key)
+        finally:
+            # Worker threads do not see the request signals, so they close
+            # connections that have outlived ``CONN_MAX_AGE`` or are broken
+            # themselves, the same way a request would.
+            close_old_connections()
+
+    concurrency = settings.SENTRY_SERIALIZER_CONCURRENCY
+    if concurrency <= 1 or len(loaders) <= 1 or \
+            any(c.in_atomic_block for c in connections.all()):
+        return {key: _load(key) for key in loaders}
+
+    executor = _get_loader_executor(concurrency)
+    futures = [(key, executor.submit(_load_in_thread, key)) for key in loaders]
+    return {key: future.result() for key, future in futures}
+
+
 def register(type):
     def wrapped(cls):
         registry[type] = cls()
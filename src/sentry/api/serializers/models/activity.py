@@ -5,6 +5,7 @@ import six
 
 from sentry.api.serializers import Serializer, register, serialize
 from sentry.models import Activity, Commit, Group, PullRequest
+from sentry.utils.db import attach_foreignkey_from_cache
 from sentry.utils.functional import apply_values
 
 
@@ -121,6 +122,7 @@ class OrganizationActivitySerializer(ActivitySerializer):
             )
         }
 
+        attach_foreignkey_from_cache(item_list, Activity.project)
         projects = {d['id']: d for d in serialize(set(i.project for i in item_list), user)}
 
         for item in item_list:
@@ -11,18 +11,18 @@ from django.db.models import Min, Q
 from django.utils import timezone
 
 from sentry import tagstore, tsdb
-from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers import Serializer, register, run_loaders, serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.fields.actor import Actor
 from sentry.constants import LOG_LEVELS, StatsPeriod
 from sentry.models import (
     Commit, Environment, Group, GroupAssignee, GroupBookmark, GroupEnvironment, GroupLink, GroupMeta,
     GroupResolution, GroupSeen, GroupSnooze, GroupShare, GroupStatus, GroupSubscription,
-    GroupSubscriptionReason, Integration, User, UserOption, UserOptionValue
+    GroupSubscriptionReason, OrganizationIntegration, User, UserOption, UserOptionValue
 )
 from sentry.tagstore.snuba.backend import SnubaTagStorage
 from sentry.tsdb.snuba import SnubaTSDB
-from sentry.utils.db import attach_foreignkey
+from sentry.utils.db import attach_foreignkey_from_cache
 from sentry.utils.http import absolute_uri
 from sentry.utils.safe import safe_execute
 
@@ -126,83 +126,152 @@ class GroupSerializerBase(Serializer):
 
         return results
 
-    def get_attrs(self, item_list, user):
-        from sentry.plugins import plugins
-
-        GroupMeta.objects.populate_cache(item_list)
-
-        attach_foreignkey(item_list, Group.project)
+    def _get_bookmarks(self, item_list, user):
+        return set(
+            GroupBookmark.objects.filter(
+                user=user,
+                group__in=item_list,
+            ).values_list('group_id', flat=True)
+        )
 
-        if user.is_authenticated() and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(
-                    user=user,
-                    group__in=item_list,
-                ).values_list('group_id', flat=True)
-            )
-            seen_groups = dict(
-                GroupSeen.objects.filter(
-                    user=user,
-                    group__in=item_list,
-                ).values_list('group_id', 'last_seen')
-            )
-            subscriptions = self._get_subscriptions(item_list, user)
-        else:
-            bookmarks = set()
-            seen_groups = {}
-            subscriptions = defaultdict(lambda: (False, None))
+    def _get_seen_groups(self, item_list, user):
+        return dict(
+            GroupSeen.objects.filter(
+                user=user,
+                group__in=item_list,
+            ).values_list('group_id', 'last_seen')
+        )
 
+    def _get_assignees(self, item_list, user):
         assignees = {
             a.group_id: a.assigned_actor() for a in
             GroupAssignee.objects.filter(
                 group__in=item_list,
             )
         }
-        resolved_assignees = Actor.resolve_dict(assignees)
+        return Actor.resolve_dict(assignees)
 
-        ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(
+    def _get_ignore_items(self, item_list, user):
+        return {g.group_id: g for g in GroupSnooze.objects.filter(
             group__in=item_list,
         )}
 
+    def _get_release_resolutions(self, resolved_item_list, user):
+        return {
+            i[0]: i[1:]
+            for i in GroupResolution.objects.filter(
+                group__in=resolved_item_list,
+            ).values_list(
+                'group',
+                'type',
+                'release__version',
+                'actor_id',
+            )
+        }
+
+    def _get_commit_resolutions(self, resolved_item_list, user):
+        # due to our laziness, and django's inability to do a reasonable join here
+        # we end up with two queries
+        commit_results = list(Commit.objects.extra(
+            select={
+                'group_id': 'sentry_grouplink.group_id',
+            },
+            tables=['sentry_grouplink'],
+            where=[
+                'sentry_grouplink.linked_id = sentry_commit.id',
+                'sentry_grouplink.group_id IN ({})'.format(
+                    ', '.join(six.text_type(i.id) for i in resolved_item_list)),
+                'sentry_grouplink.linked_type = %s',
+                'sentry_grouplink.relationship = %s',
+            ],
+            params=[
+                int(GroupLink.LinkedType.commit),
+                int(GroupLink.Relationship.resolves),
+            ]
+        ))
+        return {
+            i.group_id: d for i, d in itertools.izip(commit_results, serialize(commit_results, user))
+        }
+
+    def _get_share_ids(self, item_list, user):
+        return dict(GroupShare.objects.filter(
+            group__in=item_list,
+        ).values_list('group_id', 'uuid'))
+
+    def _get_integrations(self, item_list, user):
+        """
+        Returns a mapping of organization IDs to the integrations that can
+        annotate the groups of that organization.
+        """
+        from sentry.integrations import IntegrationFeatures
+
+        organization_ids = set(item.project.organization_id for item in item_list)
+        integrations = defaultdict(list)
+        for org_integration in OrganizationIntegration.objects.filter(
+                organization_id__in=organization_ids).select_related('integration'):
+            integration = org_integration.integration
+            if not (integration.has_feature(IntegrationFeatures.ISSUE_BASIC) or integration.has_feature(
+                    IntegrationFeatures.ISSUE_SYNC)):
+                continue
+            integrations[org_integration.organization_id].append(integration)
+        return integrations
+
+    def _get_attr_loaders(self, item_list, user):
+        """
+        Returns a mapping of attribute names to callables which load them for
+        all of the given groups. The loaders do not depend on each other and
+        may run concurrently, see ``run_loaders``.
+        """
+        loaders = {
+            'assignees': lambda: self._get_assignees(item_list, user),
+            'ignore_items': lambda: self._get_ignore_items(item_list, user),
+            'share_ids': lambda: self._get_share_ids(item_list, user),
+            'integrations': lambda: self._get_integrations(item_list, user),
+            'seen_stats': lambda: self._get_seen_stats(item_list, user),
+        }
+
+        if user.is_authenticated() and item_list:
+            loaders.update({
+                'bookmarks': lambda: self._get_bookmarks(item_list, user),
+                'seen_groups': lambda: self._get_seen_groups(item_list, user),
+                'subscriptions': lambda: self._get_subscriptions(item_list, user),
+            })
+
         resolved_item_list = [i for i in item_list if i.status == GroupStatus.RESOLVED]
         if resolved_item_list:
-            release_resolutions = {
-                i[0]: i[1:]
-                for i in GroupResolution.objects.filter(
-                    group__in=resolved_item_list,
-                ).values_list(
-                    'group',
-                    'type',
-                    'release__version',
-                    'actor_id',
-                )
-            }
+            loaders.update({
+                'release_resolutions': lambda: self._get_release_resolutions(
+                    resolved_item_list, user),
+                'commit_resolutions': lambda: self._get_commit_resolutions(
+                    resolved_item_list, user),
+            })
 
-            # due to our laziness, and django's inability to do a reasonable join here
-            # we end up with two queries
-            commit_results = list(Commit.objects.extra(
-                select={
-                    'group_id': 'sentry_grouplink.group_id',
-                },
-                tables=['sentry_grouplink'],
-                where=[
-                    'sentry_grouplink.linked_id = sentry_commit.id',
-                    'sentry_grouplink.group_id IN ({})'.format(
-                        ', '.join(six.text_type(i.id) for i in resolved_item_list)),
-                    'sentry_grouplink.linked_type = %s',
-                    'sentry_grouplink.relationship = %s',
-                ],
-                params=[
-                    int(GroupLink.LinkedType.commit),
-                    int(GroupLink.Relationship.resolves),
-                ]
-            ))
-            commit_resolutions = {
-                i.group_id: d for i, d in itertools.izip(commit_results, serialize(commit_results, user))
-            }
-        else:
-            release_resolutions = {}
-            commit_resolutions = {}
+        return loaders
+
+    def get_attrs(self, item_list, user):
+        GroupMeta.objects.populate_cache(item_list)
+
+        attach_foreignkey_from_cache(item_list, Group.project)
+
+        loaded = run_loaders(
+            self._get_attr_loaders(item_list, user),
+            name=type(self).__name__,
+        )
+        return self._build_attrs(item_list, user, loaded)
+
+    def _build_attrs(self, item_list, user, loaded):
+        from sentry.plugins import plugins
+
+        bookmarks = loaded.get('bookmarks', set())
+        seen_groups = loaded.get('seen_groups', {})
+        subscriptions = loaded.get('subscriptions', defaultdict(lambda: (False, None)))
+        resolved_assignees = loaded['assignees']
+        ignore_items = loaded['ignore_items']
+        release_resolutions = loaded.get('release_resolutions', {})
+        commit_resolutions = loaded.get('commit_resolutions', {})
+        share_ids = loaded['share_ids']
+        integrations = loaded['integrations']
+        seen_stats = loaded['seen_stats']
 
         actor_ids = set(r[-1] for r in six.itervalues(release_resolutions))
         actor_ids.update(r.actor_id for r in six.itervalues(ignore_items))
@@ -215,14 +284,8 @@ class GroupSerializerBase(Serializer):
         else:
             actors = {}
 
-        share_ids = dict(GroupShare.objects.filter(
-            group__in=item_list,
-        ).values_list('group_id', 'uuid'))
-
         result = {}
 
-        seen_stats = self._get_seen_stats(item_list, user)
-
         for item in item_list:
             active_date = item.active_at or item.first_seen
 
@@ -234,13 +297,7 @@ class GroupSerializerBase(Serializer):
                     safe_execute(plugin.get_annotations, group=item, _with_transaction=False) or ()
                 )
 
-            from sentry.integrations import IntegrationFeatures
-            for integration in Integration.objects.filter(
-                    organizations=item.project.organization_id):
-                if not (integration.has_feature(IntegrationFeatures.ISSUE_BASIC) or integration.has_feature(
-                        IntegrationFeatures.ISSUE_SYNC)):
-                    continue
-
+            for integration in integrations.get(item.project.organization_id, ()):
                 install = integration.get_installation(item.project.organization_id)
                 annotations.extend(
                     safe_execute(install.get_annotations, group=item, _with_transaction=False) or ()
@@ -499,11 +556,19 @@ class StreamGroupSerializer(GroupSerializer, GroupStatsMixin):
 
         return stats
 
-    def get_attrs(self, item_list, user):
-        attrs = super(StreamGroupSerializer, self).get_attrs(item_list, user)
+    def _get_attr_loaders(self, item_list, user):
+        loaders = super(StreamGroupSerializer, self)._get_attr_loaders(item_list, user)
 
         if self.stats_period:
-            stats = self.get_stats(item_list, user)
+            loaders['stats'] = lambda: self.get_stats(item_list, user)
+
+        return loaders
+
+    def _build_attrs(self, item_list, user, loaded):
+        attrs = super(StreamGroupSerializer, self)._build_attrs(item_list, user, loaded)
+
+        if self.stats_period:
+            stats = loaded['stats']
             for item in item_list:
                 attrs[item].update({
                     'stats': stats[item.id],
@@ -620,11 +685,19 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             **query_params
         )
 
-    def get_attrs(self, item_list, user):
-        attrs = super(StreamGroupSerializerSnuba, self).get_attrs(item_list, user)
+    def _get_attr_loaders(self, item_list, user):
+        loaders = super(StreamGroupSerializerSnuba, self)._get_attr_loaders(item_list, user)
+
+        if self.stats_period:
+            loaders['stats'] = lambda: self.get_stats(item_list, user)
+
+        return loaders
+
+    def _build_attrs(self, item_list, user, loaded):
+        attrs = super(StreamGroupSerializerSnuba, self)._build_attrs(item_list, user, loaded)
 
         if self.stats_period:
-            stats = self.get_stats(item_list, user)
+            stats = loaded['stats']
             for item in item_list:
                 attrs[item].update({
                     'stats': stats[item.id],
@@ -21,6 +21,7 @@ from sentry.models import (
     ProjectStatus, ProjectTeam, Release, ReleaseProjectEnvironment, Deploy, UserOption, DEFAULT_SUBJECT_TEMPLATE
 )
 from sentry.utils.data_filters import FilterTypes
+from sentry.utils.db import attach_foreignkey_from_cache
 
 STATUS_LABELS = {
     ProjectStatus.VISIBLE: 'active',
@@ -53,6 +54,8 @@ class ProjectSerializer(Serializer):
     def get_access_by_project(self, item_list, user):
         request = env.request
 
+        attach_foreignkey_from_cache(item_list, Project.organization)
+
         project_teams = list(
             ProjectTeam.objects.filter(
                 project__in=item_list,
@@ -10,12 +10,36 @@ from __future__ import absolute_import
 import logging
 import six
 
-from django.db.models import F
+from collections import defaultdict
+from django.db import connections, router
+from django.db.models import F, Model
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils.db import is_postgres
 from sentry.utils.services import Service
 
+# Auto fields report their creation type (``serial``) rather than the
+# type of the column, which is what we need when casting literals.
+AUTO_FIELD_CAST_TYPES = {
+    'serial': 'integer',
+    'bigserial': 'bigint',
+}
+
+
+def _get_field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    for field in model._meta.fields:
+        if name in (field.name, field.attname):
+            return field
+    raise ValueError('Unknown field %r on %r' % (name, model))
+
+
+def _get_cast_type(field, connection):
+    db_type = field.db_type(connection)
+    return AUTO_FIELD_CAST_TYPES.get(db_type, db_type)
+
 
 class BufferMount(type):
     def __new__(cls, name, bases, attrs):
@@ -38,7 +62,7 @@ class Buffer(Service):
     This is useful in situations where a single event might be happening so fast that the queue cant
     keep up with the updates.
     """
-    __all__ = ('incr', 'process', 'process_pending', 'validate')
+    __all__ = ('incr', 'incr_multi', 'process', 'process_batch', 'process_pending', 'validate')
 
     def incr(self, model, columns, filters, extra=None):
         """
@@ -53,6 +77,16 @@ class Buffer(Service):
             }
         )
 
+    def incr_multi(self, items):
+        """
+        Increments several rows at once. ``items`` is a sequence of
+        ``(model, columns, filters, extra)`` tuples.
+
+        >>> incr_multi([(Group, {'times_seen': 1}, {'pk': group.pk}, None)])
+        """
+        for model, columns, filters, extra in items:
+            self.incr(model, columns, filters, extra)
+
     def process_pending(self, partition=None):
         return []
 
@@ -83,3 +117,150 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, items):
+        """
+        Applies several buffered increments at once. ``items`` is a sequence
+        of ``(model, columns, filters, extra)`` tuples.
+
+        On PostgreSQL rows sharing a model and the same filter, counter and
+        extra columns are written with a single ``UPDATE ... FROM (VALUES
+        ...)`` statement. Rows which cannot be batched, or which did not match
+        an existing row, are written one at a time like ``Buffer.process``.
+
+        Returns the items which could not be written so the caller can
+        retry them.
+        """
+        batches = defaultdict(list)
+        for model, columns, filters, extra in items:
+            signature = (
+                model,
+                tuple(sorted(filters)),
+                tuple(sorted(columns)),
+                tuple(sorted(extra or ())),
+            )
+            batches[signature].append((columns, filters, extra))
+
+        failed = []
+
+        for (model, filter_keys, column_keys, extra_keys), rows in six.iteritems(batches):
+            using = router.db_for_write(model)
+            batchable = filter_keys and (column_keys or extra_keys)
+            remaining = rows
+            if len(rows) > 1 and batchable and is_postgres(using):
+                try:
+                    remaining = self._process_many(
+                        model, filter_keys, column_keys, extra_keys, rows, using)
+                except Exception:
+                    # The batched UPDATE is a single statement, so nothing
+                    # was written and every row can still go through the
+                    # per-row path.
+                    self.logger.exception('buffer.batch-update-failed')
+
+            for columns, filters, extra in remaining:
+                # Subclasses such as ``RedisBuffer`` override ``process`` with
+                # a different signature, so always use the base implementation.
+                try:
+                    Buffer.process(self, model, columns, filters, extra)
+                except Exception:
+                    self.logger.exception('buffer.process-failed')
+                    failed.append((model, columns, filters, extra))
+
+        return failed
+
+    def _process_many(self, model, filter_keys, column_keys, extra_keys, rows, using):
+        """
+        Updates all existing rows in ``rows`` with one statement and returns
+        the rows which still need to go through ``process``.
+        """
+        from sentry.models import Group
+
+        connection = connections[using]
+        qn = connection.ops.quote_name
+
+        filter_fields = [_get_field(model, k) for k in filter_keys]
+        column_fields = [_get_field(model, k) for k in column_keys]
+        extra_fields = [_get_field(model, k) for k in extra_keys]
+
+        # ``UPDATE ... FROM`` is undefined when several source rows match the
+        # same target row, so only the first occurrence of a filter is batched.
+        remaining = []
+        batch = []
+        seen = set()
+        for columns, filters, extra in rows:
+            lookup = tuple(
+                filters[k].pk if isinstance(filters[k], Model) else filters[k]
+                for k in filter_keys
+            )
+            if lookup in seen:
+                remaining.append((columns, filters, extra))
+                continue
+            seen.add(lookup)
+            batch.append((lookup, columns, filters, extra))
+
+        aliases = ['i'] + \
+            ['f%d' % i for i in range(len(filter_fields))] + \
+            ['c%d' % i for i in range(len(column_fields))] + \
+            ['e%d' % i for i in range(len(extra_fields))]
+        casts = ['integer'] + [
+            _get_cast_type(field, connection)
+            for field in filter_fields + column_fields + extra_fields
+        ]
+        row_sql = '(%s)' % ', '.join('%%s::%s' % cast for cast in casts)
+
+        params = []
+        for idx, (lookup, columns, filters, extra) in enumerate(batch):
+            params.append(idx)
+            for field, value in zip(filter_fields, lookup):
+                params.append(field.get_db_prep_save(value, connection))
+            for field, key in zip(column_fields, column_keys):
+                params.append(columns[key])
+            for field, key in zip(extra_fields, extra_keys):
+                params.append(field.get_db_prep_save(extra[key], connection))
+
+        assignments = []
+        for i, field in enumerate(column_fields):
+            assignments.append('%s = t.%s + v.c%d' % (
+                qn(field.column), qn(field.column), i))
+        for i, field in enumerate(extra_fields):
+            assignments.append('%s = v.e%d' % (qn(field.column), i))
+
+        # Mirrors ``ScoreClause`` which ``process`` attaches to group updates.
+        if model is Group and 'last_seen' in extra_keys and 'times_seen' in column_keys:
+            assignments.append(
+                'score = log(t.times_seen + v.c%d) * 600 + '
+                'floor(extract(epoch from v.e%d))' % (
+                    column_keys.index('times_seen'),
+                    extra_keys.index('last_seen'),
+                )
+            )
+
+        sql = 'UPDATE %s AS t SET %s FROM (VALUES %s) AS v(%s) WHERE %s RETURNING v.i' % (
+            qn(model._meta.db_table),
+            ', '.join(assignments),
+            ', '.join([row_sql] * len(batch)),
+            ', '.join(aliases),
+            ' AND '.join(
+                't.%s = v.f%d' % (qn(field.column), i)
+                for i, field in enumerate(filter_fields)
+            ),
+        )
+
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        updated = set(r[0] for r in cursor.fetchall())
+
+        for idx, (lookup, columns, filters, extra) in enumerate(batch):
+            if idx not in updated:
+                remaining.append((columns, filters, extra))
+                continue
+            buffer_incr_complete.send_robust(
+                model=model,
+                columns=columns,
+                filters=filters,
+                extra=extra,
+                created=False,
+                sender=model,
+            )
+
+        return remaining
@@ -0,0 +1,143 @@
+"""
+sentry.buffer.coalescing
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+:copyright: (c) 2010-2018 by the Sentry Team, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+from __future__ import absolute_import
+
+import threading
+import six
+
+from collections import OrderedDict
+from time import time
+
+from django.db.models import Model
+
+from sentry.buffer.base import Buffer
+from sentry.utils import metrics
+from sentry.utils.flush import register_flush, unregister_flush
+from sentry.utils.imports import import_string
+
+
+class CoalescingBuffer(Buffer):
+    """
+    A write-behind layer which merges increments for the same row within a
+    process before handing them to the wrapped buffer.
+
+    Counters for the same ``(model, filters)`` are summed and extra values are
+    last write wins. Pending increments are flushed in one ``incr_multi`` call
+    once ``flush_interval`` seconds have passed or ``max_pending`` rows are
+    queued, as well as when a task finishes and when the process exits.
+
+    >>> SENTRY_BUFFER = 'sentry.buffer.coalescing.CoalescingBuffer'
+    >>> SENTRY_BUFFER_OPTIONS = {
+    >>>     'backend': 'sentry.buffer.redis.RedisBuffer',
+    >>>     'backend_options': {},
+    >>>     'flush_interval': 1,
+    >>>     'max_pending': 500,
+    >>> }
+    """
+
+    def __init__(self, backend, backend_options=None, flush_interval=1, max_pending=500):
+        if isinstance(backend, six.string_types):
+            backend = import_string(backend)
+        self.backend = backend(**(backend_options or {}))
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        assert self.max_pending > 0
+
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._last_flush = time()
+
+        self.connect_signals()
+
+    def connect_signals(self):
+        register_flush(self)
+
+    def close(self):
+        """
+        Flushes all pending increments and stops flushing this buffer when a
+        task finishes or the process exits.
+        """
+        unregister_flush(self)
+        self.flush()
+
+    def _make_key(self, model, filters):
+        return (model, tuple(sorted(
+            (k, v.pk if isinstance(v, Model) else v) for k, v in six.iteritems(filters)
+        )))
+
+    def validate(self):
+        self.backend.validate()
+
+    def incr(self, model, columns, filters, extra=None):
+        key = self._make_key(model, filters)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = (model, dict(columns), filters, dict(extra or {}))
+            else:
+                for column, amount in six.iteritems(columns):
+                    pending[1][column] = pending[1].get(column, 0) + amount
+                if extra:
+                    pending[3].update(extra)
+                metrics.incr('buffer.coalesced', skip_internal=True, tags={
+                    'module': model.__module__,
+                    'model': model.__name__,
+                })
+
+            should_flush = len(self._pending) >= self.max_pending or \
+                time() - self._last_flush >= self.flush_interval
+
+        if should_flush:
+            self.flush()
+
+    def incr_multi(self, items):
+        for model, columns, filters, extra in items:
+            self.incr(model, columns, filters, extra)
+
+    def flush(self):
+        """
+        Writes all pending increments to the wrapped buffer.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+            self._last_flush = time()
+
+        if not pending:
+            return
+
+        metrics.timing('buffer.coalesced-flush-size', len(pending))
+        try:
+            self.backend.incr_multi([
+                (model, columns, filters, extra or None)
+                for model, columns, filters, extra in six.itervalues(pending)
+            ])
+        except Exception:
+            # Keep the increments for the next flush. Increments queued in
+            # the meantime are newer, so their extra values win.
+            self.logger.exception('buffer.coalesced-flush-failed')
+            metrics.incr('buffer.coalesced-flush-failed', amount=len(pending))
+            with self._lock:
+                for key, (model, columns, filters, extra) in six.iteritems(self._pending):
+                    previous = pending.get(key)
+                    if previous is None:
+                        pending[key] = (model, columns, filters, extra)
+                        continue
+                    for column, amount in six.iteritems(columns):
+                        previous[1][column] = previous[1].get(column, 0) + amount
+                    previous[3].update(extra)
+                self._pending = pending
+
+    def process_pending(self, partition=None):
+        return self.backend.process_pending(partition=partition)
+
+    def process(self, *args, **kwargs):
+        return self.backend.process(*args, **kwargs)
+
+    def process_batch(self, items):
+        return self.backend.process_batch(items)
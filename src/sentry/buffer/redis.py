@@ -11,6 +11,7 @@ import six
 
 from time import time
 from binascii import crc32
+from collections import defaultdict
 
 from datetime import datetime
 from django.db import models
@@ -58,10 +59,13 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = 'b:p'
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(self, pending_partitions=1, incr_batch_size=2, batch_flush=False, **options):
         self.cluster, options = get_cluster_from_options('SENTRY_BUFFER_OPTIONS', options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # When enabled, ``process`` reads all keys of a batch in one pipeline
+        # per host and writes them with ``Buffer.process_batch``.
+        self.batch_flush = batch_flush
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
@@ -162,15 +166,48 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
         - Add hashmap key to pending flushes
         """
-        # TODO(dcramer): longer term we'd rather not have to serialize values
-        # here (unless it's to JSON)
         key = self._make_key(model, filters)
-        pending_key = self._make_pending_key_from_key(key)
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         conn = self.cluster.get_local_client_for_key(key)
 
         pipe = conn.pipeline()
+        self._queue_incr(pipe, key, model, columns, filters, extra)
+        pipe.execute()
+
+        metrics.incr('buffer.incr', skip_internal=True, tags={
+            'module': model.__module__,
+            'model': model.__name__,
+        })
+
+    def incr_multi(self, items):
+        """
+        Same as ``incr`` for several rows, using a single pipeline for all
+        keys which live on the same host.
+        """
+        router = self.cluster.get_router()
+        hosts = defaultdict(list)
+        for model, columns, filters, extra in items:
+            key = self._make_key(model, filters)
+            hosts[router.get_host_for_key(key)].append((key, model, columns, filters, extra))
+
+        for host_id, host_items in six.iteritems(hosts):
+            pipe = self.cluster.get_local_client(host_id).pipeline()
+            for key, model, columns, filters, extra in host_items:
+                self._queue_incr(pipe, key, model, columns, filters, extra)
+            pipe.execute()
+
+            for key, model, columns, filters, extra in host_items:
+                metrics.incr('buffer.incr', skip_internal=True, tags={
+                    'module': model.__module__,
+                    'model': model.__name__,
+                })
+
+    def _queue_incr(self, pipe, key, model, columns, filters, extra=None):
+        # TODO(dcramer): longer term we'd rather not have to serialize values
+        # here (unless it's to JSON)
+        pending_key = self._make_pending_key_from_key(key)
+
         pipe.hsetnx(key, 'm', '%s.%s' % (model.__module__, model.__name__))
         # TODO(dcramer): once this goes live in production, we can kill the pickle path
         # (this is to ensure a zero downtime deploy where we can transition event processing)
@@ -190,12 +227,6 @@ class RedisBuffer(Buffer):
                 # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
         pipe.expire(key, self.key_expire)
         pipe.zadd(pending_key, time(), key)
-        pipe.execute()
-
-        metrics.incr('buffer.incr', skip_internal=True, tags={
-            'module': model.__module__,
-            'model': model.__name__,
-        })
 
     def process_pending(self, partition=None):
         if partition is None and self.pending_partitions > 1:
@@ -253,9 +284,39 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if self.batch_flush and len(batch_keys) > 1:
+            self._process_batch_incr(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
+    def _load_incr(self, values):
+        """
+        Decodes the hash written by ``incr`` into the arguments expected by
+        ``Buffer.process``.
+        """
+        model = import_string(values.pop('m'))
+        if values['f'].startswith('{'):
+            filters = self._load_values(json.loads(values.pop('f')))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop('f'))
+
+        incr_values = {}
+        extra_values = {}
+        for k, v in six.iteritems(values):
+            if k.startswith('i+'):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith('e+'):
+                if v.startswith('['):
+                    extra_values[k[2:]] = self._load_value(json.loads(v))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+
+        return model, incr_values, filters, extra_values
+
     def _process_single_incr(self, key):
         client = self.cluster.get_routing_client()
         lock_key = self._make_lock_key(key)
@@ -281,25 +342,90 @@ class RedisBuffer(Buffer):
                 self.logger.debug('buffer.revoked.empty', extra={'redis_key': key})
                 return
 
-            model = import_string(values.pop('m'))
-            if values['f'].startswith('{'):
-                filters = self._load_values(json.loads(values.pop('f')))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop('f'))
-
-            incr_values = {}
-            extra_values = {}
-            for k, v in six.iteritems(values):
-                if k.startswith('i+'):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith('e+'):
-                    if v.startswith('['):
-                        extra_values[k[2:]] = self._load_value(json.loads(v))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
+            model, incr_values, filters, extra_values = self._load_incr(values)
 
             super(RedisBuffer, self).process(model, incr_values, filters, extra_values)
         finally:
             client.delete(lock_key)
+
+    def _process_batch_incr(self, keys):
+        with self.cluster.map() as conn:
+            locks = [
+                (key, conn.set(self._make_lock_key(key), '1', nx=True, ex=10))
+                for key in keys
+            ]
+
+        locked_keys = []
+        for key, acquired in locks:
+            if acquired.value:
+                locked_keys.append(key)
+            else:
+                metrics.incr('buffer.revoked', tags={'reason': 'locked'}, skip_internal=False)
+                self.logger.debug('buffer.revoked.locked', extra={'redis_key': key})
+
+        if not locked_keys:
+            return
+
+        try:
+            # The pending sets are per host, so we pipeline the reads for all
+            # keys routed to the same host together.
+            router = self.cluster.get_router()
+            hosts = defaultdict(list)
+            for key in locked_keys:
+                hosts[router.get_host_for_key(key)].append(key)
+
+            items = []
+            for host_id, host_keys in six.iteritems(hosts):
+                pipe = self.cluster.get_local_client(host_id).pipeline()
+                for key in host_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self._make_pending_key_from_key(key), key)
+                    pipe.delete(key)
+                results = pipe.execute()
+
+                for key, values in zip(host_keys, results[::3]):
+                    if not values:
+                        metrics.incr('buffer.revoked', tags={'reason': 'empty'},
+                                     skip_internal=False)
+                        self.logger.debug('buffer.revoked.empty', extra={'redis_key': key})
+                        continue
+                    items.append(self._load_incr(values))
+
+            metrics.timing('buffer.batch-size', len(items))
+
+            if items:
+                failed = super(RedisBuffer, self).process_batch(items)
+                if failed:
+                    self._requeue_incr(failed)
+        finally:
+            with self.cluster.map() as conn:
+                for key in locked_keys:
+                    conn.delete(self._make_lock_key(key))
+
+    def _requeue_incr(self, items):
+        """
+        Writes increments which could not be flushed back into their keys so
+        a later ``process_pending`` picks them up again. Counters are added
+        to whatever was buffered in the meantime and extra values only fill
+        in columns which have not been set again since.
+        """
+        router = self.cluster.get_router()
+        hosts = defaultdict(list)
+        for model, columns, filters, extra in items:
+            key = self._make_key(model, filters)
+            hosts[router.get_host_for_key(key)].append((key, model, columns, filters, extra))
+
+        for host_id, host_items in six.iteritems(hosts):
+            pipe = self.cluster.get_local_client(host_id).pipeline()
+            for key, model, columns, filters, extra in host_items:
+                pipe.hsetnx(key, 'm', '%s.%s' % (model.__module__, model.__name__))
+                pipe.hsetnx(key, 'f', pickle.dumps(filters))
+                for column, amount in six.iteritems(columns):
+                    pipe.hincrby(key, 'i+' + column, amount)
+                for column, value in six.iteritems(extra or {}):
+                    pipe.hsetnx(key, 'e+' + column, pickle.dumps(value))
+                pipe.expire(key, self.key_expire)
+                pipe.zadd(self._make_pending_key_from_key(key), time(), key)
+            pipe.execute()
+
+        metrics.incr('buffer.requeued', amount=len(items), skip_internal=False)
@@ -991,6 +991,32 @@ SENTRY_ALLOW_ORIGIN = None
 # Enable scraping of javascript context for source code
 SENTRY_SCRAPE_JAVASCRIPT_CONTEXT = True
 
+# The number of source files (and sourcemaps) fetched concurrently while
+# processing a single javascript event
+SENTRY_SCRAPE_JAVASCRIPT_CONCURRENCY = 8
+
+# The number of independent queries run concurrently by serializers that
+# support it, such as the one for the issue stream
+SENTRY_SERIALIZER_CONCURRENCY = 4
+
+# The total size (in bytes) of the sourcemaps whose parsed views are kept in
+# memory by each worker, 0 disables the cache
+SENTRY_SOURCEMAP_VIEW_CACHE_SIZE = 256 * 1024 * 1024
+
+# The total size (in bytes) of the model instances kept in memory by each
+# process for managers with a ``cache_local_ttl``. Cached instances can be up
+# to ``cache_local_ttl`` seconds out of date in other processes, so the cache
+# is disabled (0) unless it is configured.
+SENTRY_MODEL_LOCAL_CACHE_SIZE = 0
+
+# The total size (in bytes) of the symcache and cficache files kept open by
+# each worker, 0 disables the pool
+SENTRY_DIF_CACHE_POOL_SIZE = 512 * 1024 * 1024
+
+# The number of seconds for which each worker remembers the symcache and
+# cficache files found for a debug id, 0 disables this
+SENTRY_DIF_LOOKUP_TTL = 10
+
 # Buffer backend
 SENTRY_BUFFER = 'sentry.buffer.Buffer'
 SENTRY_BUFFER_OPTIONS = {}
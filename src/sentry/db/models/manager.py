@@ -13,6 +13,9 @@ import six
 import threading
 import weakref
 
+from six.moves import cPickle as pickle
+from time import time
+
 from django.conf import settings
 from django.db import router
 from django.db.models import Model
@@ -22,6 +25,7 @@ from django.utils.encoding import smart_text
 
 from sentry import nodestore
 from sentry.utils.cache import cache
+from sentry.utils.datastructures import SizedLRUCache
 from sentry.utils.hashlib import md5_text
 
 from .query import create_or_update
@@ -30,6 +34,26 @@ __all__ = ('BaseManager', )
 
 logger = logging.getLogger('sentry')
 
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache():
+    """
+    Returns the process-wide cache which holds recently used model instances
+    for managers with a ``cache_local_ttl``, or ``None`` if it is disabled.
+    """
+    global _local_cache
+
+    if not settings.SENTRY_MODEL_LOCAL_CACHE_SIZE:
+        return None
+
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = SizedLRUCache(settings.SENTRY_MODEL_LOCAL_CACHE_SIZE)
+    return _local_cache
+
 
 def __prep_value(model, key, value):
     if isinstance(value, Model):
@@ -81,6 +105,7 @@ class BaseManager(Manager):
         self.cache_fields = kwargs.pop('cache_fields', [])
         self.cache_ttl = kwargs.pop('cache_ttl', 60 * 5)
         self.cache_version = kwargs.pop('cache_version', None)
+        self.cache_local_ttl = kwargs.pop('cache_local_ttl', 0)
         self.__local_cache = threading.local()
         super(BaseManager, self).__init__(*args, **kwargs)
 
@@ -154,20 +179,23 @@ class BaseManager(Manager):
                 continue
             # store pointers
             value = self.__value_for_field(instance, key)
+            cache_key = self.__get_lookup_cache_key(**{key: value})
             cache.set(
-                key=self.__get_lookup_cache_key(**{key: value}),
+                key=cache_key,
                 value=pk_val,
                 timeout=self.cache_ttl,
                 version=self.cache_version,
             )
+            self.__delete_local(cache_key)
 
         # Ensure we don't serialize the database into the cache
         db = instance._state.db
         instance._state.db = None
         # store actual object
+        cache_key = self.__get_lookup_cache_key(**{pk_name: pk_val})
         try:
             cache.set(
-                key=self.__get_lookup_cache_key(**{pk_name: pk_val}),
+                key=cache_key,
                 value=instance,
                 timeout=self.cache_ttl,
                 version=self.cache_version,
@@ -175,6 +203,7 @@ class BaseManager(Manager):
         except Exception as e:
             logger.error(e, exc_info=True)
         instance._state.db = db
+        self.__delete_local(cache_key)
 
         # Kill off any keys which are no longer valid
         if instance in self.__cache:
@@ -184,10 +213,12 @@ class BaseManager(Manager):
                 value = self.__cache[instance][key]
                 current_value = self.__value_for_field(instance, key)
                 if value != current_value:
+                    cache_key = self.__get_lookup_cache_key(**{key: value})
                     cache.delete(
-                        key=self.__get_lookup_cache_key(**{key: value}),
+                        key=cache_key,
                         version=self.cache_version,
                     )
+                    self.__delete_local(cache_key)
 
         self.__cache_state(instance)
 
@@ -201,19 +232,77 @@ class BaseManager(Manager):
                 continue
             # remove pointers
             value = self.__value_for_field(instance, key)
+            cache_key = self.__get_lookup_cache_key(**{key: value})
             cache.delete(
-                key=self.__get_lookup_cache_key(**{key: value}),
+                key=cache_key,
                 version=self.cache_version,
             )
+            self.__delete_local(cache_key)
         # remove actual object
+        cache_key = self.__get_lookup_cache_key(**{pk_name: instance.pk})
         cache.delete(
-            key=self.__get_lookup_cache_key(**{pk_name: instance.pk}),
+            key=cache_key,
             version=self.cache_version,
         )
+        self.__delete_local(cache_key)
 
     def __get_lookup_cache_key(self, **kwargs):
         return make_key(self.model, 'modelcache', kwargs)
 
+    def __get_local(self, cache_keys):
+        """
+        Returns the values of ``cache_keys`` which are held in the local cache
+        and have not expired yet.
+        """
+        local_cache = get_local_cache() if self.cache_local_ttl else None
+        if local_cache is None:
+            return {}
+
+        now = time()
+        results = {}
+        for cache_key in cache_keys:
+            value = local_cache.get((self.cache_version, cache_key))
+            if value is None:
+                continue
+            expires, data = value
+            if expires < now:
+                local_cache.delete((self.cache_version, cache_key))
+                continue
+            # Every caller gets its own copy, as it would from the shared
+            # cache.
+            results[cache_key] = pickle.loads(data)
+        return results
+
+    def __set_local(self, values):
+        local_cache = get_local_cache() if self.cache_local_ttl else None
+        if local_cache is None:
+            return
+
+        expires = time() + self.cache_local_ttl
+        for cache_key, value in six.iteritems(values):
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            local_cache.set((self.cache_version, cache_key), (expires, data), len(data))
+
+    def __delete_local(self, cache_key):
+        local_cache = get_local_cache() if self.cache_local_ttl else None
+        if local_cache is not None:
+            local_cache.delete((self.cache_version, cache_key))
+
+    def __get_many_cached(self, cache_keys):
+        """
+        Looks up ``cache_keys`` in the local cache, and the remaining ones in
+        the shared cache.
+        """
+        results = self.__get_local(cache_keys)
+
+        missing = [cache_key for cache_key in cache_keys if cache_key not in results]
+        if missing:
+            shared = cache.get_many(missing, version=self.cache_version)
+            self.__set_local(shared)
+            results.update(shared)
+
+        return results
+
     def __value_for_field(self, instance, key):
         """
         Return the cacheable value for a field.
@@ -256,7 +345,7 @@ class BaseManager(Manager):
         if key in self.cache_fields or key == pk_name:
             cache_key = self.__get_lookup_cache_key(**{key: value})
 
-            retval = cache.get(cache_key, version=self.cache_version)
+            retval = self.__get_many_cached([cache_key]).get(cache_key)
             if retval is None:
                 result = self.get(**kwargs)
                 # Ensure we're pushing it into the cache
@@ -286,6 +375,91 @@ class BaseManager(Manager):
         else:
             return self.get(**kwargs)
 
+    def get_many_from_cache(self, field, values):
+        """
+        Returns the instances whose ``field`` matches any of ``values``, in
+        the order of ``values``. Values without a matching instance are left
+        out.
+
+        Like ``get_from_cache``, only lookups on the primary key and
+        ``cache_fields`` are cached. All cache keys are fetched at once, and
+        the misses are loaded with a single query and cached again.
+        """
+        pk_name = self.model._meta.pk.name
+        if field == 'pk':
+            field = pk_name
+
+        # Kill __exact since it's the default behavior
+        if field.endswith('__exact'):
+            field = field.split('__exact', 1)[0]
+
+        # We store everything by key references (vs instances)
+        values = [value.pk if isinstance(value, Model) else value for value in values]
+
+        if not self.cache_fields or (field not in self.cache_fields and field != pk_name):
+            return self.__order_by_values(
+                self.filter(**{'%s__in' % field: values}), field, values)
+
+        cache_keys = {
+            self.__get_lookup_cache_key(**{field: value}): value for value in values
+        }
+        cached = self.__get_many_cached(list(cache_keys))
+
+        if field != pk_name:
+            # Cached values are pointers to primary keys.
+            pks = {cache_keys[cache_key]: pk for cache_key, pk in six.iteritems(cached)}
+            missing = [value for value in values if value not in pks]
+
+            results = []
+            if pks:
+                results.extend(self.get_many_from_cache(pk_name, list(pks.values())))
+            if missing:
+                results.extend(self.__load_many(field, missing))
+            return self.__order_by_values(results, field, values)
+
+        results = []
+        missing = []
+        for cache_key, value in six.iteritems(cache_keys):
+            retval = cached.get(cache_key)
+            if retval is None:
+                missing.append(value)
+                continue
+
+            if type(retval) != self.model or int(value) != retval.pk:
+                if settings.DEBUG:
+                    raise ValueError('Unexpected value returned from cache')
+                logger.error('Cache response returned invalid value %r', retval)
+                missing.append(value)
+                continue
+
+            retval._state.db = router.db_for_read(self.model)
+            results.append(retval)
+
+        if missing:
+            results.extend(self.__load_many(field, missing))
+
+        return self.__order_by_values(results, field, values)
+
+    def __load_many(self, field, values):
+        results = list(self.filter(**{'%s__in' % field: values}))
+        for result in results:
+            # Ensure we're pushing it into the cache
+            self.__post_save(instance=result)
+        return results
+
+    def __order_by_values(self, instances, field, values):
+        instances_by_value = {}
+        for instance in instances:
+            value = self.__value_for_field(instance, field)
+            instances_by_value[six.text_type(value)] = instance
+
+        results = []
+        for value in values:
+            instance = instances_by_value.pop(six.text_type(value), None)
+            if instance is not None:
+                results.append(instance)
+        return results
+
     def create_or_update(self, **kwargs):
         return create_or_update(self.model, **kwargs)
 
@@ -310,6 +484,7 @@ class BaseManager(Manager):
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        self.__delete_local(cache_key)
 
     def post_save(self, instance, **kwargs):
         """
@@ -39,12 +39,15 @@ class GroupDeletionTask(ModelDeletionTask):
         return relations
 
     def delete_instance(self, instance):
+        from sentry.models import GroupHash
         from sentry.similarity import features
 
         if not self.skip_models or features not in self.skip_models:
             features.delete(instance)
 
-        return super(GroupDeletionTask, self).delete_instance(instance)
+        rv = super(GroupDeletionTask, self).delete_instance(instance)
+        GroupHash.objects.clear_project_cache(instance.project_id)
+        return rv
 
     def mark_deletion_in_progress(self, instance_list):
         from sentry.models import Group, GroupStatus
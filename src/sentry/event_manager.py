@@ -1279,13 +1279,7 @@ class EventManager(object):
         return euser
 
     def _find_hashes(self, project, hash_list):
-        return map(
-            lambda hash: GroupHash.objects.get_or_create(
-                project=project,
-                hash=hash,
-            )[0],
-            hash_list,
-        )
+        return GroupHash.objects.get_or_create_bulk(project, hash_list)
 
     def _save_aggregate(self, event, hashes, release, **kwargs):
         project = event.project
@@ -1328,7 +1322,19 @@ class EventManager(object):
             )
 
         else:
-            group = Group.objects.get(id=existing_group_id)
+            try:
+                group = Group.objects.get_from_cache(id=existing_group_id)
+            except Group.DoesNotExist:
+                # The hashes may have been cached before the group was
+                # deleted, in which case they are gone from the database.
+                GroupHash.objects.clear_project_cache(project.id)
+                if GroupHash.objects.filter(
+                    project=project,
+                    hash__in=hashes,
+                    group_id=existing_group_id,
+                ).exists():
+                    raise
+                return self._save_aggregate(event, hashes, release, **kwargs)
 
             group_is_new = False
 
@@ -9,7 +9,10 @@ import base64
 import six
 import zlib
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.db import connections
 from os.path import splitext
 from requests.utils import get_encoding_from_headers
 from six.moves.urllib.parse import urljoin, urlsplit
@@ -28,8 +31,9 @@ from sentry import http
 from sentry.interfaces.stacktrace import Stacktrace
 from sentry.models import EventError, ReleaseFile
 from sentry.utils.cache import cache
+from sentry.utils.datastructures import SizedLRUCache
 from sentry.utils.files import compress_file
-from sentry.utils.hashlib import md5_text
+from sentry.utils.hashlib import md5_text, sha1_text
 from sentry.utils.http import is_valid_origin
 from sentry.utils.safe import get_path
 from sentry.utils import metrics
@@ -67,6 +71,10 @@ MAX_RESOURCE_FETCHES = 100
 
 logger = logging.getLogger(__name__)
 
+# parsed sourcemaps shared by all events processed in this process, see
+# ``parse_sourcemap``
+_sourcemap_view_cache = None
+
 
 class UnparseableSourcemap(http.BadSource):
     error_type = EventError.JS_INVALID_SOURCEMAP
@@ -211,36 +219,53 @@ def fetch_release_file(filename, release, dist=None):
         filename_choices = ReleaseFile.normalize(filename)
         filename_idents = [ReleaseFile.get_ident(f, dist_name) for f in filename_choices]
 
-        logger.debug(
-            'Checking database for release artifact %r (release_id=%s)', filename, release.id
-        )
+        releasefile = None
+        manifest = ReleaseFile.get_manifest(release, dist)
+        if manifest is not None:
+            # Pick the first ident that matches in priority order.
+            releasefile_id = next(
+                (manifest[ident] for ident in filename_idents if ident in manifest),
+                None,
+            )
+            if releasefile_id is not None:
+                try:
+                    releasefile = ReleaseFile.objects.select_related('file').get(
+                        id=releasefile_id,
+                    )
+                except ReleaseFile.DoesNotExist:
+                    pass
+        else:
+            logger.debug(
+                'Checking database for release artifact %r (release_id=%s)', filename, release.id
+            )
 
-        possible_files = list(
-            ReleaseFile.objects.filter(
-                release=release,
-                dist=dist,
-                ident__in=filename_idents,
-            ).select_related('file')
-        )
+            possible_files = list(
+                ReleaseFile.objects.filter(
+                    release=release,
+                    dist=dist,
+                    ident__in=filename_idents,
+                ).select_related('file')
+            )
 
-        if len(possible_files) == 0:
+            if len(possible_files) == 1:
+                releasefile = possible_files[0]
+            elif len(possible_files) > 1:
+                # Pick first one that matches in priority order.
+                # This is O(N*M) but there are only ever at most 4 things here
+                # so not really worth optimizing.
+                releasefile = next((
+                    rf
+                    for ident in filename_idents
+                    for rf in possible_files
+                    if rf.ident == ident
+                ))
+
+        if releasefile is None:
             logger.debug(
                 'Release artifact %r not found in database (release_id=%s)', filename, release.id
             )
             cache.set(cache_key, -1, 60)
             return None
-        elif len(possible_files) == 1:
-            releasefile = possible_files[0]
-        else:
-            # Pick first one that matches in priority order.
-            # This is O(N*M) but there are only ever at most 4 things here
-            # so not really worth optimizing.
-            releasefile = next((
-                rf
-                for ident in filename_idents
-                for rf in possible_files
-                if rf.ident == ident
-            ))
 
         logger.debug(
             'Found release artifact %r (id=%s, release_id=%s)', filename, releasefile.id, release.id
@@ -420,7 +445,7 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
         )
         body = result.body
     try:
-        return SourceMapView.from_json_bytes(body)
+        return parse_sourcemap(body)
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(six.text_type(exc), exc_info=True)
@@ -429,6 +454,69 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
         })
 
 
+def get_sourcemap_view_cache():
+    global _sourcemap_view_cache
+    if _sourcemap_view_cache is None:
+        _sourcemap_view_cache = SizedLRUCache(settings.SENTRY_SOURCEMAP_VIEW_CACHE_SIZE)
+    return _sourcemap_view_cache
+
+
+def parse_sourcemap(body):
+    """
+    Parses a sourcemap, reusing the view if the same sourcemap was already
+    parsed by this process.
+
+    Views are keyed by the SHA1 of the body, which is also the checksum of
+    the ``File`` behind a release artifact. The cache is bounded by the
+    total size of the parsed bodies.
+    """
+    if not settings.SENTRY_SOURCEMAP_VIEW_CACHE_SIZE:
+        return SourceMapView.from_json_bytes(body)
+
+    sourcemap_views = get_sourcemap_view_cache()
+    checksum = sha1_text(body).hexdigest()
+    sourcemap_view = sourcemap_views.get(checksum)
+    if sourcemap_view is not None:
+        metrics.incr('sourcemaps.view_cache.hit', skip_internal=True)
+        return sourcemap_view
+
+    metrics.incr('sourcemaps.view_cache.miss', skip_internal=True)
+    with metrics.timer('sourcemaps.parse'):
+        sourcemap_view = SourceMapView.from_json_bytes(body)
+    sourcemap_views.set(checksum, sourcemap_view, len(body))
+    return sourcemap_view
+
+
+def fetch_concurrently(fetch, urls, concurrency):
+    """
+    Calls ``fetch`` for each of the given urls using up to ``concurrency``
+    threads. Returns a dictionary mapping every url to a ``(result, error)``
+    tuple, where ``error`` is the ``BadSource`` raised while fetching it.
+    """
+    def _fetch(url):
+        try:
+            return fetch(url), None
+        except http.BadSource as exc:
+            return None, exc
+
+    def _fetch_in_thread(url):
+        try:
+            return _fetch(url)
+        finally:
+            # Release artifacts are looked up in the database, make sure we
+            # do not leak the connections opened by the worker thread.
+            for connection in connections.all():
+                connection.close()
+
+    urls = list(urls)
+    if concurrency <= 1 or len(urls) <= 1:
+        return {url: _fetch(url) for url in urls}
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as executor:
+        futures = [(url, executor.submit(_fetch_in_thread, url)) for url in urls]
+    return {url: future.result() for url, future in futures}
+
+
 def is_data_uri(url):
     return url[:BASE64_PREAMBLE_LENGTH] == BASE64_SOURCEMAP_PREAMBLE
 
@@ -758,57 +846,73 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         return self.cache.get(filename)
 
     def cache_source(self, filename):
-        sourcemaps = self.sourcemaps
-        cache = self.cache
-
         self.fetch_count += 1
 
         if self.fetch_count > self.max_fetches:
-            cache.add_error(filename, {
+            self.cache.add_error(filename, {
                 'type': EventError.JS_TOO_MANY_REMOTE_SOURCES,
             })
             return
 
-        # TODO: respect cache-control/max-age headers to some extent
-        logger.debug('Fetching remote source %r', filename)
         try:
-            result = fetch_file(
-                filename,
-                project=self.project,
-                release=self.release,
-                dist=self.dist,
-                allow_scraping=self.allow_scraping
-            )
+            result = self.fetch_source(filename)
         except http.BadSource as exc:
-            cache.add_error(filename, exc.data)
+            self.cache.add_error(filename, exc.data)
             return
 
-        cache.add(filename, result.body, result.encoding)
-        cache.alias(result.url, filename)
+        sourcemap_url = self.add_source(filename, result)
+        if sourcemap_url is None:
+            return
+
+        try:
+            sourcemap_view = self.fetch_sourcemap(sourcemap_url)
+        except http.BadSource as exc:
+            self.cache.add_error(filename, exc.data)
+            return
+
+        self.add_sourcemap(sourcemap_url, sourcemap_view)
+
+    def fetch_source(self, filename):
+        # TODO: respect cache-control/max-age headers to some extent
+        logger.debug('Fetching remote source %r', filename)
+        return fetch_file(
+            filename,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping
+        )
+
+    def fetch_sourcemap(self, sourcemap_url):
+        return fetch_sourcemap(
+            sourcemap_url,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping,
+        )
+
+    def add_source(self, filename, result):
+        """
+        Adds a fetched source file to the cache. Returns the url of its
+        sourcemap if that still needs to be fetched.
+        """
+        self.cache.add(filename, result.body, result.encoding)
+        self.cache.alias(result.url, filename)
 
         sourcemap_url = discover_sourcemap(result)
         if not sourcemap_url:
-            return
+            return None
 
         logger.debug('Found sourcemap %r for minified script %r', sourcemap_url[:256], result.url)
-        sourcemaps.link(filename, sourcemap_url)
-        if sourcemap_url in sourcemaps:
-            return
+        self.sourcemaps.link(filename, sourcemap_url)
+        if sourcemap_url in self.sourcemaps:
+            return None
 
-        # pull down sourcemap
-        try:
-            sourcemap_view = fetch_sourcemap(
-                sourcemap_url,
-                project=self.project,
-                release=self.release,
-                dist=self.dist,
-                allow_scraping=self.allow_scraping,
-            )
-        except http.BadSource as exc:
-            cache.add_error(filename, exc.data)
-            return
+        return sourcemap_url
 
-        sourcemaps.add(sourcemap_url, sourcemap_view)
+    def add_sourcemap(self, sourcemap_url, sourcemap_view):
+        self.sourcemaps.add(sourcemap_url, sourcemap_view)
 
         # cache any inlined sources
         for src_id, source_name in sourcemap_view.iter_sources():
@@ -823,6 +927,9 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         """
         Fetch all sources that we know are required (being referenced directly
         in frames).
+
+        All source files are fetched concurrently first, followed by all of
+        the sourcemaps discovered in them.
         """
         pending_file_list = set()
         for f in frames:
@@ -841,10 +948,40 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 continue
             pending_file_list.add(f['abs_path'])
 
-        for idx, filename in enumerate(pending_file_list):
-            self.cache_source(
-                filename=filename,
-            )
+        filenames = []
+        for filename in pending_file_list:
+            self.fetch_count += 1
+            if self.fetch_count > self.max_fetches:
+                self.cache.add_error(filename, {
+                    'type': EventError.JS_TOO_MANY_REMOTE_SOURCES,
+                })
+            else:
+                filenames.append(filename)
+
+        concurrency = settings.SENTRY_SCRAPE_JAVASCRIPT_CONCURRENCY
+        sources = fetch_concurrently(self.fetch_source, filenames, concurrency)
+
+        pending_sourcemaps = OrderedDict()
+        for filename in filenames:
+            result, error = sources[filename]
+            if error is not None:
+                self.cache.add_error(filename, error.data)
+                continue
+
+            sourcemap_url = self.add_source(filename, result)
+            if sourcemap_url is not None:
+                pending_sourcemaps.setdefault(sourcemap_url, []).append(filename)
+
+        sourcemaps = fetch_concurrently(self.fetch_sourcemap, pending_sourcemaps, concurrency)
+
+        for sourcemap_url, sourcemap_filenames in six.iteritems(pending_sourcemaps):
+            sourcemap_view, error = sourcemaps[sourcemap_url]
+            if error is not None:
+                for filename in sourcemap_filenames:
+                    self.cache.add_error(filename, error.data)
+                continue
+
+            self.add_sourcemap(sourcemap_url, sourcemap_view)
 
     def close(self):
         StacktraceProcessor.close(self)
@@ -0,0 +1,73 @@
+"""
+sentry.management.commands.backfill_similarity
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:copyright: (c) 2010-2018 by the Sentry Team, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+import six
+
+from django.core.management.base import BaseCommand, CommandError, make_option
+
+from sentry.models import Event, Project, Group
+
+
+class Command(BaseCommand):
+    help = 'Backfill the similarity index with events from the database.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--project', dest='project', type=int,
+                    help='Only record events for this project (ID).'),
+        make_option('--batch-size', dest='batch_size', type=int, default=100,
+                    help='Number of events recorded per index request.'),
+        make_option('--no-input', action='store_true', dest='no_input',
+                    help='Do not ask questions.')
+    )
+
+    def handle(self, **options):
+
+        def _attach_related(_events):
+            project_ids = set([event.project_id for event in _events])
+            projects = {p.id: p for p in Project.objects.filter(id__in=project_ids)}
+            group_ids = set([event.group_id for event in _events])
+            groups = {g.id: g for g in Group.objects.filter(id__in=group_ids)}
+            for event in _events:
+                event.project = projects[event.project_id]
+                event.group = groups[event.group_id]
+            Event.objects.bind_nodes(_events, 'data')
+
+        from sentry.similarity import features
+        from sentry.utils.iterators import chunked
+        from sentry.utils.query import RangeQuerySetWrapper
+
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        events = Event.objects.filter(group_id__isnull=False)
+        if options['project']:
+            events = events.filter(project_id=options['project'])
+
+        count = events.count()
+        self.stdout.write('Events to process: {}\n'.format(count))
+
+        if count == 0:
+            self.stdout.write('Nothing to do.\n')
+            sys.exit(0)
+
+        if not options['no_input']:
+            proceed = six.moves.input('Do you want to continue? [y/N] ')
+            if proceed.strip().lower() not in ['yes', 'y']:
+                raise CommandError('Aborted.')
+
+        for batch in chunked(
+            RangeQuerySetWrapper(events, step=batch_size, callbacks=(_attach_related,)),
+            batch_size,
+        ):
+            features.record_multi(batch)
+
+        self.stdout.write('Done.\n')
@@ -13,13 +13,16 @@ import os
 import six
 import uuid
 import time
+import fcntl
 import errno
 import shutil
 import hashlib
 import logging
 import tempfile
 
+from contextlib import contextmanager
 from jsonfield import JSONField
+from django.conf import settings
 from django.db import models, transaction, IntegrityError
 from django.db.models.fields.related import OneToOneRel
 
@@ -37,6 +40,7 @@ from sentry.models.file import File, ChunkFileState
 from sentry.reprocessing import resolve_processing_issue, \
     bump_reprocessing_revision
 from sentry.utils import metrics
+from sentry.utils.datastructures import SizedLRUCache
 from sentry.utils.db import mysql_disabled_integrity
 from sentry.utils.zip import safe_extract_zip
 from sentry.utils.decorators import classproperty
@@ -53,8 +57,50 @@ CONVERSION_ERROR_TTL = 60 * 10
 
 DIF_MIMETYPES = dict((v, k) for k, v in KNOWN_DIF_TYPES.items())
 
+# The number of debug ids per cache type whose debug files and cache files
+# are remembered by each worker, see ``SENTRY_DIF_LOOKUP_TTL``.
+DIF_LOOKUP_MAX_ENTRIES = 10000
+
+# Files in the DIF cache folder are marked as used by bumping their mtime at
+# most this often. The mtime is the clock for the LRU eviction.
+DIF_CACHE_TOUCH_INTERVAL = 60 * 10
+
+# Once ``dsym.cache-max-size`` is exceeded, least recently used files are
+# removed until the cache is down to this fraction of the limit.
+DIF_CACHE_EVICTION_TARGET = 0.9
+
+# Temporary files of downloads in progress, see ``File.save_to``.
+_prefetch_file_prefix = '._prefetch-'
+
 _proguard_file_re = re.compile(r'/proguard/(?:mapping-)?(.*?)\.txt$')
 
+_difcache_pool = None
+_dif_lookup_memo = None
+
+
+def get_difcache_pool():
+    """
+    Returns the pool of opened ``SymCache`` and ``CfiCache`` objects of this
+    process, keyed by the cache file model and version. Every entry is a
+    ``[cache, timestamp]`` list, where the timestamp is when the file of the
+    cache was last marked as used.
+    """
+    global _difcache_pool
+    if _difcache_pool is None:
+        _difcache_pool = SizedLRUCache(settings.SENTRY_DIF_CACHE_POOL_SIZE)
+    return _difcache_pool
+
+
+def get_dif_lookup_memo():
+    """
+    Returns the recently found cache file models of this process, keyed by
+    the cache file model class, project and debug id.
+    """
+    global _dif_lookup_memo
+    if _dif_lookup_memo is None:
+        _dif_lookup_memo = SizedLRUCache(DIF_LOOKUP_MAX_ENTRIES)
+    return _dif_lookup_memo
+
 
 def _get_idempotency_id(project, checksum):
     """For some operations an idempotency ID is needed."""
@@ -558,6 +604,11 @@ def create_files_from_dif_zip(fileobj, project, update_caches=True):
 
 
 class DIFCache(object):
+    def __init__(self):
+        # Bytes downloaded into the cache folder by this process since the
+        # last eviction run.
+        self._downloaded_size = 0
+
     @property
     def cache_path(self):
         return options.get('dsym.cache-path')
@@ -620,12 +671,7 @@ class DIFCache(object):
         rv = {}
         for debug_id, dif in six.iteritems(difs):
             dif_path = os.path.join(self.get_project_path(project), debug_id)
-            try:
-                os.stat(dif_path)
-            except OSError as e:
-                if e.errno != errno.ENOENT:
-                    raise
-                dif.file.save_to(dif_path)
+            self._fetch_to_fs(dif.file, dif_path)
             rv[debug_id] = dif_path
 
         return rv
@@ -651,13 +697,33 @@ class DIFCache(object):
         return None
 
     def _get_caches_impl(self, project, debug_ids, cls, on_dif_referenced=None):
-        # Fetch debug files first and invoke the callback if we need
         debug_ids = [six.text_type(debug_id).lower() for debug_id in debug_ids]
-        debug_files = ProjectDebugFile.objects.find_by_debug_ids(
-            project, debug_ids, features=cls.required_features)
+
+        # Reuse the cache files found for recent events. Debug ids that were
+        # not found are always looked up again, as their debug files might
+        # have been uploaded in the meantime.
+        memo_ttl = settings.SENTRY_DIF_LOOKUP_TTL
+        memoized = {}
+        if memo_ttl:
+            memo = get_dif_lookup_memo()
+            now = time.time()
+            for debug_id in debug_ids:
+                entry = memo.get((cls.__name__, project.id, debug_id))
+                if entry is not None and entry[0] > now:
+                    memoized[debug_id] = entry[1]
+            debug_ids = [debug_id for debug_id in debug_ids if debug_id not in memoized]
+
+        # Fetch debug files first and invoke the callback if we need
+        if debug_ids:
+            debug_files = ProjectDebugFile.objects.find_by_debug_ids(
+                project, debug_ids, features=cls.required_features)
+        else:
+            debug_files = {}
 
         # Notify the caller that we have used a symbol file
         if on_dif_referenced is not None:
+            for cache_file in six.itervalues(memoized):
+                on_dif_referenced(cache_file.debug_file)
             for debug_file in six.itervalues(debug_files):
                 on_dif_referenced(debug_file)
 
@@ -687,6 +753,15 @@ class DIFCache(object):
         else:
             conversion_errors = {}
 
+        if memo_ttl:
+            expires = time.time() + memo_ttl
+            for debug_id, cache_file, _ in caches:
+                if cache_file is not None:
+                    memo.set((cls.__name__, project.id, debug_id), (expires, cache_file), 1)
+
+        caches.extend((debug_id, cache_file, None)
+                      for debug_id, cache_file in six.iteritems(memoized))
+
         return caches, conversion_errors
 
     def _update_cachefiles(self, project, debug_files, cls):
@@ -800,6 +875,7 @@ class DIFCache(object):
         rv = {}
         base = self.get_project_path(project)
         cls_name = cls.__name__.lower()
+        pool = get_difcache_pool() if settings.SENTRY_DIF_CACHE_POOL_SIZE else None
 
         for debug_id, model, cache in cachefiles:
             # If we're given a cache instance, use that over accessing the file
@@ -810,50 +886,164 @@ class DIFCache(object):
             elif model is None:
                 raise RuntimeError('missing %s file to load from fs' % cls_name)
 
-            # Try to locate a cached instance from the file system and bump the
-            # timestamp to indicate it is still being used. Otherwise, download
-            # from the blob store and place it in the cache folder.
             cachefile_name = '%s_%s.%s' % (model.id, model.version, cls_name)
             cachefile_path = os.path.join(base, cachefile_name)
+
+            # Cache files are never modified, so an instance that has already
+            # been opened by this process can be reused. Its file is still
+            # marked as used, so that other workers keep it around.
+            pool_key = (cls_name, model.id, model.version)
+            if pool is not None:
+                entry = pool.get(pool_key)
+                if entry is not None:
+                    now = int(time.time())
+                    if entry[1] < now - DIF_CACHE_TOUCH_INTERVAL:
+                        entry[1] = now
+                        self._touch(cachefile_path)
+                    rv[debug_id] = entry[0]
+                    continue
+
+            self._fetch_to_fs(model.cache_file, cachefile_path)
             try:
-                stat = os.stat(cachefile_path)
-            except OSError as e:
+                rv[debug_id] = cls.from_path(cachefile_path)
+            except (IOError, OSError) as e:
                 if e.errno != errno.ENOENT:
                     raise
-                model.cache_file.save_to(cachefile_path)
-            else:
-                now = int(time.time())
-                if stat.st_ctime < now - ONE_DAY:
-                    os.utime(cachefile_path, (now, now))
-
-            rv[debug_id] = cls.from_path(cachefile_path)
+                # Another worker evicted the file after we looked for it.
+                self._fetch_to_fs(model.cache_file, cachefile_path)
+                rv[debug_id] = cls.from_path(cachefile_path)
+
+            if pool is not None:
+                pool.set(
+                    pool_key,
+                    [rv[debug_id], int(time.time())],
+                    os.path.getsize(cachefile_path),
+                )
         return rv
 
+    def _touch(self, path):
+        """Marks the file at ``path`` as used for ``clear_old_entries`` by
+        bumping its mtime, at most once every ``DIF_CACHE_TOUCH_INTERVAL``.
+        Returns whether the file exists.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return False
+
+        now = int(time.time())
+        if stat.st_mtime < now - DIF_CACHE_TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return True
+
+    def _fetch_to_fs(self, file, path):
+        """Makes sure the given file is placed at ``path`` in the cache
+        folder. An existing file is marked as used, otherwise it is
+        downloaded from the blob store.
+        """
+        if self._touch(path):
+            return
+
+        # ``save_to`` downloads into a temporary file next to the target and
+        # renames it, so concurrent workers never see partial files.
+        file.save_to(path)
+
+        max_size = options.get('dsym.cache-max-size')
+        if max_size:
+            self._downloaded_size += file.size or 0
+            if self._downloaded_size >= max_size * (1 - DIF_CACHE_EVICTION_TARGET):
+                self._downloaded_size = 0
+                self.clear_old_entries()
+
+    @contextmanager
+    def _cleanup_lock(self):
+        """Yields whether this process may clean up the cache folder. Workers
+        sharing the folder skip the cleanup while another one is running.
+        """
+        try:
+            fd = os.open(os.path.join(self.cache_path, '.cleanup.lock'),
+                         os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            yield False
+            return
+
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError as e:
+                if e.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise
+                yield False
+            else:
+                yield True
+        finally:
+            os.close(fd)
+
     def clear_old_entries(self):
+        """Removes files that have not been used for a day and a half. If the
+        cache folder exceeds ``dsym.cache-max-size``, the least recently used
+        files of all projects are removed as well.
+        """
         try:
             cache_folders = os.listdir(self.cache_path)
         except OSError:
             return
 
-        cutoff = int(time.time()) - ONE_DAY_AND_A_HALF
+        with self._cleanup_lock() as locked:
+            if not locked:
+                return
 
-        for cache_folder in cache_folders:
-            cache_folder = os.path.join(self.cache_path, cache_folder)
-            try:
-                items = os.listdir(cache_folder)
-            except OSError:
-                continue
-            for cached_file in items:
-                cached_file = os.path.join(cache_folder, cached_file)
+            cutoff = int(time.time()) - ONE_DAY_AND_A_HALF
+            total_size = 0
+            entries = []
+
+            for cache_folder in cache_folders:
+                cache_folder = os.path.join(self.cache_path, cache_folder)
                 try:
-                    mtime = os.path.getmtime(cached_file)
+                    items = os.listdir(cache_folder)
                 except OSError:
                     continue
-                if mtime < cutoff:
+                for cached_file in items:
+                    cached_file_path = os.path.join(cache_folder, cached_file)
                     try:
-                        os.remove(cached_file)
+                        stat = os.stat(cached_file_path)
                     except OSError:
-                        pass
+                        continue
+                    if stat.st_mtime < cutoff:
+                        try:
+                            os.remove(cached_file_path)
+                        except OSError:
+                            pass
+                        continue
+
+                    total_size += stat.st_size
+                    # Downloads in progress count towards the size, but are
+                    # only removed once they are stale.
+                    if not cached_file.startswith(_prefetch_file_prefix):
+                        entries.append((stat.st_mtime, stat.st_size, cached_file_path))
+
+            max_size = options.get('dsym.cache-max-size')
+            if not max_size or total_size <= max_size:
+                return
+
+            evicted = 0
+            target_size = max_size * DIF_CACHE_EVICTION_TARGET
+            for _, size, cached_file_path in sorted(entries):
+                if total_size <= target_size:
+                    break
+                try:
+                    os.remove(cached_file_path)
+                except OSError:
+                    continue
+                total_size -= size
+                evicted += 1
+
+            metrics.incr('dsym.cache.evicted', amount=evicted)
 
 
 ProjectDebugFile.difcache = DIFCache()
@@ -7,13 +7,99 @@ sentry.models.grouphash
 """
 from __future__ import absolute_import
 
+from uuid import uuid4
+
 from django.conf import settings
 from django.db import models
 from django.db.models.signals import post_delete
 from django.utils.translation import ugettext_lazy as _
 
-from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model
+from sentry.db.models import BaseManager, BoundedPositiveIntegerField, FlexibleForeignKey, Model
 from sentry.utils import redis
+from sentry.utils.cache import cache
+
+
+class GroupHashManager(BaseManager):
+    #: Number of seconds a resolved hash is cached for.
+    resolution_cache_ttl = 60 * 60
+
+    def __get_version_key(self, project_id):
+        return u'gh:v:{}'.format(project_id)
+
+    def __get_version(self, project_id):
+        # Entries are only valid for the current version of the project. A
+        # missing version is replaced by a random one, so entries of earlier
+        # versions can never become valid again.
+        key = self.__get_version_key(project_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid4().hex, self.resolution_cache_ttl * 24)
+            version = cache.get(key)
+        return version
+
+    def clear_project_cache(self, project_id):
+        """
+        Invalidates the cached resolutions of all hashes of a project. Needs
+        to be called after (not before) the group, tombstone or state of any
+        of its existing hashes is changed.
+        """
+        cache.delete(self.__get_version_key(project_id))
+
+    def get_or_create_bulk(self, project, hashes):
+        """
+        Returns the ``GroupHash`` for each of the ``hashes`` of the project,
+        creating the ones which do not exist yet.
+
+        Hashes which resolve to a group or tombstone are cached, so that
+        events of existing groups do not need any queries to find them.
+        Hashes without either are always read from the database, as they
+        are about to be assigned.
+        """
+        version = self.__get_version(project.id)
+        keys = {
+            hash: u'gh:{}:{}:{}'.format(project.id, version, hash) for hash in hashes
+        }
+        cached = cache.get_many(keys.values()) if version is not None else {}
+
+        results = {}
+        for hash in hashes:
+            value = cached.get(keys[hash])
+            if value is not None:
+                id, group_id, group_tombstone_id, state = value
+                results[hash] = self.model(
+                    id=id,
+                    project_id=project.id,
+                    hash=hash,
+                    group_id=group_id,
+                    group_tombstone_id=group_tombstone_id,
+                    state=state,
+                )
+
+        missing = [hash for hash in hashes if hash not in results]
+        if not missing:
+            return [results[hash] for hash in hashes]
+
+        for instance in self.filter(project=project, hash__in=missing):
+            results[instance.hash] = instance
+
+        for hash in missing:
+            if hash not in results:
+                results[hash] = self.get_or_create(project=project, hash=hash)[0]
+
+        if version is not None:
+            cache.set_many({
+                keys[hash]: (
+                    results[hash].id,
+                    results[hash].group_id,
+                    results[hash].group_tombstone_id,
+                    results[hash].state,
+                )
+                for hash in missing
+                if results[hash].group_id is not None
+                or results[hash].group_tombstone_id is not None
+            }, self.resolution_cache_ttl)
+
+        return [results[hash] for hash in hashes]
 
 
 class GroupHash(Model):
@@ -34,6 +120,8 @@ class GroupHash(Model):
         null=True,
     )
 
+    objects = GroupHashManager()
+
     class Meta:
         app_label = 'sentry'
         db_table = 'sentry_grouphash'
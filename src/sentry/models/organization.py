@@ -143,7 +143,7 @@ class Organization(Model):
         default=1
     )
 
-    objects = OrganizationManager(cache_fields=('pk', 'slug', ))
+    objects = OrganizationManager(cache_fields=('pk', 'slug', ), cache_local_ttl=5)
 
     class Meta:
         app_label = 'sentry'
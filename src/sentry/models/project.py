@@ -115,7 +115,7 @@ class Project(Model):
     objects = ProjectManager(cache_fields=[
         'pk',
         'slug',
-    ])
+    ], cache_local_ttl=5)
     platform = models.CharField(max_length=64, null=True)
 
     class Meta:
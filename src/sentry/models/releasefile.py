@@ -8,7 +8,9 @@ sentry.models.releasefile
 
 from __future__ import absolute_import
 
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from six.moves.urllib.parse import urlsplit, urlunsplit
 
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model, sane_repr
@@ -35,6 +37,10 @@ class ReleaseFile(Model):
 
     __repr__ = sane_repr('release', 'ident')
 
+    # Releases with more artifacts than this are looked up in the database
+    # file by file instead of through a cached manifest.
+    MANIFEST_MAX_SIZE = 10000
+
     class Meta:
         unique_together = (('release', 'ident'), )
         index_together = (('release', 'name'), )
@@ -56,6 +62,41 @@ class ReleaseFile(Model):
             )
         return super(ReleaseFile, self).update(*args, **kwargs)
 
+    @classmethod
+    def _get_manifest_cache_key(cls, release_id, dist_id):
+        return 'releasefile:manifest:v1:%s:%s' % (release_id, dist_id or '')
+
+    @classmethod
+    def get_manifest(cls, release, dist=None):
+        """
+        Returns a mapping of ``ident -> id`` of all artifacts of a release
+        (and distribution), or ``None`` if the release has more artifacts
+        than are worth keeping in a single cache entry.
+
+        The manifest is cached and invalidated whenever an artifact of the
+        release is saved or deleted.
+        """
+        dist_id = dist.id if dist is not None else None
+        cache_key = cls._get_manifest_cache_key(release.id, dist_id)
+
+        manifest = cache.get(cache_key)
+        if manifest is None:
+            idents = list(
+                cls.objects.filter(
+                    release=release,
+                    dist=dist_id,
+                ).values_list('ident', 'id')[:cls.MANIFEST_MAX_SIZE + 1]
+            )
+            if len(idents) > cls.MANIFEST_MAX_SIZE:
+                manifest = -1
+            else:
+                manifest = dict(idents)
+            cache.set(cache_key, manifest, 3600)
+
+        if manifest == -1:
+            return None
+        return manifest
+
     @classmethod
     def get_ident(cls, name, dist=None):
         if dist is not None:
@@ -83,3 +124,19 @@ class ReleaseFile(Model):
         if query:
             urls.append('~' + urlunsplit(uri_relative_without_query))
         return urls
+
+
+def clear_manifest_cache(instance, **kwargs):
+    cache.delete(ReleaseFile._get_manifest_cache_key(instance.release_id, instance.dist_id))
+
+
+post_save.connect(
+    clear_manifest_cache,
+    sender=ReleaseFile,
+    weak=False,
+)
+post_delete.connect(
+    clear_manifest_cache,
+    sender=ReleaseFile,
+    weak=False,
+)
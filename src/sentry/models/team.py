@@ -124,7 +124,7 @@ class Team(Model):
     )
     date_added = models.DateTimeField(default=timezone.now, null=True)
 
-    objects = TeamManager(cache_fields=('pk', 'slug', ))
+    objects = TeamManager(cache_fields=('pk', 'slug', ), cache_local_ttl=5)
 
     class Meta:
         app_label = 'sentry'
@@ -0,0 +1,110 @@
+"""
+sentry.nodestore.cache.backend
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:copyright: (c) 2010-2018 by the Sentry Team, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import absolute_import
+
+import six
+
+from sentry.nodestore.base import NodeStorage
+from sentry.utils import metrics
+from sentry.utils.compat import pickle
+from sentry.utils.datastructures import SizedLRUCache
+from sentry.utils.imports import import_string
+
+
+class CachedNodeStorage(NodeStorage):
+    """
+    A read-through cache in front of another backend which keeps recently
+    read nodes in process memory.
+
+    Node data is immutable once an event has been stored, so entries are only
+    dropped when they are evicted or when a node is written or deleted
+    through this backend. Values are kept as uncompressed pickles, which
+    bounds the cache by their actual size and hands every caller its own
+    copy of the data.
+
+    >>> CachedNodeStorage(
+    >>>     backend='sentry.nodestore.django.backend.DjangoNodeStorage',
+    >>>     backend_options={},
+    >>>     max_size=64 * 1024 * 1024,
+    >>> )
+    """
+
+    def __init__(self, backend, backend_options=None, max_size=64 * 1024 * 1024, **kwargs):
+        if isinstance(backend, six.string_types):
+            backend = import_string(backend)
+        self.backend = backend(**(backend_options or {}))
+        self.cache = SizedLRUCache(max_size)
+        super(CachedNodeStorage, self).__init__(**kwargs)
+
+    def _get_cached(self, id):
+        value = self.cache.get(id)
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def _set_cached(self, id, data):
+        if data is None:
+            return
+        value = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        self.cache.set(id, value, len(value))
+
+    def get(self, id):
+        data = self._get_cached(id)
+        if data is not None:
+            metrics.incr('nodestore.cache.hit')
+            return data
+
+        metrics.incr('nodestore.cache.miss')
+        data = self.backend.get(id)
+        self._set_cached(id, data)
+        return data
+
+    def get_multi(self, id_list):
+        result = {}
+        missing = []
+        for id in id_list:
+            data = self._get_cached(id)
+            if data is None:
+                missing.append(id)
+            else:
+                result[id] = data
+
+        metrics.incr('nodestore.cache.hit', amount=len(result))
+        if missing:
+            metrics.incr('nodestore.cache.miss', amount=len(missing))
+            for id, data in six.iteritems(self.backend.get_multi(missing)):
+                self._set_cached(id, data)
+                result[id] = data
+
+        return result
+
+    def set(self, id, data):
+        self.cache.delete(id)
+        self.backend.set(id, data)
+
+    def set_multi(self, values):
+        for id in values:
+            self.cache.delete(id)
+        self.backend.set_multi(values)
+
+    def delete(self, id):
+        self.cache.delete(id)
+        self.backend.delete(id)
+
+    def delete_multi(self, id_list):
+        for id in id_list:
+            self.cache.delete(id)
+        self.backend.delete_multi(id_list)
+
+    def cleanup(self, cutoff_timestamp):
+        self.cache.clear()
+        self.backend.cleanup(cutoff_timestamp)
+
+    def validate(self):
+        self.backend.validate()
@@ -9,16 +9,23 @@ sentry.nodestore.django.backend
 from __future__ import absolute_import
 
 import math
+import six
 
+from django.db import connections, router
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
 from sentry.nodestore.base import NodeStorage
+from sentry.utils.db import is_postgres
+from sentry.utils.iterators import chunked
 
 from .models import Node
 
 
 class DjangoNodeStorage(NodeStorage):
+    # Upper bound of ids or rows sent to the database in a single query.
+    batch_size = 100
+
     def delete(self, id):
         Node.objects.filter(id=id).delete()
 
@@ -29,10 +36,14 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
     def get_multi(self, id_list):
-        return {n.id: n.data for n in Node.objects.filter(id__in=id_list)}
+        result = {}
+        for chunk in chunked(set(id_list), self.batch_size):
+            result.update((n.id, n.data) for n in Node.objects.filter(id__in=chunk))
+        return result
 
     def delete_multi(self, id_list):
-        Node.objects.filter(id__in=id_list).delete()
+        for chunk in chunked(set(id_list), self.batch_size):
+            Node.objects.filter(id__in=chunk).delete()
 
     def set(self, id, data):
         create_or_update(
@@ -44,6 +55,35 @@ class DjangoNodeStorage(NodeStorage):
             },
         )
 
+    def set_multi(self, values):
+        using = router.db_for_write(Node)
+        if not is_postgres(using):
+            return super(DjangoNodeStorage, self).set_multi(values)
+
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        data_field = Node._meta.get_field('data')
+        timestamp = timezone.now()
+
+        for chunk in chunked(six.iteritems(values), self.batch_size):
+            params = []
+            for id, data in chunk:
+                params.extend((id, data_field.get_db_prep_save(data, connection), timestamp))
+
+            cursor = connection.cursor()
+            cursor.execute(
+                'INSERT INTO %(table)s (%(id)s, %(data)s, %(timestamp)s) VALUES %(values)s '
+                'ON CONFLICT (%(id)s) DO UPDATE SET '
+                '%(data)s = EXCLUDED.%(data)s, %(timestamp)s = EXCLUDED.%(timestamp)s' % {
+                    'table': qn(Node._meta.db_table),
+                    'id': qn('id'),
+                    'data': qn('data'),
+                    'timestamp': qn('timestamp'),
+                    'values': ', '.join(['(%s, %s, %s)'] * len(chunk)),
+                },
+                params,
+            )
+
     def cleanup(self, cutoff_timestamp):
         from sentry.db.deletion import BulkDeleteQuery
 
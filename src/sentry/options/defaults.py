@@ -59,6 +59,9 @@ register('redis.options', type=Dict, flags=FLAG_NOSTORE)
 
 # symbolizer specifics
 register('dsym.cache-path', type=String, default='/tmp/sentry-dsym-cache')
+# The maximum total size (in bytes) of the files in ``dsym.cache-path``, 0
+# disables the limit
+register('dsym.cache-max-size', type=Int, default=0)
 
 # Mail
 register('mail.backend', default='smtp', flags=FLAG_NOSTORE)
@@ -147,6 +150,8 @@ register('snuba.search.max-chunk-size', default=2000)
 register('snuba.search.max-total-chunk-time-seconds', default=30.0)
 register('snuba.search.hits-sample-size', default=100)
 register('snuba.events-queries.enabled', type=Bool, default=False)
+# Seconds for which snuba query results are cached, 0 disables the cache
+register('snuba.query-cache-ttl', default=0)
 
 # Kafka Publisher
 register('kafka-publisher.raw-event-sample-rate', default=0.0)
@@ -8,8 +8,11 @@ sentry.quotas.redis
 from __future__ import absolute_import
 
 import functools
+import math
 import six
+import threading
 
+from collections import OrderedDict
 from time import time
 
 from sentry.exceptions import InvalidConfiguration
@@ -17,6 +20,7 @@ from sentry.quotas.base import NotRateLimited, Quota, RateLimited
 from sentry.utils.redis import get_cluster_from_options, load_script
 
 is_rate_limited = load_script('quotas/is_rate_limited.lua')
+lease_quota = load_script('quotas/lease.lua')
 
 
 class BasicRedisQuota(object):
@@ -34,17 +38,55 @@ class BasicRedisQuota(object):
         self.enforce = enforce
 
 
+class QuotaLease(object):
+    __slots__ = ['client', 'keys', 'expiries', 'ends', 'size', 'remaining', 'acquired']
+
+    def __init__(self, client, keys, expiries, ends, size, acquired):
+        # the redis client of the organization the items were reserved from
+        self.client = client
+        # the counter and refund keys the items were reserved from
+        self.keys = keys
+        # the expiration time of the counter keys
+        self.expiries = expiries
+        # timestamp when the first of the quota windows rolls over
+        self.ends = ends
+        # number of items reserved from redis
+        self.size = size
+        # number of reserved items that have not been spent yet
+        self.remaining = size
+        # timestamp when the items were reserved
+        self.acquired = acquired
+
+
 class RedisQuota(Quota):
     #: The ``grace`` period allows accomodating for clock drift in TTL
     #: calculation since the clock on the Redis instance used to store quota
     #: metrics may not be in sync with the computer running this code.
     grace = 60
 
+    #: Leases are sized to cover about this many seconds of the rate
+    #: observed by this process.
+    lease_interval = 1
+
+    #: No lease reserves more than this fraction of the smallest limit.
+    lease_max_fraction = 0.01
+
+    #: Leases of at most this many quota combinations are kept per process,
+    #: the least recently used ones are released first.
+    lease_max_entries = 1000
+
     def __init__(self, **options):
         self.cluster, options = get_cluster_from_options('SENTRY_QUOTA_OPTIONS', options)
+        # The maximum number of items reserved from redis at once, see
+        # ``is_rate_limited``. ``0`` disables leasing.
+        self.lease_size = options.pop('lease_size', 0)
         super(RedisQuota, self).__init__(**options)
         self.namespace = 'quota'
 
+        self._leases = OrderedDict()
+        self._lease_lock = threading.Lock()
+        self._leases_swept = 0
+
     def validate(self):
         try:
             with self.cluster.all() as client:
@@ -165,16 +207,7 @@ class RedisQuota(Quota):
         """Return the timestamp when the next rate limit period begins for an interval."""
         return (((timestamp - shift) // interval) + 1) * interval + shift
 
-    def is_rate_limited(self, project, key=None, timestamp=None):
-        if timestamp is None:
-            timestamp = time()
-
-        quotas = self.get_quotas_with_limits(project, key=key)
-
-        # If there are no quotas to actually check, skip the trip to the database.
-        if not quotas:
-            return NotRateLimited()
-
+    def __get_script_arguments(self, project, quotas, timestamp):
         keys = []
         args = []
         for quota in quotas:
@@ -184,9 +217,9 @@ class RedisQuota(Quota):
             keys.extend((key, return_key))
             expiry = self.get_next_period_start(quota.window, shift, timestamp) + self.grace
             args.extend((quota.limit, int(expiry)))
+        return keys, args
 
-        client = self.cluster.get_local_client_for_key(six.text_type(project.organization_id))
-        rejections = is_rate_limited(client, keys, args)
+    def __get_rate_limit(self, project, quotas, rejections, timestamp):
         if any(rejections):
             enforce = False
             worst_case = (0, None)
@@ -205,3 +238,134 @@ class RedisQuota(Quota):
                     reason_code=worst_case[1],
                 )
         return NotRateLimited()
+
+    def is_rate_limited(self, project, key=None, timestamp=None):
+        """
+        Checks the quotas of the project (and key) and counts the item
+        against them if none of them is exceeded.
+
+        When ``lease_size`` is set, items are reserved from redis in blocks
+        and spent from a counter in this process, which avoids a round trip
+        to the organization's redis node for most items. A lease starts with
+        a single item, so projects with little traffic are still accounted
+        for exactly, and grows with the rate observed by this process, up to
+        ``lease_size`` items or ``lease_max_fraction`` of the smallest limit.
+        Unspent items are returned through the refund keys when the window of
+        any of the quotas rolls over. Until then they count as used, so
+        ``get_usage`` may be ahead of the number of accepted items by up to
+        one lease per process.
+        """
+        if timestamp is None:
+            timestamp = time()
+
+        quotas = self.get_quotas_with_limits(project, key=key)
+
+        # If there are no quotas to actually check, skip the trip to the database.
+        if not quotas:
+            return NotRateLimited()
+
+        keys, args = self.__get_script_arguments(project, quotas, timestamp)
+        client = self.cluster.get_local_client_for_key(six.text_type(project.organization_id))
+
+        if self.lease_size:
+            return self.__is_rate_limited_leased(client, project, quotas, keys, args, timestamp)
+
+        rejections = is_rate_limited(client, keys, args)
+        return self.__get_rate_limit(project, quotas, rejections, timestamp)
+
+    def __is_rate_limited_leased(self, client, project, quotas, keys, args, timestamp):
+        lease_key = tuple(quota.key for quota in quotas)
+        keys = tuple(keys)
+
+        with self._lease_lock:
+            lease = self._leases.pop(lease_key, None)
+            if lease is not None and lease.keys == keys and lease.remaining > 0:
+                lease.remaining -= 1
+                # Reinserting keeps the leases ordered by their last use.
+                self._leases[lease_key] = lease
+                return NotRateLimited()
+
+        # Reserved items of a window that has rolled over are given back.
+        if lease is not None and lease.keys != keys:
+            self.__release_lease(lease)
+
+        size = self.__get_lease_size(lease, quotas, timestamp)
+        result = lease_quota(client, keys, [size] + args)
+        granted, available = int(result[0]), result[1:]
+        if not granted:
+            return self.__get_rate_limit(
+                project, quotas, [int(a) < 1 for a in available], timestamp
+            )
+
+        expiries = args[1::2]
+        lease = QuotaLease(
+            client, keys, expiries, min(expiries) - self.grace, granted, timestamp,
+        )
+        lease.remaining -= 1
+
+        released = []
+        with self._lease_lock:
+            # Another thread may have stored a lease in the meantime.
+            other = self._leases.pop(lease_key, None)
+            if other is not None and other.keys == keys:
+                other.remaining += lease.remaining
+                self._leases[lease_key] = other
+            else:
+                self._leases[lease_key] = lease
+                if other is not None:
+                    released.append(other)
+            released.extend(self.__evict_leases(timestamp))
+
+        for lease in released:
+            self.__release_lease(lease)
+
+        return NotRateLimited()
+
+    def __evict_leases(self, timestamp):
+        """
+        Removes the leases whose window has rolled over, and the least
+        recently used leases above ``lease_max_entries``, and returns them so
+        they can be released. Must be called with ``_lease_lock`` held.
+        """
+        evicted = []
+
+        # Sweeping every lease is linear, so it is done at most once per
+        # ``lease_interval``.
+        if timestamp - self._leases_swept >= self.lease_interval:
+            self._leases_swept = timestamp
+            for lease_key, lease in list(self._leases.items()):
+                if lease.ends <= timestamp:
+                    evicted.append(self._leases.pop(lease_key))
+
+        while len(self._leases) > self.lease_max_entries:
+            evicted.append(self._leases.popitem(last=False)[1])
+
+        return evicted
+
+    def __get_lease_size(self, lease, quotas, timestamp):
+        size = 1
+        if lease is not None:
+            consumed = lease.size - lease.remaining
+            elapsed = timestamp - lease.acquired
+            if elapsed > 0:
+                size = int(math.ceil(consumed * self.lease_interval / elapsed))
+            else:
+                size = consumed * 2
+            # Grow gradually, so a short burst does not reserve a large block.
+            size = min(size, lease.size * 2)
+
+        return max(1, min(
+            size,
+            self.lease_size,
+            int(min(quota.limit for quota in quotas) * self.lease_max_fraction),
+        ))
+
+    def __release_lease(self, lease):
+        if lease.remaining < 1:
+            return
+
+        pipe = lease.client.pipeline()
+        for return_key, expiry in zip(lease.keys[1::2], lease.expiries):
+            pipe.incrby(return_key, lease.remaining)
+            pipe.expireat(return_key, expiry)
+        pipe.execute()
@@ -4,9 +4,19 @@ from sentry.utils.services import Service
 
 
 class RateLimiter(Service):
-    __all__ = ('is_limited', 'validate')
+    __all__ = ('is_limited', 'is_limited_multi', 'validate')
 
     window = 60
 
     def is_limited(self, key, limit, project=None, window=None):
         return False
+
+    def is_limited_multi(self, requests):
+        """
+        Checks several ``(key, limit, project, window)`` requests at once,
+        returning whether each of them is limited.
+        """
+        return [
+            self.is_limited(key, limit, project=project, window=window)
+            for key, limit, project, window in requests
+        ]
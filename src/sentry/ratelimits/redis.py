@@ -2,19 +2,48 @@ from __future__ import absolute_import
 
 import six
 
+from collections import defaultdict
 from time import time
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.ratelimits.base import RateLimiter
 from sentry.utils.hashlib import md5_text
-from sentry.utils.redis import get_cluster_from_options
+from sentry.utils.redis import get_cluster_from_options, load_script
+
+sliding_window = load_script('ratelimits/sliding_window.lua')
+token_bucket = load_script('ratelimits/token_bucket.lua')
 
 
 class RedisRateLimiter(RateLimiter):
+    """
+    Counts requests per key in redis. The ``algorithm`` option selects how:
+
+    ``fixed_window`` (default)
+        Counts requests in consecutive windows. Up to twice the limit can be
+        accepted around the boundary between two windows.
+
+    ``sliding_window``
+        Estimates the number of requests in the trailing window from the
+        counts of the current and the previous window.
+
+    ``token_bucket``
+        Accepts bursts of up to ``burst`` times the limit, refilled at the
+        rate of ``limit`` requests per window.
+
+    Rejected requests are counted by the fixed window, but not by the other
+    algorithms.
+    """
     window = 60
 
+    algorithms = frozenset(['fixed_window', 'sliding_window', 'token_bucket'])
+
     def __init__(self, **options):
         self.cluster, options = get_cluster_from_options('SENTRY_RATELIMITER_OPTIONS', options)
+        self.algorithm = options.pop('algorithm', 'fixed_window')
+        if self.algorithm not in self.algorithms:
+            raise InvalidConfiguration(
+                u'Unknown rate limit algorithm: {!r}'.format(self.algorithm))
+        self.burst = options.pop('burst', 1)
 
     def validate(self):
         try:
@@ -23,20 +52,77 @@ class RedisRateLimiter(RateLimiter):
         except Exception as e:
             raise InvalidConfiguration(six.text_type(e))
 
-    def is_limited(self, key, limit, project=None, window=None):
-        if window is None:
-            window = self.window
-
+    def _get_redis_key(self, key, project, window, timestamp):
         key_hex = md5_text(key).hexdigest()
-        bucket = int(time() / window)
 
+        if self.algorithm == 'fixed_window':
+            bucket = int(timestamp / window)
+            if project:
+                return 'rl:%s:%s:%s' % (key_hex, project.id, bucket)
+            return 'rl:%s:%s' % (key_hex, bucket)
+
+        prefix = 'rl:sw' if self.algorithm == 'sliding_window' else 'rl:tb'
         if project:
-            key = 'rl:%s:%s:%s' % (key_hex, project.id, bucket)
-        else:
-            key = 'rl:%s:%s' % (key_hex, bucket)
+            return '%s:%s:%s:%s' % (prefix, key_hex, project.id, window)
+        return '%s:%s:%s' % (prefix, key_hex, window)
+
+    def is_limited(self, key, limit, project=None, window=None):
+        return self.is_limited_multi([(key, limit, project, window)])[0]
+
+    def is_limited_multi(self, requests):
+        """
+        Same as ``is_limited`` for several ``(key, limit, project, window)``
+        requests, using a single round trip for all keys which live on the
+        same host.
+        """
+        timestamp = time()
+
+        results = [None] * len(requests)
+
+        router = self.cluster.get_router()
+        hosts = defaultdict(list)
+        for index, (key, limit, project, window) in enumerate(requests):
+            # The scripts derive rates and expiries from the limit, which
+            # does not work without one. Nothing can be accepted anyway.
+            if limit <= 0 and self.algorithm != 'fixed_window':
+                results[index] = True
+                continue
+            if window is None:
+                window = self.window
+            redis_key = self._get_redis_key(key, project, window, timestamp)
+            hosts[router.get_host_for_key(redis_key)].append((index, redis_key, limit, window))
+
+        for host_id, items in six.iteritems(hosts):
+            client = self.cluster.get_local_client(host_id)
+            if self.algorithm == 'fixed_window':
+                limited = self.__check_fixed_window(client, items)
+            else:
+                limited = self.__check_script(client, items, timestamp)
+
+            for (index, _, _, _), value in zip(items, limited):
+                results[index] = value
+
+        return results
+
+    def __check_fixed_window(self, client, items):
+        pipe = client.pipeline()
+        for _, redis_key, _, window in items:
+            pipe.incr(redis_key)
+            pipe.expire(redis_key, window)
+
+        return [
+            count > limit for (_, _, limit, _), count in zip(items, pipe.execute()[::2])
+        ]
 
-        with self.cluster.map() as client:
-            result = client.incr(key)
-            client.expire(key, window)
+    def __check_script(self, client, items, timestamp):
+        keys = []
+        args = [timestamp]
+        for _, redis_key, limit, window in items:
+            keys.append(redis_key)
+            if self.algorithm == 'sliding_window':
+                args.extend((limit, window))
+            else:
+                args.extend((limit * self.burst, float(limit) / window))
 
-        return result.value > limit
+        script = sliding_window if self.algorithm == 'sliding_window' else token_bucket
+        return [bool(rejected) for rejected in script(client, keys, args)]
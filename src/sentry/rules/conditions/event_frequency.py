@@ -53,6 +53,9 @@ class BaseEventFrequencyCondition(EventCondition):
 
     def __init__(self, *args, **kwargs):
         self.tsdb = kwargs.pop('tsdb', tsdb)
+        # An optional mapping shared between conditions evaluated for the
+        # same event, so each rate is only queried once.
+        self.rate_cache = kwargs.pop('rate_cache', None)
 
         super(BaseEventFrequencyCondition, self).__init__(*args, **kwargs)
 
@@ -80,15 +83,23 @@ class BaseEventFrequencyCondition(EventCondition):
         raise NotImplementedError  # subclass must implement
 
     def get_rate(self, event, interval, environment_id):
+        cache_key = (type(self), event.group_id, interval, environment_id)
+        if self.rate_cache is not None and cache_key in self.rate_cache:
+            return self.rate_cache[cache_key]
+
         _, duration = intervals[interval]
         end = timezone.now()
-        return self.query(
+        rate = self.query(
             event,
             end - duration,
             end,
             environment_id=environment_id,
         )
 
+        if self.rate_cache is not None:
+            self.rate_cache[cache_key] = rate
+        return rate
+
 
 class EventFrequencyCondition(BaseEventFrequencyCondition):
     label = 'An issue is seen more than {value} times in {interval}'
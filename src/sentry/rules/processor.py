@@ -5,10 +5,13 @@ import six
 
 from collections import namedtuple
 from datetime import timedelta
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from sentry.models import GroupRuleStatus, Rule
 from sentry.rules import EventState, rules
+from sentry.rules.conditions.event_frequency import BaseEventFrequencyCondition
+from sentry.utils import json
 from sentry.utils.safe import safe_execute
 
 RuleFuture = namedtuple('RuleFuture', ['rule', 'kwargs'])
@@ -51,6 +54,10 @@ class RuleProcessor(object):
         self.has_reappeared = has_reappeared
 
         self.grouped_futures = {}
+        # Results of conditions and frequency queries which were already
+        # evaluated for this event, shared by all rules.
+        self.condition_results = {}
+        self.rate_cache = {}
 
     def get_rules(self):
         return Rule.get_for_project(self.project.id)
@@ -66,14 +73,64 @@ class RuleProcessor(object):
 
         return rule_status
 
+    def get_rule_statuses(self, rule_list):
+        """
+        Returns a mapping of rule ids to their ``GroupRuleStatus``, creating
+        the missing ones with a single insert.
+        """
+        if not rule_list:
+            return {}
+
+        statuses = {
+            status.rule_id: status for status in GroupRuleStatus.objects.filter(
+                rule__in=rule_list,
+                group=self.group,
+            )
+        }
+
+        missing = [rule for rule in rule_list if rule.id not in statuses]
+        if missing:
+            try:
+                with transaction.atomic():
+                    GroupRuleStatus.objects.bulk_create([
+                        GroupRuleStatus(rule=rule, group=self.group, project=self.project)
+                        for rule in missing
+                    ])
+            except IntegrityError:
+                # another event for this group created some of them
+                # concurrently, fall back to picking them up one by one
+                for rule in missing:
+                    statuses[rule.id] = self.get_rule_status(rule)
+            else:
+                statuses.update(
+                    (status.rule_id, status) for status in GroupRuleStatus.objects.filter(
+                        rule__in=missing,
+                        group=self.group,
+                    )
+                )
+
+        return statuses
+
     def condition_matches(self, condition, state, rule):
+        # Conditions only depend on their data and the rule's environment,
+        # so identical conditions across rules are evaluated once.
+        cache_key = (json.dumps(condition, sort_keys=True), rule.environment_id)
+        if cache_key in self.condition_results:
+            return self.condition_results[cache_key]
+
         condition_cls = rules.get(condition['id'])
         if condition_cls is None:
             self.logger.warn('Unregistered condition %r', condition['id'])
             return
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
-        return safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
+        kwargs = {}
+        if issubclass(condition_cls, BaseEventFrequencyCondition):
+            kwargs['rate_cache'] = self.rate_cache
+
+        condition_inst = condition_cls(self.project, data=condition, rule=rule, **kwargs)
+        result = safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
+        self.condition_results[cache_key] = result
+        return result
 
     def get_state(self):
         return EventState(
@@ -83,21 +140,28 @@ class RuleProcessor(object):
             has_reappeared=self.has_reappeared,
         )
 
-    def apply_rule(self, rule):
-        match = rule.data.get('action_match') or Rule.DEFAULT_ACTION_MATCH
-        condition_list = rule.data.get('conditions', ())
-        frequency = rule.data.get('frequency') or Rule.DEFAULT_FREQUENCY
-
+    def is_applicable(self, rule):
         # XXX(dcramer): if theres no condition should we really skip it,
         # or should we just apply it blindly?
-        if not condition_list:
-            return
+        if not rule.data.get('conditions', ()):
+            return False
 
         if rule.environment_id is not None \
                 and self.event.get_environment().id != rule.environment_id:
+            return False
+
+        return True
+
+    def apply_rule(self, rule, status=None):
+        match = rule.data.get('action_match') or Rule.DEFAULT_ACTION_MATCH
+        condition_list = rule.data.get('conditions', ())
+        frequency = rule.data.get('frequency') or Rule.DEFAULT_FREQUENCY
+
+        if not self.is_applicable(rule):
             return
 
-        status = self.get_rule_status(rule)
+        if status is None:
+            status = self.get_rule_status(rule)
 
         now = timezone.now()
         freq_offset = now - timedelta(minutes=frequency)
@@ -154,6 +218,11 @@ class RuleProcessor(object):
 
     def apply(self):
         self.grouped_futures.clear()
-        for rule in self.get_rules():
-            self.apply_rule(rule)
+        self.condition_results.clear()
+        self.rate_cache.clear()
+
+        rule_list = list(self.get_rules())
+        statuses = self.get_rule_statuses([r for r in rule_list if self.is_applicable(r)])
+        for rule in rule_list:
+            self.apply_rule(rule, statuses.get(rule.id))
         return six.itervalues(self.grouped_futures)
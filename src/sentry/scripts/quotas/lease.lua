@@ -0,0 +1,47 @@
+-- Reserve a block of items from a collection of quota counters. Values
+-- provided as ``KEYS`` specify the keys of the counters to check and the keys
+-- of counters to subtract, exactly as for ``is_rate_limited.lua``. The first
+-- value provided as ``ARGV`` is the number of items requested, followed by the
+-- maximum value (quota limit) and expiration time for each key.
+--
+-- For example, to request up to 5 items from a quota ``foo`` that has a
+-- corresponding refund/negative counter "subtract_from_foo", a limit of 10
+-- items and expires at the Unix timestamp ``100``, the ``KEYS`` and ``ARGV``
+-- values would be as follows:
+--
+--   KEYS = {"foo", "subtract_from_foo"}
+--   ARGV = {5, 10, 100}
+--
+-- The number of items granted is the requested number, reduced to what is
+-- still available in the most exhausted quota. All counters are incremented
+-- by the number of items granted. The result is a Lua table/array (Redis
+-- multi bulk reply) whose first value is the number of items granted,
+-- followed by the number of items that were available in each quota before
+-- the request.
+assert(#KEYS == #ARGV - 1, "incorrect number of keys and arguments provided")
+assert(#KEYS % 2 == 0, "there must be an even number of keys")
+
+local requested = tonumber(ARGV[1])
+local granted = requested
+local results = {0}
+for i=1, #KEYS, 2 do
+    local limit = tonumber(ARGV[i + 1])
+    local available = limit - (redis.call('GET', KEYS[i]) or 0) + (redis.call('GET', KEYS[i + 1]) or 0)
+    if available < 0 then
+        available = 0
+    end
+    if available < granted then
+        granted = available
+    end
+    results[(i + 1) / 2 + 1] = available
+end
+
+if granted > 0 then
+    for i=1, #KEYS, 2 do
+        redis.call('INCRBY', KEYS[i], granted)
+        redis.call('EXPIREAT', KEYS[i], ARGV[i + 2])
+    end
+end
+
+results[1] = granted
+return results
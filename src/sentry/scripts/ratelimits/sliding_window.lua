@@ -0,0 +1,45 @@
+-- Check a collection of sliding window rate limits. Every value provided as
+-- ``KEYS`` is the key of a hash holding the state of one rate limit. The first
+-- value provided as ``ARGV`` is the current Unix timestamp, followed by the
+-- limit and window length (in seconds) for each key.
+--
+-- The number of items in the trailing window is estimated from the counts of
+-- the current and the previous fixed window, with the previous count weighted
+-- by how much of it still overlaps the trailing window:
+--
+--   estimate = previous * (1 - elapsed / window) + current
+--
+-- Accepted items are counted, rejected items are not. The result is a Lua
+-- table/array (Redis multi bulk reply) that specifies for each key whether the
+-- item was *rejected* (1) or accepted (0).
+assert(#KEYS * 2 + 1 == #ARGV, "incorrect number of keys and arguments provided")
+
+local now = tonumber(ARGV[1])
+local results = {}
+for i=1, #KEYS do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    local bucket = math.floor(now / window)
+
+    local state = redis.call('HMGET', KEYS[i], 'b', 'c', 'p')
+    local last = tonumber(state[1])
+    local current = 0
+    local previous = 0
+    if last == bucket then
+        current = tonumber(state[2])
+        previous = tonumber(state[3])
+    elseif last == bucket - 1 then
+        previous = tonumber(state[2])
+    end
+
+    local weight = 1 - (now - bucket * window) / window
+    if previous * weight + current + 1 > limit then
+        results[i] = 1
+    else
+        results[i] = 0
+        redis.call('HMSET', KEYS[i], 'b', bucket, 'c', current + 1, 'p', previous)
+        redis.call('EXPIRE', KEYS[i], window * 2)
+    end
+end
+
+return results
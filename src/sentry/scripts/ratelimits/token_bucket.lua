@@ -0,0 +1,37 @@
+-- Check a collection of token bucket rate limits. Every value provided as
+-- ``KEYS`` is the key of a hash holding the state of one bucket. The first
+-- value provided as ``ARGV`` is the current Unix timestamp, followed by the
+-- capacity of the bucket and the rate (tokens per second) at which it is
+-- refilled for each key.
+--
+-- A bucket starts out full. Every accepted item takes a token from its
+-- bucket, items are rejected while the bucket holds less than one token. The
+-- result is a Lua table/array (Redis multi bulk reply) that specifies for each
+-- key whether the item was *rejected* (1) or accepted (0).
+assert(#KEYS * 2 + 1 == #ARGV, "incorrect number of keys and arguments provided")
+
+local now = tonumber(ARGV[1])
+local results = {}
+for i=1, #KEYS do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+
+    local state = redis.call('HMGET', KEYS[i], 't', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+
+    if tokens < 1 then
+        results[i] = 1
+    else
+        results[i] = 0
+        tokens = tokens - 1
+    end
+
+    redis.call('HMSET', KEYS[i], 't', tokens, 'ts', now)
+    -- An untouched bucket is full again after this long, at which point it
+    -- no longer needs to be stored.
+    redis.call('EXPIRE', KEYS[i], math.ceil((capacity - tokens) / rate) + 1)
+end
+
+return results
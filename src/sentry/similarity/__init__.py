@@ -17,7 +17,7 @@ from sentry.similarity.features import (
     MessageFeature,
     get_application_chunks,
 )
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import VectorizedMinHashSignatureBuilder
 from sentry.utils import redis
 from sentry.utils.datastructures import BidirectionalMapping
 from sentry.utils.iterators import shingle
@@ -81,7 +81,7 @@ def _make_index_backend(cluster=None):
         RedisScriptMinHashIndexBackend(
             cluster,
             'sim:1',
-            MinHashSignatureBuilder(16, 0xFFFF),
+            VectorizedMinHashSignatureBuilder(16, 0xFFFF),
             8,
             60 * 60 * 24 * 30,
             3,
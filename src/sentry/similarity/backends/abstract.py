@@ -19,6 +19,26 @@ class AbstractIndexBackend(object):
     def record(self, scope, key, items, timestamp=None):
         pass
 
+    def classify_multi(self, requests, limit=None, timestamp=None):
+        """
+        Classifies several ``(scope, items)`` requests, returning the results
+        in request order.
+        """
+        return [
+            self.classify(scope, items, limit=limit, timestamp=timestamp)
+            for scope, items in requests
+        ]
+
+    def record_multi(self, requests):
+        """
+        Records several ``(scope, key, items, timestamp)`` requests, returning
+        the results in request order.
+        """
+        return [
+            self.record(scope, key, items, timestamp=timestamp)
+            for scope, key, items, timestamp in requests
+        ]
+
     @abstractmethod
     def merge(self, scope, destination, items, timestamp=None):
         pass
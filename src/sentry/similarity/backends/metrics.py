@@ -20,6 +20,14 @@ class MetricsWrapper(AbstractIndexBackend):
     def record(self, *args, **kwargs):
         return self.__instrumented_method_call('record', *args, **kwargs)
 
+    def record_multi(self, *args, **kwargs):
+        with timer(self.template.format('record_multi')):
+            return self.backend.record_multi(*args, **kwargs)
+
+    def classify_multi(self, *args, **kwargs):
+        with timer(self.template.format('classify_multi')):
+            return self.backend.classify_multi(*args, **kwargs)
+
     def classify(self, *args, **kwargs):
         return self.__instrumented_method_call('classify', *args, **kwargs)
 
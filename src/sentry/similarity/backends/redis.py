@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import itertools
 import time
 
+from redis.exceptions import NoScriptError
+
 from sentry.similarity.backends.abstract import AbstractIndexBackend
 from sentry.utils.iterators import chunked
 from sentry.utils.redis import load_script
@@ -47,6 +49,25 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         # all redis operations.
         return index(self.cluster, [scope], args)
 
+    def __index_multi(self, requests):
+        # Send every ``(scope, args)`` request in a single pipeline, rather
+        # than paying a round trip per request. The script may not have been
+        # loaded on every server the pipeline touches yet -- any requests
+        # that fail because of that are retried individually, which loads the
+        # script as a side effect.
+        pipeline = self.cluster.pipeline(transaction=False)
+        for scope, args in requests:
+            pipeline.execute_command('EVALSHA', index.sha, 1, scope, *args)
+
+        results = []
+        for (scope, args), result in zip(requests, pipeline.execute(raise_on_error=False)):
+            if isinstance(result, NoScriptError):
+                result = self.__index(scope, args)
+            elif isinstance(result, Exception):
+                raise result
+            results.append(result)
+        return results
+
     def _as_search_result(self, results):
         score_replacements = {
             -1.0: None,  # both items don't have the feature (no comparison)
@@ -82,7 +103,7 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             key=get_comparison_key,
         )
 
-    def classify(self, scope, items, limit=None, timestamp=None):
+    def _get_classify_arguments(self, scope, items, limit, timestamp):
         if timestamp is None:
             timestamp = int(time.time())
 
@@ -102,8 +123,21 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             arguments.extend([idx, threshold])
             arguments.extend(self._build_signature_arguments(features))
 
+        return arguments
+
+    def classify(self, scope, items, limit=None, timestamp=None):
+        arguments = self._get_classify_arguments(scope, items, limit, timestamp)
         return self._as_search_result(self.__index(scope, arguments))
 
+    def classify_multi(self, requests, limit=None, timestamp=None):
+        return map(
+            self._as_search_result,
+            self.__index_multi([
+                (scope, self._get_classify_arguments(scope, items, limit, timestamp))
+                for scope, items in requests
+            ]),
+        )
+
     def compare(self, scope, key, items, limit=None, timestamp=None):
         if timestamp is None:
             timestamp = int(time.time())
@@ -126,10 +160,7 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
 
         return self._as_search_result(self.__index(scope, arguments))
 
-    def record(self, scope, key, items, timestamp=None):
-        if not items:
-            return  # nothing to do
-
+    def _get_record_arguments(self, scope, key, items, timestamp):
         if timestamp is None:
             timestamp = int(time.time())
 
@@ -149,7 +180,33 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             arguments.append(idx)
             arguments.extend(self._build_signature_arguments(features))
 
-        return self.__index(scope, arguments)
+        return arguments
+
+    def record(self, scope, key, items, timestamp=None):
+        if not items:
+            return  # nothing to do
+
+        return self.__index(scope, self._get_record_arguments(scope, key, items, timestamp))
+
+    def record_multi(self, requests):
+        # Requests without any items are skipped (as they are in ``record``),
+        # but still have a result so that results line up with the requests.
+        results = [None] * len(requests)
+
+        pending = []
+        for i, (scope, key, items, timestamp) in enumerate(requests):
+            if items:
+                pending.append((
+                    i,
+                    (scope, self._get_record_arguments(scope, key, items, timestamp)),
+                ))
+
+        if pending:
+            responses = self.__index_multi([request for _, request in pending])
+            for (i, _), response in zip(pending, responses):
+                results[i] = response
+
+        return results
 
     def merge(self, scope, destination, items, timestamp=None):
         if timestamp is None:
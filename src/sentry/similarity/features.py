@@ -93,10 +93,7 @@ class FeatureSet(object):
                 )
         return results
 
-    def record(self, events):
-        if not events:
-            return []
-
+    def __get_record_request(self, events):
         scope = None
         key = None
 
@@ -134,13 +131,37 @@ class FeatureSet(object):
                     if features:
                         items.append((self.aliases[label], features, ))
 
+        return scope, key, items, int(to_timestamp(event.datetime))
+
+    def record(self, events):
+        if not events:
+            return []
+
+        scope, key, items, timestamp = self.__get_record_request(events)
+
         return self.index.record(
             scope,
             key,
             items,
-            timestamp=int(to_timestamp(event.datetime)),
+            timestamp=timestamp,
         )
 
+    def record_multi(self, events):
+        """\
+        Records each event individually, sending all of the index writes to
+        the backend as a single batch.
+        """
+        requests = []
+        for event in events:
+            scope, key, items, timestamp = self.__get_record_request([event])
+            if items:
+                requests.append((scope, key, items, timestamp))
+
+        if not requests:
+            return []
+
+        return self.index.record_multi(requests)
+
     def classify(self, events, limit=None, thresholds=None):
         if not events:
             return []
@@ -2,6 +2,11 @@ from __future__ import absolute_import
 
 import mmh3
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class MinHashSignatureBuilder(object):
     def __init__(self, columns, rows):
@@ -21,3 +26,94 @@ class MinHashSignatureBuilder(object):
             ),
             range(self.columns),
         )
+
+
+if np is not None:
+    MURMUR3_C1 = np.uint32(0xcc9e2d51)
+    MURMUR3_C2 = np.uint32(0x1b873593)
+
+    def _rotl32(x, r):
+        return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+    def _mix_k1(k):
+        k = k * MURMUR3_C1
+        k = _rotl32(k, 15)
+        return k * MURMUR3_C2
+
+
+class VectorizedMinHashSignatureBuilder(MinHashSignatureBuilder):
+    """
+    Produces the same signatures as ``MinHashSignatureBuilder`` using NumPy.
+
+    Every column hashes the features with MurmurHash3 using the column index
+    as the seed. The block mixing of MurmurHash3 does not depend on the seed,
+    so each feature is only mixed once and the per-seed state of all columns
+    and all features is updated as a single array. Falls back to
+    ``MinHashSignatureBuilder`` when NumPy is not installed or when there
+    are too few features for the array operations to pay off.
+    """
+
+    min_hashes_per_block = 32
+
+    def __call__(self, features):
+        if np is None:
+            return super(VectorizedMinHashSignatureBuilder, self).__call__(features)
+
+        features = [
+            feature if isinstance(feature, bytes) else feature.encode('utf-8')
+            for feature in features
+        ]
+
+        # Every block of the longest feature costs a round of array
+        # operations, which only pays off with enough features and columns.
+        if not features or len(features) * self.columns < \
+                self.min_hashes_per_block * (max(map(len, features)) // 4 + 1):
+            return super(VectorizedMinHashSignatureBuilder, self).__call__(features)
+
+        with np.errstate(over='ignore'):
+            hashes = self.__hash(features, np.arange(self.columns, dtype=np.uint32))
+            signature = np.mod(hashes.astype(np.int64), self.rows).min(axis=0)
+
+        return [int(value) for value in signature]
+
+    def __hash(self, features, seeds):
+        """
+        Returns the signed 32 bit MurmurHash3 of every feature for every seed
+        as a ``features x seeds`` array.
+        """
+        # Longest features first, so the features which still have full
+        # blocks left are always a prefix of the rows.
+        features = sorted(features, key=len, reverse=True)
+        lengths = np.array([len(feature) for feature in features], dtype=np.uint32)
+        nblocks = lengths // np.uint32(4)
+
+        # Pad every feature with zeros up to a common width, leaving room for
+        # at least one (possibly empty) tail block after the full blocks.
+        width = (int(lengths[0]) // 4 + 1) * 4
+        data = np.frombuffer(
+            b''.join(feature.ljust(width, b'\x00') for feature in features),
+            dtype='<u4',
+        ).reshape(len(features), width // 4)
+        blocks = _mix_k1(data.astype(np.uint32))
+
+        h = np.tile(seeds, (len(features), 1))
+
+        for i in range(int(nblocks[0])):
+            n = int((nblocks > i).sum())
+            mixed = h[:n] ^ blocks[:n, i][:, None]
+            h[:n] = _rotl32(mixed, 13) * np.uint32(5) + np.uint32(0xe6546b64)
+
+        # The block following the full blocks holds the tail bytes followed by
+        # zero padding, which is exactly the tail word MurmurHash3 builds.
+        # Mixing a zero word yields zero, so features without a tail are not
+        # affected.
+        h ^= blocks[np.arange(len(features)), nblocks][:, None]
+
+        h ^= lengths[:, None]
+        h ^= h >> np.uint32(16)
+        h = h * np.uint32(0x85ebca6b)
+        h ^= h >> np.uint32(13)
+        h = h * np.uint32(0xc2b2ae35)
+        h ^= h >> np.uint32(16)
+
+        return h.view(np.int32)
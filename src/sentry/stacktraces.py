@@ -30,6 +30,7 @@ class ProcessableFrame(object):
         self.data = None
         self.cache_key = None
         self.cache_value = None
+        self.cache_writes = None
         self.processable_frames = processable_frames
 
     def __repr__(self):
@@ -60,7 +61,12 @@ class ProcessableFrame(object):
 
     def set_cache_value(self, value):
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            # Within a processing task, values are written together once all
+            # frames have been processed.
+            if self.cache_writes is not None:
+                self.cache_writes[self.cache_key] = value
+            else:
+                cache.set(self.cache_key, value, 3600)
             return True
         return False
 
@@ -78,6 +84,15 @@ class StacktraceProcessingTask(object):
     def __init__(self, processable_stacktraces, processors):
         self.processable_stacktraces = processable_stacktraces
         self.processors = processors
+        self.cache_writes = {}
+        for frame in self.iter_processable_frames():
+            frame.cache_writes = self.cache_writes
+
+    def write_frame_cache(self):
+        """Writes the cache values set on all frames in a single call."""
+        if self.cache_writes:
+            cache.set_many(self.cache_writes, 3600)
+            self.cache_writes.clear()
 
     def close(self):
         for frame in self.iter_processable_frames():
@@ -308,10 +323,7 @@ def process_single_stacktrace(processing_task, stacktrace_info, processable_fram
 
 
 def lookup_frame_cache(keys):
-    rv = {}
-    for key in keys:
-        rv[key] = cache.get(key)
-    return rv
+    return cache.get_many(list(keys))
 
 
 def get_stacktrace_processing_task(infos, processors):
@@ -331,11 +343,13 @@ def get_stacktrace_processing_task(infos, processors):
             by_stacktrace_info.setdefault(processable_frame.stacktrace_info, []) \
                 .append(processable_frame)
             if processable_frame.cache_key is not None:
-                to_lookup[processable_frame.cache_key] = processable_frame
+                to_lookup.setdefault(processable_frame.cache_key, []) \
+                    .append(processable_frame)
 
     frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in six.iteritems(to_lookup):
-        processable_frame.cache_value = frame_cache.get(cache_key)
+    for cache_key, processable_frames in six.iteritems(to_lookup):
+        for processable_frame in processable_frames:
+            processable_frame.cache_value = frame_cache.get(cache_key)
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
@@ -393,6 +407,8 @@ def process_stacktraces(data, make_processors=None):
                 data.setdefault('errors', []).extend(dedup_errors(errors))
                 changed = True
 
+        processing_task.write_frame_cache()
+
     finally:
         for processor in processors:
             processor.close()
@@ -87,6 +87,7 @@ class TagStorage(Service):
 
         'incr_tag_value_times_seen',
         'incr_group_tag_value_times_seen',
+        'incr_tag_values_times_seen_multi',
         'update_group_tag_key_values_seen',
         'update_group_for_events',
     ])
@@ -304,6 +305,26 @@ class TagStorage(Service):
         """
         raise NotImplementedError
 
+    def incr_tag_values_times_seen_multi(self, project_id, group_id, environment_id,
+                                         tags, last_seen, count=1):
+        """
+        Increments the project and group counters of every ``(key, value, data)``
+        tag of an event.
+
+        >>> incr_tag_values_times_seen_multi(1, 2, 3, [("key1", "value1", None)], timezone.now())
+        """
+        for key, value, data in tags:
+            self.incr_tag_value_times_seen(project_id, environment_id, key, value, extra={
+                'last_seen': last_seen,
+                'data': data,
+            }, count=count)
+
+            self.incr_group_tag_value_times_seen(
+                project_id, group_id, environment_id, key, value, extra={
+                    'project_id': project_id,
+                    'last_seen': last_seen,
+                }, count=count)
+
     def get_group_event_filter(self, project_id, group_id, environment_ids, tags, start, end):
         """
         >>> get_group_event_filter(1, 2, 3, {'key1': 'value1', 'key2': 'value2'})
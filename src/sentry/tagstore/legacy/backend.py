@@ -442,6 +442,39 @@ class LegacyTagStorage(TagStorage):
                     },
                     extra=extra)
 
+    def incr_tag_values_times_seen_multi(self, project_id, group_id, environment_id,
+                                         tags, last_seen, count=1):
+        items = []
+        for key, value, data in tags:
+            items.append((
+                models.TagValue,
+                {'times_seen': count},
+                {
+                    'project_id': project_id,
+                    'key': key,
+                    'value': value,
+                },
+                {
+                    'last_seen': last_seen,
+                    'data': data,
+                },
+            ))
+            items.append((
+                models.GroupTagValue,
+                {'times_seen': count},
+                {
+                    'group_id': group_id,
+                    'key': key,
+                    'value': value,
+                },
+                {
+                    'project_id': project_id,
+                    'last_seen': last_seen,
+                },
+            ))
+
+        buffer.incr_multi(items)
+
     def get_group_event_filter(self, project_id, group_id, environment_ids, tags, start, end):
         tagkeys = dict(
             models.TagKey.objects.filter(
@@ -119,6 +119,8 @@ def merge_groups(
             transaction_id=transaction_id,
         )
 
+        GroupHash.objects.clear_project_cache(new_group.project_id)
+
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
             # from the list of "from" groups that are being merged, and finish the
@@ -187,6 +187,7 @@ def migrate_events(caches, project, source_id, destination_id,
             project_id=project.id,
             hash__in=fingerprints,
         ).update(group=destination_id)
+        GroupHash.objects.clear_project_cache(project.id)
 
         # Create activity records for the source and destination group.
         Activity.objects.create(
@@ -531,6 +532,8 @@ def lock_hashes(project_id, source_id, fingerprints):
             id__in=[h.id for h in eligible_hashes],
         ).update(state=GroupHash.State.LOCKED_IN_MIGRATION)
 
+    GroupHash.objects.clear_project_cache(project_id)
+
     return [h.hash for h in eligible_hashes]
 
 
@@ -540,6 +543,7 @@ def unlock_hashes(project_id, fingerprints):
         hash__in=fingerprints,
         state=GroupHash.State.LOCKED_IN_MIGRATION,
     ).update(state=GroupHash.State.UNLOCKED)
+    GroupHash.objects.clear_project_cache(project_id)
 
 
 @instrumented_task(name='sentry.tasks.unmerge', queue='unmerge')
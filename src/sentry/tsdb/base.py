@@ -116,6 +116,7 @@ class BaseTSDB(Service):
     __write_methods__ = frozenset([
         'incr',
         'incr_multi',
+        'incr_batch',
         'merge',
         'delete',
         'record',
@@ -311,6 +312,18 @@ class BaseTSDB(Service):
         for model, key in items:
             self.incr(model, key, timestamp, count, environment_id=environment_id)
 
+    def incr_batch(self, items):
+        """
+        Increment several counters, each by its own count:
+
+        >>> incr_batch([
+        >>>     (TimeSeriesModel.project, 1, timestamp, 3, None),
+        >>>     (TimeSeriesModel.group, 5, timestamp, 1, environment_id),
+        >>> ])
+        """
+        for model, key, timestamp, count, environment_id in items:
+            self.incr(model, key, timestamp, count, environment_id=environment_id)
+
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         """
         Transfer all counters from the source keys to the destination key.
@@ -0,0 +1,170 @@
+"""
+sentry.tsdb.coalescing
+~~~~~~~~~~~~~~~~~~~~~~
+
+:copyright: (c) 2010-2018 by the Sentry Team, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+from __future__ import absolute_import
+
+import logging
+import threading
+import six
+
+from fractions import gcd
+from time import time
+
+from django.utils import timezone
+
+from sentry.tsdb.base import BaseTSDB
+from sentry.utils import metrics
+from sentry.utils.dates import to_datetime
+from sentry.utils.flush import register_flush, unregister_flush
+from sentry.utils.imports import import_string
+from six.moves import reduce
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingTSDB(BaseTSDB):
+    """
+    A write-behind layer which merges counter increments within a process
+    before handing them to the wrapped backend.
+
+    Increments for the same ``(model, key, environment)`` that fall into the
+    same bucket of the finest rollup are summed. Pending increments are
+    written with one ``incr_batch`` call once ``flush_interval`` seconds have
+    passed or ``max_pending`` counters are queued, when a task finishes, when
+    the process exits, and before any counter is read, merged or deleted.
+    Distinct counters and frequency tables are passed through as they are.
+
+    >>> SENTRY_TSDB = 'sentry.tsdb.coalescing.CoalescingTSDB'
+    >>> SENTRY_TSDB_OPTIONS = {
+    >>>     'backend': 'sentry.tsdb.redis.RedisTSDB',
+    >>>     'backend_options': {},
+    >>>     'flush_interval': 1,
+    >>>     'max_pending': 1000,
+    >>> }
+    """
+
+    def __init__(self, backend, backend_options=None, flush_interval=1, max_pending=1000):
+        if isinstance(backend, six.string_types):
+            backend = import_string(backend)
+        self.backend = backend(**(backend_options or {}))
+        super(CoalescingTSDB, self).__init__(rollups=self.backend.rollups)
+
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        assert self.max_pending > 0
+
+        # Every rollup bucket is a multiple of this resolution, so merging
+        # increments within it never moves them into another bucket.
+        self.resolution = reduce(gcd, self.rollups.keys())
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time()
+
+        self.connect_signals()
+
+    def connect_signals(self):
+        register_flush(self, 'flush_pending')
+
+    def close(self):
+        """
+        Writes all pending increments and stops flushing this backend when a
+        task finishes or the process exits.
+        """
+        unregister_flush(self)
+        self.flush_pending()
+
+    def validate(self):
+        self.backend.validate()
+
+    def incr(self, model, key, timestamp=None, count=1, environment_id=None):
+        self.incr_multi([(model, key)], timestamp, count, environment_id)
+
+    def incr_multi(self, items, timestamp=None, count=1, environment_id=None):
+        self.incr_batch([
+            (model, key, timestamp, count, environment_id) for model, key in items
+        ])
+
+    def incr_batch(self, items):
+        self.validate_arguments(
+            [model for model, _, _, _, _ in items],
+            [environment_id for _, _, _, _, environment_id in items],
+        )
+
+        now = None
+        with self._lock:
+            for model, key, timestamp, count, environment_id in items:
+                if timestamp is None:
+                    if now is None:
+                        now = timezone.now()
+                    timestamp = now
+
+                pending_key = (
+                    model,
+                    key,
+                    self.normalize_to_epoch(timestamp, self.resolution),
+                    environment_id,
+                )
+                self._pending[pending_key] = self._pending.get(pending_key, 0) + count
+
+            should_flush = len(self._pending) >= self.max_pending or \
+                time() - self._last_flush >= self.flush_interval
+
+        if should_flush:
+            self.flush_pending()
+
+    def flush_pending(self):
+        """
+        Writes all pending increments to the wrapped backend.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time()
+
+        if not pending:
+            return
+
+        metrics.timing('tsdb.coalesced-flush-size', len(pending))
+        try:
+            self.backend.incr_batch([
+                (model, key, to_datetime(epoch), count, environment_id)
+                for (model, key, epoch, environment_id), count in six.iteritems(pending)
+            ])
+        except Exception:
+            # Keep the increments for the next flush.
+            logger.exception('tsdb.coalesced-flush-failed')
+            metrics.incr('tsdb.coalesced-flush-failed', amount=len(pending))
+            with self._lock:
+                for pending_key, count in six.iteritems(self._pending):
+                    pending[pending_key] = pending.get(pending_key, 0) + count
+                self._pending = pending
+
+    def flush(self):
+        with self._lock:
+            self._pending = {}
+        return self.backend.flush()
+
+
+def _make_proxy_method(name, flush):
+    def method(self, *args, **kwargs):
+        if flush:
+            self.flush_pending()
+        return getattr(self.backend, name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+# Counter reads and writes other than increments see the pending increments
+# first. Everything else is passed through.
+for name in ('get_range', 'get_sums', 'merge', 'delete'):
+    setattr(CoalescingTSDB, name, _make_proxy_method(name, flush=True))
+
+for name in (BaseTSDB.__read_methods__ | BaseTSDB.__write_methods__) - frozenset([
+    'get_range', 'get_sums', 'merge', 'delete', 'incr', 'incr_multi', 'incr_batch', 'flush',
+]):
+    setattr(CoalescingTSDB, name, _make_proxy_method(name, flush=False))
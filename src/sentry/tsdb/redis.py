@@ -242,6 +242,51 @@ class RedisTSDB(BaseTSDB):
                                 self.calculate_expiry(rollup, max_values, timestamp),
                             )
 
+    def incr_batch(self, items):
+        """
+        Increment several counters, each by its own count. Writes are sent in
+        one batch per cluster and every hash is only given one expiry:
+
+        >>> incr_batch([
+        >>>     (TimeSeriesModel.project, 1, timestamp, 3, None),
+        >>>     (TimeSeriesModel.group, 5, timestamp, 1, environment_id),
+        >>> ])
+        """
+        self.validate_arguments(
+            [model for model, _, _, _, _ in items],
+            [environment_id for _, _, _, _, environment_id in items],
+        )
+
+        now = timezone.now()
+        requests = defaultdict(list)
+        for model, key, timestamp, count, environment_id in items:
+            if timestamp is None:
+                timestamp = now
+            for cluster_environment_id in set([None, environment_id]):
+                requests[self.get_cluster(cluster_environment_id)].append(
+                    (model, key, timestamp, count, cluster_environment_id),
+                )
+
+        for (cluster, durable), cluster_requests in six.iteritems(requests):
+            manager = cluster.map()
+            if not durable:
+                manager = SuppressionWrapper(manager)
+
+            with manager as client:
+                expiries = {}
+                for rollup, max_values in six.iteritems(self.rollups):
+                    for model, key, timestamp, count, environment_id in cluster_requests:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, timestamp, key, environment_id)
+                        client.hincrby(hash_key, hash_field, count)
+                        expiries[hash_key] = max(
+                            expiries.get(hash_key, 0),
+                            self.calculate_expiry(rollup, max_values, timestamp),
+                        )
+
+                for hash_key, expiry in six.iteritems(expiries):
+                    client.expireat(hash_key, expiry)
+
     def get_range(self, model, keys, start, end, rollup=None, environment_ids=None):
         """
         To get a range of data for group ID=[1, 2, 3]:
@@ -251,34 +296,42 @@ class RedisTSDB(BaseTSDB):
         >>>          start=now - timedelta(days=1),
         >>>          end=now)
         """
-        # redis backend doesn't support multiple envs
-        if environment_ids is not None and len(environment_ids) > 1:
-            raise NotImplementedError
-        environment_id = environment_ids[0] if environment_ids is not None else None
+        # The counts of several environments are summed per key and epoch.
+        environment_ids = set(environment_ids) if environment_ids else set([None])
 
-        self.validate_arguments([model], [environment_id])
+        self.validate_arguments([model], environment_ids)
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         series = map(to_datetime, series)
 
-        results = []
-        cluster, _ = self.get_cluster(environment_id)
-        with cluster.map() as client:
+        results_by_key = {
+            key: {to_timestamp(timestamp): 0 for timestamp in series} for key in keys
+        }
+
+        for (cluster, _), environment_ids in self.get_cluster_groups(environment_ids):
+            # Counters for many keys share a hash (see ``make_counter_key``),
+            # so fields are grouped by hash and read with one ``HMGET`` per
+            # hash instead of one ``HGET`` per field.
+            fields_by_hash_key = defaultdict(list)
             for key in keys:
                 for timestamp in series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id)
-                    results.append(
-                        (to_timestamp(timestamp), key, client.hget(
-                            hash_key, hash_field)))
-
-        results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
-
-        for key, points in six.iteritems(results_by_key):
-            results_by_key[key] = sorted(points.items())
-        return dict(results_by_key)
+                    epoch = to_timestamp(timestamp)
+                    for environment_id in environment_ids:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, timestamp, key, environment_id)
+                        fields_by_hash_key[hash_key].append((key, epoch, hash_field))
+
+            with cluster.map() as client:
+                responses = {
+                    hash_key: client.hmget(hash_key, [hash_field for _, _, hash_field in fields])
+                    for hash_key, fields in six.iteritems(fields_by_hash_key)
+                }
+
+            for hash_key, fields in six.iteritems(fields_by_hash_key):
+                for (key, epoch, _), count in zip(fields, responses[hash_key].value):
+                    results_by_key[key][epoch] += int(count or 0)
+
+        return {key: sorted(points.items()) for key, points in six.iteritems(results_by_key)}
 
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (
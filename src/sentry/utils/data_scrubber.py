@@ -9,6 +9,7 @@ from __future__ import absolute_import
 
 import re
 import six
+from functools32 import lru_cache
 from six.moves.urllib.parse import urlsplit, urlunsplit
 
 from sentry.constants import DEFAULT_SCRUBBED_FIELDS, FILTER_MASK, NOT_SCRUBBED_VALUES
@@ -20,6 +21,10 @@ def varmap(func, var, context=None, name=None):
     Executes ``func(key_name, value)`` on all values
     recurisively discovering dict and list scoped
     values.
+
+    Containers are only copied if ``func`` changed any of the values
+    within them, otherwise the original container is returned. Copies keep
+    the type of the original, so tuples stay tuples.
     """
     if context is None:
         context = set()
@@ -30,19 +35,53 @@ def varmap(func, var, context=None, name=None):
     context.add(objid)
 
     if isinstance(var, dict):
-        ret = dict((k, varmap(func, v, context, k)) for k, v in six.iteritems(var))
+        ret = var
+        for k, v in six.iteritems(var):
+            new_v = varmap(func, v, context, k)
+            if new_v is not v:
+                if ret is var:
+                    ret = dict(var)
+                ret[k] = new_v
     elif isinstance(var, (list, tuple)):
+        ret = var
         # treat it like a mapping
         if all(isinstance(v, (list, tuple)) and len(v) == 2 for v in var):
-            ret = [[k, varmap(func, v, context, k)] for k, v in var]
+            for i, pair in enumerate(var):
+                k, v = pair
+                new_v = varmap(func, v, context, k)
+                if new_v is not v:
+                    if ret is var:
+                        ret = list(var)
+                    ret[i] = (k, new_v) if isinstance(pair, tuple) else [k, new_v]
         else:
-            ret = [varmap(func, f, context, name) for f in var]
+            for i, f in enumerate(var):
+                new_f = varmap(func, f, context, name)
+                if new_f is not f:
+                    if ret is var:
+                        ret = list(var)
+                    ret[i] = new_f
+        if ret is not var and isinstance(var, tuple):
+            ret = tuple(ret)
     else:
         ret = func(name, var)
     context.remove(objid)
     return ret
 
 
+@lru_cache(maxsize=100)
+def compile_fields(fields):
+    """
+    Compiles a set of (lowercase) field names into a single pattern that
+    matches any string containing one of them, or ``None`` if there are no
+    fields.
+    """
+    if not fields:
+        return None
+    return re.compile(u'|'.join(
+        re.escape(field) for field in sorted(fields)
+    ))
+
+
 class SensitiveDataFilter(object):
     """
     Asterisk out things that look like passwords, credit card numbers,
@@ -72,6 +111,9 @@ class SensitiveDataFilter(object):
             fields += DEFAULT_SCRUBBED_FIELDS
         self.exclude_fields = {f.lower() for f in exclude_fields}
         self.fields = set(fields)
+        # Compiled patterns are shared by all filters with the same fields,
+        # so they are only built when a project's settings change.
+        self.fields_re = compile_fields(frozenset(self.fields))
 
     def apply(self, data):
         # TODO(dcramer): move this into each interface
@@ -133,10 +175,10 @@ class SensitiveDataFilter(object):
         else:
             str_value = ''
 
-        for field in self.fields:
-            if field in str_value:
+        if self.fields_re is not None:
+            if str_value and self.fields_re.search(str_value):
                 return FILTER_MASK
-            if field in key and value not in NOT_SCRUBBED_VALUES:
+            if key and self.fields_re.search(key) and value not in NOT_SCRUBBED_VALUES:
                 return FILTER_MASK
         return value
 
@@ -1,6 +1,8 @@
 from __future__ import absolute_import
 
-from collections import Hashable, MutableMapping
+import threading
+
+from collections import Hashable, MutableMapping, OrderedDict
 
 __unset__ = object()
 
@@ -61,3 +63,62 @@ class BidirectionalMapping(MutableMapping):
 
     def inverse(self):
         return self.__inverse.copy()
+
+
+class SizedLRUCache(object):
+    """\
+    A thread safe least-recently-used cache which is bounded by the total
+    size of its values rather than by the number of entries.
+
+    The size of every value is provided by the caller when it is added. A
+    value which is larger than ``max_size`` on its own is never stored.
+    """
+
+    def __init__(self, max_size):
+        assert max_size > 0
+        self.max_size = max_size
+        self.size = 0
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __contains__(self, key):
+        return key in self.__data
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value, size = self.__data.pop(key)
+            except KeyError:
+                return default
+            self.__data[key] = (value, size)
+            return value
+
+    def set(self, key, value, size):
+        with self.__lock:
+            previous = self.__data.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+            if size > self.max_size:
+                return
+
+            self.__data[key] = (value, size)
+            self.size += size
+
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self.__data.popitem(last=False)
+                self.size -= evicted_size
+
+    def delete(self, key):
+        with self.__lock:
+            previous = self.__data.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.size = 0
@@ -103,6 +103,29 @@ def attach_foreignkey(objects, field, related=[], database=None):
         setattr(o, accessor, queryset.get(getattr(o, column)))
 
 
+def attach_foreignkey_from_cache(objects, field):
+    """
+    Same as ``attach_foreignkey`` for a ``ForeignKey`` to a model with a
+    ``BaseManager``, but the related objects are read with one
+    ``get_many_from_cache`` call.
+
+    ``attach_foreignkey_from_cache(groups, Group.project)``
+    """
+    field = field.field
+    accessor = '_%s_cache' % field.name
+
+    objects = [o for o in objects if getattr(o, accessor, False) is False]
+    values = set(filter(None, (getattr(o, field.column) for o in objects)))
+    if not values:
+        return
+
+    related = dict(
+        (o.pk, o) for o in field.rel.to.objects.get_many_from_cache('pk', list(values))
+    )
+    for o in objects:
+        setattr(o, accessor, related.get(getattr(o, field.column)))
+
+
 def table_exists(name, using=DEFAULT_DB_ALIAS):
     return name in connections[using].introspection.table_names()
 
@@ -0,0 +1,63 @@
+"""
+sentry.utils.flush
+~~~~~~~~~~~~~~~~~~
+
+:copyright: (c) 2010-2018 by the Sentry Team, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+from __future__ import absolute_import
+
+import atexit
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Registered objects are flushed from receivers which are only connected once
+# per process, and which do not keep the objects alive.
+_registered = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_signals_connected = False
+
+
+def flush_registered(**kwargs):
+    """
+    Calls the flush method of every registered object.
+    """
+    with _lock:
+        registered = list(_registered.items())
+
+    for obj, method in registered:
+        try:
+            getattr(obj, method)()
+        except Exception:
+            logger.exception('flush.failed', extra={'type': type(obj).__name__})
+
+
+def _connect_signals():
+    global _signals_connected
+    if _signals_connected:
+        return
+
+    from celery.signals import task_postrun, worker_process_shutdown
+    task_postrun.connect(flush_registered, weak=False)
+    worker_process_shutdown.connect(flush_registered, weak=False)
+    atexit.register(flush_registered)
+    _signals_connected = True
+
+
+def register_flush(obj, method='flush'):
+    """
+    Calls ``method`` of ``obj`` whenever a task finishes, a worker process
+    shuts down, or the process exits, until ``unregister_flush`` is called or
+    ``obj`` is garbage collected.
+    """
+    with _lock:
+        _connect_signals()
+        _registered[obj] = method
+
+
+def unregister_flush(obj):
+    with _lock:
+        _registered.pop(obj, None)
@@ -82,6 +82,19 @@ _default_encoder = JSONEncoder(
     default=better_default_encoder,
 )
 
+_sorted_encoder = JSONEncoder(
+    separators=(',', ':'),
+    ignore_nan=True,
+    skipkeys=False,
+    ensure_ascii=True,
+    check_circular=True,
+    allow_nan=True,
+    indent=None,
+    encoding='utf-8',
+    default=better_default_encoder,
+    sort_keys=True,
+)
+
 _default_escaped_encoder = JSONEncoderForHTML(
     separators=(',', ':'),
     ignore_nan=True,
@@ -104,6 +117,8 @@ def dumps(value, escape=False, **kwargs):
     # Legacy use. Do not use. Use dumps_htmlsafe
     if escape:
         return _default_escaped_encoder.encode(value)
+    if kwargs.get('sort_keys'):
+        return _sorted_encoder.encode(value)
     return _default_encoder.encode(value)
 
 
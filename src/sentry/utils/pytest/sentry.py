@@ -105,6 +105,18 @@ def pytest_configure(config):
     settings.SENTRY_TSDB = 'sentry.tsdb.inmemory.InMemoryTSDB'
     settings.SENTRY_TSDB_OPTIONS = {}
 
+    # Worker threads would use database connections outside of the test
+    # transaction, so release artifacts and serializer attributes are always
+    # loaded inline.
+    settings.SENTRY_SCRAPE_JAVASCRIPT_CONCURRENCY = 1
+    settings.SENTRY_SERIALIZER_CONCURRENCY = 1
+
+    # Instances cached in process memory would outlive the test transaction
+    # they were loaded in.
+    settings.SENTRY_MODEL_LOCAL_CACHE_SIZE = 0
+    settings.SENTRY_DIF_CACHE_POOL_SIZE = 0
+    settings.SENTRY_DIF_LOOKUP_TTL = 0
+
     if settings.SENTRY_NEWSLETTER == 'sentry.newsletter.base.Newsletter':
         settings.SENTRY_NEWSLETTER = 'sentry.newsletter.dummy.DummyNewsletter'
         settings.SENTRY_NEWSLETTER_OPTIONS = {}
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 import functools
+import hashlib
 import logging
 import posixpath
 import six
@@ -217,7 +218,8 @@ def check_cluster_versions(cluster, required, recommended=None, label=None):
 
 
 def load_script(path):
-    script = Script(None, resource_string('sentry', posixpath.join('scripts', path)))
+    source = resource_string('sentry', posixpath.join('scripts', path))
+    script = Script(None, source)
 
     # This changes the argument order of the ``Script.__call__`` method to
     # encourage using the script with a specific Redis client, rather
@@ -234,4 +236,9 @@ def load_script(path):
         """.format(path)
         return script(keys, args, client)
 
+    # Exposed so that callers can issue ``EVALSHA`` themselves, for example
+    # when batching several calls in a pipeline. ``Script`` only fills in
+    # its own ``sha`` once it has been executed, so compute it up front.
+    call_script.sha = hashlib.sha1(source).hexdigest()
+
     return call_script
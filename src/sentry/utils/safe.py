@@ -48,64 +48,92 @@ def safe_execute(func, *args, **kwargs):
         return result
 
 
-def trim(
-    value,
-    max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
-    max_depth=6,
-    object_hook=None,
-    _depth=0,
-    _size=0,
-    **kwargs
-):
+def _trim(value, max_size, max_depth, object_hook, _depth, _size):
     """
-    Truncates a value to ```MAX_VARIABLE_SIZE```.
+    Trims ``value`` and returns it along with the length of its ``repr``.
 
-    The method of truncation depends on the type of value.
+    Containers are measured from the lengths of their (already trimmed)
+    children, so every value is only ever serialized once. This is what
+    ``len(force_text(value))`` returns for the containers built here.
     """
-    options = {
-        'max_depth': max_depth,
-        'max_size': max_size,
-        'object_hook': object_hook,
-        '_depth': _depth + 1,
-    }
-
     if _depth > max_depth and ENABLE_TRIMMING:
         if not isinstance(value, six.string_types):
             value = json.dumps(value)
-        return trim(value, _size=_size, max_size=max_size)
+        return _trim(value, max_size, max_depth, None, 0, _size)
 
     elif isinstance(value, dict):
         result = {}
+        length = 2
         _size += 2
         for k in sorted(value.keys()):
-            v = value[k]
-            trim_v = trim(v, _size=_size, **options)
+            trim_v, trim_length = _trim(
+                value[k], max_size, max_depth, object_hook, _depth + 1, _size)
             result[k] = trim_v
-            _size += len(force_text(trim_v)) + 1
+            length += len(repr(k)) + 2 + trim_length + (2 if len(result) > 1 else 0)
+            _size += _measure(trim_v, trim_length) + 1
             if _size >= max_size and ENABLE_TRIMMING:
                 break
 
     elif isinstance(value, (list, tuple)):
         result = []
+        length = 2
         _size += 2
         for v in value:
-            trim_v = trim(v, _size=_size, **options)
+            trim_v, trim_length = _trim(v, max_size, max_depth, object_hook, _depth + 1, _size)
             result.append(trim_v)
-            _size += len(force_text(trim_v))
+            length += trim_length + (2 if len(result) > 1 else 0)
+            _size += _measure(trim_v, trim_length)
             if _size >= max_size and ENABLE_TRIMMING:
                 break
         if isinstance(value, tuple):
             result = tuple(result)
+            if len(result) == 1:
+                length += 1  # trailing comma
 
     elif isinstance(value, six.string_types) and ENABLE_TRIMMING:
         result = truncatechars(value, max_size - _size)
+        length = None
 
     else:
         result = value
+        length = None
 
-    if object_hook is None:
-        return result
-    return object_hook(result)
+    if object_hook is not None:
+        hooked = object_hook(result)
+        if hooked is not result:
+            result, length = hooked, None
+
+    if length is None:
+        length = len(repr(result))
+    return result, length
+
+
+def _measure(value, length):
+    """
+    Returns ``len(force_text(value))`` for a value returned by ``_trim``.
+    """
+    if isinstance(value, (dict, list, tuple)):
+        return length
+    if isinstance(value, six.text_type):
+        return len(value)
+    return len(force_text(value))
+
+
+def trim(
+    value,
+    max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
+    max_depth=6,
+    object_hook=None,
+    _depth=0,
+    _size=0,
+    **kwargs
+):
+    """
+    Truncates a value to ```MAX_VARIABLE_SIZE```.
+
+    The method of truncation depends on the type of value.
+    """
+    return _trim(value, max_size, max_depth, object_hook, _depth, _size)[0]
 
 
 def trim_pairs(iterable, max_items=settings.SENTRY_MAX_DICTIONARY_ITEMS, **kwargs):
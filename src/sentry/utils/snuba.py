@@ -4,23 +4,27 @@ from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from dateutil.parser import parse as parse_datetime
+import math
 import os
 import pytz
 import re
 import six
+import threading
 import time
 import urllib3
 
 from django.conf import settings
 
-from sentry import quotas
+from sentry import options, quotas
 from sentry.models import (
     Environment, Group, GroupRelease,
     Organization, Project, Release, ReleaseProject
 )
 from sentry.net.http import connection_from_url
 from sentry.utils import metrics, json
+from sentry.utils.cache import cache
 from sentry.utils.dates import to_timestamp
+from sentry.utils.hashlib import md5_text
 
 # TODO remove this when Snuba accepts more than 500 issues
 MAX_ISSUES = 500
@@ -227,6 +231,19 @@ def to_naive_timestamp(value):
     return (value - epoch_naive).total_seconds()
 
 
+def snap_time_window(start, end, interval):
+    """
+    Widen the naive datetimes ``start`` and ``end`` to multiples of
+    ``interval`` seconds.
+    """
+    start = math.floor(to_naive_timestamp(start) / interval) * interval
+    end = math.ceil(to_naive_timestamp(end) / interval) * interval
+    return (
+        epoch_naive + timedelta(seconds=start),
+        epoch_naive + timedelta(seconds=end),
+    )
+
+
 def zerofill(data, start, end, rollup, orderby):
     rv = []
     start = (int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup)
@@ -436,13 +453,22 @@ def raw_query(start, end, groupby=None, conditions=None, filter_keys=None,
     if start > end:
         raise QueryOutsideGroupActivityError
 
+    # Consistent queries must see the latest writes, so they are never cached.
+    cache_ttl = 0 if OVERRIDE_OPTIONS.get('consistent') else options.get('snuba.query-cache-ttl')
+    if cache_ttl and rollup and 'time' in groupby:
+        # Queries only share a cache entry if their bounds are the same, so
+        # queries grouped by time are widened to the rollup, which does not
+        # change the buckets they return. Other queries are keyed on their
+        # exact bounds.
+        start, end = snap_time_window(start, end, rollup)
+
     kwargs.update({
         'from_date': start.isoformat(),
         'to_date': end.isoformat(),
         'groupby': groupby,
         'conditions': conditions,
         'aggregations': aggregations,
-        'project': project_ids,
+        'project': sorted(project_ids),
         'granularity': rollup,  # TODO name these things the same
     })
     kwargs = {k: v for k, v in six.iteritems(kwargs) if v is not None}
@@ -453,22 +479,20 @@ def raw_query(start, end, groupby=None, conditions=None, filter_keys=None,
     if referrer:
         headers['referer'] = referrer
 
-    try:
-        with timer('snuba_query'):
-            response = _snuba_pool.urlopen(
-                'POST', '/query', body=json.dumps(kwargs), headers=headers)
-    except urllib3.exceptions.HTTPError as err:
-        raise SnubaError(err)
+    if cache_ttl:
+        status, data = _cached_snuba_query(kwargs, headers, cache_ttl, referrer)
+    else:
+        status, data = _snuba_query(json.dumps(kwargs), headers)
 
     try:
-        body = json.loads(response.data)
+        body = json.loads(data)
     except ValueError:
-        raise UnexpectedResponseError(u"Could not decode JSON response: {}".format(response.data))
+        raise UnexpectedResponseError(u"Could not decode JSON response: {}".format(data))
 
-    if response.status != 200:
+    if status != 200:
         if body.get('error'):
             error = body['error']
-            if response.status == 429:
+            if status == 429:
                 raise RateLimitExceeded(error['message'])
             elif error['type'] == 'schema':
                 raise SchemaValidationError(error['message'])
@@ -480,13 +504,85 @@ def raw_query(start, end, groupby=None, conditions=None, filter_keys=None,
             else:
                 raise SnubaError(error['message'])
         else:
-            raise SnubaError(u'HTTP {}'.format(response.status))
+            raise SnubaError(u'HTTP {}'.format(status))
 
     # Forward and reverse translation maps from model ids to snuba keys, per column
     body['data'] = [reverse(d) for d in body['data']]
     return body
 
 
+def _snuba_query(body, headers):
+    """
+    Posts a serialized query to snuba, returning the response status and data.
+    """
+    try:
+        with timer('snuba_query'):
+            response = _snuba_pool.urlopen('POST', '/query', body=body, headers=headers)
+    except urllib3.exceptions.HTTPError as err:
+        raise SnubaError(err)
+
+    return response.status, response.data
+
+
+class _InflightQuery(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight_queries = {}
+_inflight_queries_lock = threading.Lock()
+
+
+def _cached_snuba_query(request, headers, ttl, referrer=None):
+    """
+    Same as ``_snuba_query``, but successful responses are cached for ``ttl``
+    seconds, keyed by the ``request`` dictionary. Identical queries that are made while one
+    of them is in flight in this process wait for its response rather than
+    sending their own.
+    """
+    body = json.dumps(request)
+    # The key does not depend on the order in which the query was built.
+    cache_key = 'snuba:query:{}'.format(
+        md5_text(json.dumps(request, sort_keys=True)).hexdigest(),
+    )
+    metric_tags = {'referrer': referrer or 'unknown'}
+
+    data = cache.get(cache_key)
+    if data is not None:
+        metrics.incr('snuba.query-cache.hit', tags=metric_tags)
+        return 200, data
+
+    with _inflight_queries_lock:
+        inflight = _inflight_queries.get(cache_key)
+        is_leader = inflight is None
+        if is_leader:
+            inflight = _inflight_queries[cache_key] = _InflightQuery()
+
+    if not is_leader:
+        metrics.incr('snuba.query-cache.coalesced', tags=metric_tags)
+        inflight.event.wait()
+        if inflight.error is not None:
+            raise inflight.error
+        return inflight.result
+
+    metrics.incr('snuba.query-cache.miss', tags=metric_tags)
+    try:
+        inflight.result = _snuba_query(body, headers)
+        if inflight.result[0] == 200:
+            cache.set(cache_key, inflight.result[1], ttl)
+    except Exception as e:
+        inflight.error = e
+        raise
+    finally:
+        with _inflight_queries_lock:
+            del _inflight_queries[cache_key]
+        inflight.event.set()
+
+    return inflight.result
+
+
 def query(start, end, groupby, conditions=None, filter_keys=None, aggregations=None,
           selected_columns=None, totals=None, **kwargs):
 
@@ -92,6 +92,43 @@ def api(func):
     return wrapped
 
 
+def _scrub_and_insert(project, org_options, helper, data, start_time, attachments):
+    scrub_ip_address = (org_options.get('sentry:require_scrub_ip_address', False) or
+                        project.get_option('sentry:scrub_ip_address', False))
+    scrub_data = (org_options.get('sentry:require_scrub_data', False) or
+                  project.get_option('sentry:scrub_data', True))
+
+    if scrub_data:
+        # We filter data immediately before it ever gets into the queue
+        sensitive_fields_key = 'sentry:sensitive_fields'
+        sensitive_fields = (
+            org_options.get(sensitive_fields_key, []) +
+            project.get_option(sensitive_fields_key, [])
+        )
+
+        exclude_fields_key = 'sentry:safe_fields'
+        exclude_fields = (
+            org_options.get(exclude_fields_key, []) +
+            project.get_option(exclude_fields_key, [])
+        )
+
+        scrub_defaults = (org_options.get('sentry:require_scrub_defaults', False) or
+                          project.get_option('sentry:scrub_defaults', True))
+
+        SensitiveDataFilter(
+            fields=sensitive_fields,
+            include_defaults=scrub_defaults,
+            exclude_fields=exclude_fields,
+        ).apply(data)
+
+    if scrub_ip_address:
+        # We filter data immediately before it ever gets into the queue
+        helper.ensure_does_not_have_ip(data)
+
+    # mutates data (strips a lot of context if not queued)
+    helper.insert_data_to_database(data, start_time=start_time, attachments=attachments)
+
+
 def process_event(event_manager, project, key, remote_addr, helper, attachments):
     event_received.send_robust(ip=remote_addr, project=project, sender=process_event)
 
@@ -194,46 +231,18 @@ def process_event(event_manager, project, key, remote_addr, helper, attachments)
     # supplied by the user
     cache_key = 'ev:%s:%s' % (project.id, event_id, )
 
-    if cache.get(cache_key) is not None:
+    # Check for a duplicate and claim the event ID in a single round trip.
+    # The claim is released again if the event does not make it into the
+    # queue, so that the client can retry it.
+    if not cache.add(cache_key, '', 60 * 5):
         raise APIForbidden(
             'An event with the same ID already exists (%s)' % (event_id, ))
 
-    scrub_ip_address = (org_options.get('sentry:require_scrub_ip_address', False) or
-                        project.get_option('sentry:scrub_ip_address', False))
-    scrub_data = (org_options.get('sentry:require_scrub_data', False) or
-                  project.get_option('sentry:scrub_data', True))
-
-    if scrub_data:
-        # We filter data immediately before it ever gets into the queue
-        sensitive_fields_key = 'sentry:sensitive_fields'
-        sensitive_fields = (
-            org_options.get(sensitive_fields_key, []) +
-            project.get_option(sensitive_fields_key, [])
-        )
-
-        exclude_fields_key = 'sentry:safe_fields'
-        exclude_fields = (
-            org_options.get(exclude_fields_key, []) +
-            project.get_option(exclude_fields_key, [])
-        )
-
-        scrub_defaults = (org_options.get('sentry:require_scrub_defaults', False) or
-                          project.get_option('sentry:scrub_defaults', True))
-
-        SensitiveDataFilter(
-            fields=sensitive_fields,
-            include_defaults=scrub_defaults,
-            exclude_fields=exclude_fields,
-        ).apply(data)
-
-    if scrub_ip_address:
-        # We filter data immediately before it ever gets into the queue
-        helper.ensure_does_not_have_ip(data)
-
-    # mutates data (strips a lot of context if not queued)
-    helper.insert_data_to_database(data, start_time=start_time, attachments=attachments)
-
-    cache.set(cache_key, '', 60 * 5)
+    try:
+        _scrub_and_insert(project, org_options, helper, data, start_time, attachments)
+    except Exception:
+        cache.delete(cache_key)
+        raise
 
     api_logger.debug('New event received (%s)', event_id)
 
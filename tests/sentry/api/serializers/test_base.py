@@ -2,7 +2,11 @@
 
 from __future__ import absolute_import
 
-from sentry.api.serializers import serialize, Serializer
+import threading
+
+from django.test.utils import override_settings
+
+from sentry.api.serializers import run_loaders, serialize, Serializer
 from sentry.testutils import TestCase
 
 
@@ -46,3 +50,28 @@ class BaseSerializerTest(TestCase):
         assert len(rv) == 2
         assert rv[0] is None
         assert isinstance(rv[1], dict)
+
+
+def test_run_loaders():
+    threads = set()
+
+    def load(value):
+        threads.add(threading.current_thread())
+        return value
+
+    loaders = {
+        'foo': lambda: load(1),
+        'bar': lambda: load(2),
+    }
+
+    with override_settings(SENTRY_SERIALIZER_CONCURRENCY=1):
+        assert run_loaders(loaders, name='test') == {'foo': 1, 'bar': 2}
+    assert threads == set([threading.current_thread()])
+
+    threads.clear()
+    with override_settings(SENTRY_SERIALIZER_CONCURRENCY=2):
+        assert run_loaders(loaders, name='test') == {'foo': 1, 'bar': 2}
+        # The worker threads are reused between calls.
+        assert run_loaders(loaders, name='test') == {'foo': 1, 'bar': 2}
+    assert threading.current_thread() not in threads
+    assert len(threads) <= 2
@@ -66,3 +66,36 @@ class BufferTest(TestCase):
         self.buf.process(ReleaseProject, columns, filters)
         release_project_ = ReleaseProject.objects.get(id=release_project.id)
         assert release_project_.new_groups == 1
+
+    def test_process_batch_saves_data(self):
+        group = Group.objects.create(project=Project(id=1))
+        other_group = Group.objects.create(project=Project(id=1))
+        the_date = (timezone.now() + timedelta(days=5)).replace(microsecond=0)
+        self.buf.process_batch([
+            (Group, {'times_seen': 1}, {'id': group.id}, {'last_seen': the_date}),
+            (Group, {'times_seen': 3}, {'id': other_group.id}, {'last_seen': the_date}),
+            (Group, {'times_seen': 1}, {'message': 'foo bar', 'project_id': 1}, None),
+        ])
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 1
+        assert group_.last_seen.replace(microsecond=0) == the_date
+        other_group_ = Group.objects.get(id=other_group.id)
+        assert other_group_.times_seen == other_group.times_seen + 3
+        assert Group.objects.get(message='foo bar').times_seen == 2
+
+    @mock.patch('sentry.buffer.base.buffer_incr_complete')
+    def test_process_batch_sends_signal_per_row(self, buffer_incr_complete):
+        groups = [Group.objects.create(project=Project(id=1)) for _ in range(3)]
+        self.buf.process_batch([
+            (Group, {'times_seen': 1}, {'id': group.id}, None) for group in groups
+        ])
+        assert len(buffer_incr_complete.send_robust.mock_calls) == 3
+        for group in groups:
+            buffer_incr_complete.send_robust.assert_any_call(
+                model=Group,
+                columns={'times_seen': 1},
+                filters={'id': group.id},
+                extra=None,
+                created=False,
+                sender=Group,
+            )
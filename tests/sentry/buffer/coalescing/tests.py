@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+
+import mock
+
+from sentry.buffer.base import Buffer
+from sentry.buffer.coalescing import CoalescingBuffer
+from sentry.models import Group, Project
+from sentry.testutils import TestCase
+
+
+class CoalescingBufferTest(TestCase):
+    def setUp(self):
+        self.buf = CoalescingBuffer(
+            backend=Buffer,
+            flush_interval=60,
+            max_pending=3,
+        )
+
+    def tearDown(self):
+        self.buf.close()
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_merges_increments(self, incr_multi):
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1}, {'message': 'foo'})
+        self.buf.incr(Group, {'times_seen': 2}, {'id': 1}, {'message': 'bar'})
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 2})
+        assert not incr_multi.called
+
+        self.buf.flush()
+        incr_multi.assert_called_once_with([
+            (Group, {'times_seen': 3}, {'id': 1}, {'message': 'bar'}),
+            (Group, {'times_seen': 1}, {'id': 2}, None),
+        ])
+
+        incr_multi.reset_mock()
+        self.buf.flush()
+        assert not incr_multi.called
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_merges_model_filters(self, incr_multi):
+        self.buf.incr(Group, {'times_seen': 1}, {'project': Project(id=1)})
+        self.buf.incr(Group, {'times_seen': 1}, {'project': Project(id=1)})
+        self.buf.flush()
+        assert len(incr_multi.call_args[0][0]) == 1
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_flushes_when_full(self, incr_multi):
+        for i in range(3):
+            self.buf.incr(Group, {'times_seen': 1}, {'id': i})
+        assert len(incr_multi.call_args[0][0]) == 3
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_flushes_after_interval(self, incr_multi):
+        self.buf.flush_interval = 0
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1})
+        incr_multi.assert_called_once_with([
+            (Group, {'times_seen': 1}, {'id': 1}, None),
+        ])
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_flushes_on_task_completion(self, incr_multi):
+        from celery.signals import task_postrun
+
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1})
+        task_postrun.send(sender=None)
+        assert incr_multi.called
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_close(self, incr_multi):
+        from celery.signals import task_postrun
+
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1})
+        self.buf.close()
+        assert incr_multi.call_count == 1
+
+        # Closed buffers are no longer flushed when a task finishes.
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1})
+        task_postrun.send(sender=None)
+        assert incr_multi.call_count == 1
+
+    @mock.patch('sentry.buffer.base.Buffer.incr_multi')
+    def test_keeps_increments_on_failure(self, incr_multi):
+        incr_multi.side_effect = Exception('boom')
+        self.buf.incr(Group, {'times_seen': 1}, {'id': 1}, {'message': 'foo'})
+        self.buf.flush()
+
+        self.buf.incr(Group, {'times_seen': 2}, {'id': 1}, {'message': 'bar'})
+        incr_multi.side_effect = None
+        self.buf.flush()
+        incr_multi.assert_called_with([
+            (Group, {'times_seen': 3}, {'id': 1}, {'message': 'bar'}),
+        ])
@@ -178,3 +178,93 @@ class RedisBufferTest(TestCase):
 
         # Make sure we didn't queue up more
         assert len(process_pending.apply_async.mock_calls) == 2
+
+    @mock.patch('sentry.buffer.base.Buffer.process_batch')
+    @mock.patch('sentry.buffer.base.Buffer.process')
+    def test_process_batch_flush(self, process, process_batch):
+        self.buf.batch_flush = True
+        with self.buf.cluster.map() as client:
+            client.hmset(
+                'foo', {
+                    'e+foo': '["s","bar"]',
+                    'f': '{"pk": ["i","1"]}',
+                    'i+times_seen': '2',
+                    'm': 'sentry.models.Group',
+                }
+            )
+            client.hmset(
+                'bar', {
+                    'f': '{"pk": ["i","2"]}',
+                    'i+times_seen': '3',
+                    'm': 'sentry.models.Group',
+                }
+            )
+            client.zadd('b:p', 1, 'foo')
+            client.zadd('b:p', 2, 'bar')
+        self.buf.process(batch_keys=['foo', 'bar', 'baz'])
+        assert not process.called
+        assert len(process_batch.mock_calls) == 1
+        items = process_batch.call_args[0][0]
+        assert sorted(items) == sorted([
+            (Group, {'times_seen': 2}, {'pk': 1}, {'foo': 'bar'}),
+            (Group, {'times_seen': 3}, {'pk': 2}, {}),
+        ])
+        client = self.buf.cluster.get_routing_client()
+        assert client.zrange('b:p', 0, -1) == []
+        assert not client.exists('foo')
+        assert not client.exists('bar')
+        assert not client.exists('l:foo')
+
+    @mock.patch('sentry.buffer.redis.RedisBuffer._make_key', side_effect=['foo', 'bar'])
+    def test_incr_multi(self, make_key):
+        self.buf.incr_multi([
+            (Group, {'times_seen': 1}, {'pk': 1}, None),
+            (Group, {'times_seen': 2}, {'pk': 2}, {'message': 'baz'}),
+        ])
+        client = self.buf.cluster.get_routing_client()
+        assert client.hget('foo', 'i+times_seen') == '1'
+        assert client.hget('bar', 'i+times_seen') == '2'
+        assert client.hexists('bar', 'e+message')
+        assert sorted(client.zrange('b:p', 0, -1)) == ['bar', 'foo']
+
+    def test_process_batch_flush_saves_data(self):
+        self.buf.batch_flush = True
+        group = Group.objects.create(project=Project(id=1))
+        other_group = Group.objects.create(project=Project(id=1))
+        third_group = Group.objects.create(project=Project(id=1))
+        self.buf.incr_multi([
+            (Group, {'times_seen': 2}, {'pk': group.id}, None),
+            (Group, {'times_seen': 3}, {'pk': other_group.id}, None),
+            # A different column set ends up in a single-row batch, which
+            # goes through the per-row path.
+            (Group, {'times_seen': 1, 'num_comments': 1}, {'pk': third_group.id}, None),
+        ])
+        keys = [
+            self.buf._make_key(Group, {'pk': g.id})
+            for g in (group, other_group, third_group)
+        ]
+        self.buf.process(batch_keys=keys)
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen + 2
+        assert Group.objects.get(id=other_group.id).times_seen == other_group.times_seen + 3
+        third_group_ = Group.objects.get(id=third_group.id)
+        assert third_group_.times_seen == third_group.times_seen + 1
+        assert third_group_.num_comments == third_group.num_comments + 1
+        client = self.buf.cluster.get_routing_client()
+        assert client.zrange('b:p', 0, -1) == []
+        for key in keys:
+            assert not client.exists(key)
+
+    @mock.patch('sentry.buffer.base.Buffer.process', mock.Mock(side_effect=Exception))
+    def test_process_batch_flush_requeues_failed(self):
+        self.buf.batch_flush = True
+        self.buf.incr_multi([
+            (Group, {'times_seen': 2}, {'pk': 1}, None),
+            (Group, {'times_seen': 1, 'num_comments': 1}, {'pk': 2}, None),
+        ])
+        keys = [self.buf._make_key(Group, {'pk': pk}) for pk in (1, 2)]
+        self.buf.process(batch_keys=keys)
+        client = self.buf.cluster.get_routing_client()
+        assert sorted(client.zrange('b:p', 0, -1)) == sorted(keys)
+        assert client.hget(keys[0], 'i+times_seen') == '2'
+        assert client.hget(keys[1], 'i+num_comments') == '1'
+        assert not client.exists('l:%s' % keys[0])
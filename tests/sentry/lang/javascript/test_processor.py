@@ -21,6 +21,7 @@ from sentry.lang.javascript.processor import (
     fetch_release_file,
     UnparseableSourcemap,
     get_max_age,
+    parse_sourcemap,
     CACHE_CONTROL_MAX,
     CACHE_CONTROL_MIN,
 )
@@ -55,6 +56,52 @@ class JavaScriptStacktraceProcessorTest(TestCase):
         r = JavaScriptStacktraceProcessor({}, None, project)
         assert not r.allow_scraping
 
+    @patch('sentry.lang.javascript.processor.fetch_sourcemap')
+    @patch('sentry.lang.javascript.processor.fetch_file')
+    def test_populate_source_cache_concurrently(self, mock_fetch_file, mock_fetch_sourcemap):
+        def fetch_file(url, **kwargs):
+            if url.endswith('broken.js'):
+                raise http.CannotFetch({'type': EventError.JS_MISSING_SOURCE, 'url': url})
+            return http.UrlResult(
+                url, {'sourcemap': 'app.js.map'}, b'console.log(1)', 200, None)
+
+        mock_fetch_file.side_effect = fetch_file
+        mock_fetch_sourcemap.side_effect = UnparseableSourcemap({'url': 'app.js.map'})
+
+        project = self.create_project()
+        r = JavaScriptStacktraceProcessor({}, None, project)
+        r.max_fetches = 3
+        frames = [
+            {'abs_path': 'http://example.com/%s.js' % name, 'lineno': 1}
+            for name in ('a', 'b', 'broken', 'c')
+        ]
+        with self.settings(SENTRY_SCRAPE_JAVASCRIPT_CONCURRENCY=4):
+            r.populate_source_cache(frames)
+
+        assert mock_fetch_file.call_count == 3
+        # the sourcemap is shared, so it is only fetched once
+        mock_fetch_sourcemap.assert_called_once_with(
+            'http://example.com/app.js.map',
+            project=project,
+            release=None,
+            dist=None,
+            allow_scraping=True,
+        )
+
+        errors = {}
+        for frame in frames:
+            url = frame['abs_path']
+            errors[url] = [e['type'] for e in r.cache.get_errors(url)]
+            if url.endswith('broken.js') or errors[url] == [EventError.JS_TOO_MANY_REMOTE_SOURCES]:
+                assert r.cache.get(url) is None
+            else:
+                assert r.cache.get(url) is not None
+                assert errors[url] == [EventError.JS_INVALID_SOURCEMAP]
+
+        assert errors['http://example.com/broken.js'] in (
+            [EventError.JS_MISSING_SOURCE], [EventError.JS_TOO_MANY_REMOTE_SOURCES])
+        assert sorted(errors.values()).count([EventError.JS_TOO_MANY_REMOTE_SOURCES]) == 1
+
 
 class FetchReleaseFileTest(TestCase):
     def test_unicode(self):
@@ -153,6 +200,64 @@ class FetchReleaseFileTest(TestCase):
 
         assert result == new_result
 
+    def test_manifest(self):
+        project = self.project
+        release = Release.objects.create(
+            organization_id=project.organization_id,
+            version='abc',
+        )
+        release.add_project(project)
+
+        assert fetch_release_file('file.min.js', release) is None
+        assert ReleaseFile.get_manifest(release) == {}
+
+        file = File.objects.create(
+            name='file.min.js',
+            type='release.file',
+            headers={'Content-Type': 'application/json; charset=utf-8'},
+        )
+        file.putfile(six.BytesIO(b'foo'))
+
+        # Uploading an artifact invalidates the cached manifest.
+        releasefile = ReleaseFile.objects.create(
+            name='other.min.js',
+            release=release,
+            organization_id=project.organization_id,
+            file=file,
+        )
+        assert ReleaseFile.get_manifest(release) == {releasefile.ident: releasefile.id}
+        assert fetch_release_file('other.min.js', release).body == b'foo'
+
+        releasefile.delete()
+        assert ReleaseFile.get_manifest(release) == {}
+
+    @patch.object(ReleaseFile, 'MANIFEST_MAX_SIZE', 0)
+    def test_manifest_too_large(self):
+        project = self.project
+        release = Release.objects.create(
+            organization_id=project.organization_id,
+            version='abc',
+        )
+        release.add_project(project)
+
+        file = File.objects.create(
+            name='file.min.js',
+            type='release.file',
+            headers={'Content-Type': 'application/json; charset=utf-8'},
+        )
+        file.putfile(six.BytesIO(b'foo'))
+
+        ReleaseFile.objects.create(
+            name='file.min.js',
+            release=release,
+            organization_id=project.organization_id,
+            file=file,
+        )
+
+        assert ReleaseFile.get_manifest(release) is None
+        assert fetch_release_file('file.min.js', release).body == b'foo'
+        assert fetch_release_file('missing.min.js', release) is None
+
     def test_fallbacks(self):
         project = self.project
         release = Release.objects.create(
@@ -511,6 +616,16 @@ class FetchSourcemapTest(TestCase):
         with pytest.raises(UnparseableSourcemap):
             fetch_sourcemap('http://example.com')
 
+    @patch('sentry.lang.javascript.processor.SourceMapView')
+    def test_reuses_parsed_views(self, mock_sourcemap_view):
+        body = b'{"version":3,"sources":[],"names":[],"mappings":"","file":"reused.js"}'
+        assert parse_sourcemap(body) is parse_sourcemap(body)
+        mock_sourcemap_view.from_json_bytes.assert_called_once_with(body)
+
+        with self.settings(SENTRY_SOURCEMAP_VIEW_CACHE_SIZE=0):
+            parse_sourcemap(body)
+        assert mock_sourcemap_view.from_json_bytes.call_count == 2
+
 
 class TrimLineTest(TestCase):
     long_line = 'The public is more familiar with bad design than good design. It is, in effect, conditioned to prefer bad design, because that is what it lives with. The new becomes threatening, the old reassuring.'
@@ -2,8 +2,12 @@
 
 from __future__ import absolute_import
 
+from django.test.utils import override_settings
+from mock import patch
+
 from sentry import tagstore
-from sentry.models import Group, Project, Team, User
+from sentry.db.models.manager import get_local_cache
+from sentry.models import Group, Organization, Project, Team, User
 from sentry.testutils import TestCase
 
 
@@ -180,3 +184,55 @@ class ProjectManagerTest(TestCase):
             scope='project:read',
         )
         assert result == [project2, project]
+
+
+class BaseManagerCacheTest(TestCase):
+    def test_get_many_from_cache(self):
+        org = self.create_organization(slug='foo')
+        other = self.create_organization(slug='bar')
+
+        assert Organization.objects.get_many_from_cache('pk', [other.id, org.id, 0]) == [
+            other,
+            org,
+        ]
+        assert Organization.objects.get_many_from_cache('slug', ['foo', 'baz', 'bar']) == [
+            org,
+            other,
+        ]
+
+        # Every lookup is served by the cache now.
+        with self.assertNumQueries(0):
+            assert Organization.objects.get_many_from_cache('slug', ['bar', 'foo']) == [
+                other,
+                org,
+            ]
+            assert Organization.objects.get_many_from_cache('pk', [org]) == [org]
+
+        org.update(slug='qux')
+        assert Organization.objects.get_many_from_cache('slug', ['foo', 'qux']) == [org]
+
+    def test_get_many_from_cache_uncached_field(self):
+        org = self.create_organization(name='foo')
+        assert Organization.objects.get_many_from_cache('name', ['foo', 'bar']) == [org]
+
+    @override_settings(SENTRY_MODEL_LOCAL_CACHE_SIZE=1024 * 1024)
+    def test_local_cache(self):
+        get_local_cache().clear()
+
+        org = self.create_organization(name='foo')
+        assert Organization.objects.get_from_cache(id=org.id).name == 'foo'
+
+        with patch('sentry.db.models.manager.cache') as cache:
+            assert Organization.objects.get_from_cache(id=org.id).name == 'foo'
+            assert Organization.objects.get_many_from_cache('pk', [org.id]) == [org]
+            assert cache.get_many.call_count == 0
+
+        # Saving invalidates the local copy as well.
+        org.update(name='bar')
+        assert Organization.objects.get_from_cache(id=org.id).name == 'bar'
+
+        # Local copies are not shared between callers.
+        Organization.objects.get_from_cache(id=org.id).name = 'baz'
+        assert Organization.objects.get_from_cache(id=org.id).name == 'bar'
+
+        get_local_cache().clear()
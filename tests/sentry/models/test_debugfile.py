@@ -2,11 +2,14 @@ from __future__ import absolute_import
 
 import os
 import time
+import shutil
+import tempfile
 import zipfile
 from six import BytesIO, text_type
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.urlresolvers import reverse
+from mock import patch
 
 from symbolic import SYMCACHE_LATEST_VERSION
 
@@ -323,6 +326,34 @@ class DebugFilesClearTest(APITestCase):
         # But it's gone now
         assert not os.path.isfile(difs[PROGUARD_UUID])
 
+    def test_cache_size_limit(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        now = int(time.time())
+        paths = []
+        for index, folder in enumerate(['1', '2', '1', '2']):
+            path = os.path.join(cache_path, folder, 'file%d' % index)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100)
+            os.utime(path, (now - 400 + index * 100, now - 400 + index * 100))
+            paths.append(path)
+
+        # Downloads in progress are never evicted
+        prefetch_path = os.path.join(cache_path, '1', '._prefetch-abc')
+        with open(prefetch_path, 'wb') as f:
+            f.write(b'x' * 100)
+        os.utime(prefetch_path, (now - 1000, now - 1000))
+
+        with self.options({'dsym.cache-path': cache_path, 'dsym.cache-max-size': 400}):
+            ProjectDebugFile.difcache.clear_old_entries()
+
+        # The two least recently used files are removed across projects
+        assert [os.path.isfile(p) for p in paths] == [False, False, True, True]
+        assert os.path.isfile(prefetch_path)
+
 
 class SymCacheTest(TestCase):
     def test_get_symcache(self):
@@ -433,6 +464,47 @@ class SymCacheTest(TestCase):
         assert symcaches[debug_id].is_latest_file_format
         assert not ProjectSymCacheFile.objects.filter(id=old_cache.id, version=1).exists()
 
+    @patch.object(debugfile, '_dif_lookup_memo', None)
+    @patch.object(debugfile, '_difcache_pool', None)
+    def test_reuse_symcache(self):
+        debug_id = '67e9247c-814e-392b-a027-dbde6748fcbf'
+        dif = self.create_dif_from_path(
+            path=os.path.join(os.path.dirname(__file__), 'fixtures', 'crash.dsym'),
+            debug_id=debug_id,
+            features=['debug'],
+        )
+
+        referenced_ids = []
+
+        def dif_referenced(dif):
+            referenced_ids.append(dif.id)
+
+        with self.settings(SENTRY_DIF_CACHE_POOL_SIZE=1024 * 1024 * 1024,
+                           SENTRY_DIF_LOOKUP_TTL=60):
+            # Converts the debug file and uses the resulting symcache.
+            ProjectDebugFile.difcache.get_symcaches(self.project, [debug_id])
+
+            # Opens the symcache from its file and keeps it open.
+            symcaches = ProjectDebugFile.difcache.get_symcaches(self.project, [debug_id])
+            assert symcaches[debug_id].id == debug_id
+
+            with self.assertNumQueries(0):
+                reused = ProjectDebugFile.difcache.get_symcaches(
+                    self.project, [debug_id], on_dif_referenced=dif_referenced)
+            assert reused[debug_id] is symcaches[debug_id]
+            assert referenced_ids == [dif.id]
+
+            # Reused caches still mark their file as used.
+            base = ProjectDebugFile.difcache.get_project_path(self.project)
+            path, = [
+                os.path.join(base, name) for name in os.listdir(base)
+                if name.endswith('.symcache')
+            ]
+            os.utime(path, (0, 0))
+            with patch.object(debugfile, 'DIF_CACHE_TOUCH_INTERVAL', -1):
+                ProjectDebugFile.difcache.get_symcaches(self.project, [debug_id])
+            assert os.path.getmtime(path) > 0
+
     def test_get_symcache_on_referenced(self):
         debug_id = '67e9247c-814e-392b-a027-dbde6748fcbf'
         dif = self.create_dif_from_path(
@@ -22,3 +22,28 @@ class GroupTest(TestCase):
         assert GroupHash.fetch_last_processed_event_id(
             [grouphash.id, -1],
         ) == ['event', None]
+
+    def test_get_or_create_bulk(self):
+        group = self.group
+        project = group.project
+
+        GroupHash.objects.create(project=project, group=group, hash='a' * 32)
+
+        hashes = GroupHash.objects.get_or_create_bulk(project, ['a' * 32, 'b' * 32])
+        assert [h.hash for h in hashes] == ['a' * 32, 'b' * 32]
+        assert [h.group_id for h in hashes] == [group.id, None]
+
+        # Resolved hashes are cached, unresolved ones are not.
+        with self.assertNumQueries(1):
+            cached = GroupHash.objects.get_or_create_bulk(project, ['a' * 32, 'b' * 32])
+        assert [h.id for h in cached] == [h.id for h in hashes]
+        assert [h.group_id for h in cached] == [group.id, None]
+
+        with self.assertNumQueries(0):
+            GroupHash.objects.get_or_create_bulk(project, ['a' * 32])
+
+        other = self.create_group(project=project)
+        GroupHash.objects.filter(hash='a' * 32).update(group=other)
+        GroupHash.objects.clear_project_cache(project.id)
+
+        assert GroupHash.objects.get_or_create_bulk(project, ['a' * 32])[0].group_id == other.id
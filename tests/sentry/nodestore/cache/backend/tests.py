@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import mock
+
+from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.cache.backend import CachedNodeStorage
+from sentry.testutils import TestCase
+
+
+class InMemoryBackend(NodeStorage):
+    def __init__(self):
+        self._data = {}
+
+    def set(self, id, data):
+        self._data[id] = data
+
+    def get(self, id):
+        return self._data.get(id)
+
+    def delete(self, id):
+        self._data.pop(id, None)
+
+
+class CachedNodeStorageTest(TestCase):
+    def setUp(self):
+        self.ns = CachedNodeStorage(InMemoryBackend, max_size=1024)
+        self.backend = self.ns.backend
+
+    def test_get_reads_through(self):
+        self.backend.set('a', {'foo': 'bar'})
+        with mock.patch.object(self.backend, 'get', wraps=self.backend.get) as get:
+            assert self.ns.get('a') == {'foo': 'bar'}
+            assert self.ns.get('a') == {'foo': 'bar'}
+            assert get.call_count == 1
+
+    def test_get_returns_copies(self):
+        self.backend.set('a', {'foo': 'bar'})
+        self.ns.get('a')['foo'] = 'baz'
+        assert self.ns.get('a') == {'foo': 'bar'}
+
+    def test_get_multi_partially_cached(self):
+        self.backend.set('a', {'foo': 'bar'})
+        self.backend.set('b', {'foo': 'baz'})
+        self.ns.get('a')
+        with mock.patch.object(self.backend, 'get_multi', wraps=self.backend.get_multi) as get_multi:
+            assert self.ns.get_multi(['a', 'b', 'c']) == {
+                'a': {'foo': 'bar'},
+                'b': {'foo': 'baz'},
+                'c': None,
+            }
+            get_multi.assert_called_once_with(['b', 'c'])
+
+    def test_set_and_delete_invalidate(self):
+        self.ns.set('a', {'foo': 'bar'})
+        assert self.ns.get('a') == {'foo': 'bar'}
+        self.ns.set('a', {'foo': 'baz'})
+        assert self.ns.get('a') == {'foo': 'baz'}
+        self.ns.delete('a')
+        assert self.ns.get('a') is None
+
+    def test_evicts_by_size(self):
+        self.ns.set('a', {'foo': 'x' * 600})
+        self.ns.set('b', {'foo': 'y' * 600})
+        self.ns.get('a')
+        self.ns.get('b')
+        assert 'a' not in self.ns.cache
+        assert 'b' in self.ns.cache
+        assert self.ns.cache.size <= 1024
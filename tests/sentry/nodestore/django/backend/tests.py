@@ -113,3 +113,36 @@ class DjangoNodeStorageTest(TestCase):
 
         assert Node.objects.filter(id=node.id).exists()
         assert not Node.objects.filter(id=node2.id).exists()
+
+    def test_set_multi_updates_existing(self):
+        Node.objects.create(id='d2502ebbd7df41ceba8d3275595cac33', data={
+            'foo': 'bar',
+        })
+        self.ns.set_multi(
+            {
+                'd2502ebbd7df41ceba8d3275595cac33': {
+                    'foo': 'baz',
+                },
+                '5394aa025b8e401ca6bc3ddee3130edc': {
+                    'foo': 'qux',
+                },
+            }
+        )
+        assert Node.objects.get(id='d2502ebbd7df41ceba8d3275595cac33').data == {
+            'foo': 'baz',
+        }
+        assert Node.objects.get(id='5394aa025b8e401ca6bc3ddee3130edc').data == {
+            'foo': 'qux',
+        }
+
+    def test_get_multi_chunked(self):
+        self.ns.batch_size = 2
+        ids = ['d2502ebbd7df41ceba8d3275595cac3%d' % i for i in range(5)]
+        for id in ids:
+            Node.objects.create(id=id, data={'id': id})
+
+        result = self.ns.get_multi(ids)
+        assert result == {id: {'id': id} for id in ids}
+
+        self.ns.delete_multi(ids)
+        assert not Node.objects.filter(id__in=ids).exists()
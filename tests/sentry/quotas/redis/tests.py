@@ -10,6 +10,7 @@ from exam import fixture, patcher
 
 from sentry.quotas.redis import (
     is_rate_limited,
+    lease_quota,
     BasicRedisQuota,
     RedisQuota,
 )
@@ -68,6 +69,35 @@ def test_is_rate_limited_script():
     ))) == [False, ]
 
 
+def test_lease_quota_script():
+    now = int(time.time())
+
+    cluster = clusters.get('default')
+    client = cluster.get_local_client(six.next(iter(cluster.hosts)))
+
+    # The request is reduced to what is left in the most exhausted quota.
+    assert lease_quota(
+        client, ('lfoo', 'r:lfoo', 'lbar', 'r:lbar'), (5, 10, now + 60, 3, now + 120)
+    ) == [3, 10, 3]
+
+    assert client.get('lfoo') == '3'
+    assert 59 <= client.ttl('lfoo') <= 60
+    assert client.get('lbar') == '3'
+    assert 119 <= client.ttl('lbar') <= 120
+
+    # Nothing is reserved once any quota is exhausted.
+    assert lease_quota(
+        client, ('lfoo', 'r:lfoo', 'lbar', 'r:lbar'), (5, 10, now + 60, 3, now + 120)
+    ) == [0, 7, 0]
+    assert client.get('lfoo') == '3'
+
+    # Refunded items are available again.
+    client.set('r:lbar', 2)
+    assert lease_quota(
+        client, ('lfoo', 'r:lfoo', 'lbar', 'r:lbar'), (5, 10, now + 60, 3, now + 120)
+    ) == [2, 7, 2]
+
+
 class RedisQuotaTest(TestCase):
     quota = fixture(RedisQuota)
 
@@ -251,3 +281,89 @@ class RedisQuotaTest(TestCase):
             timestamp=timestamp,
             # the - 1 is because we refunded once
         ) == [n - 1 for _ in quotas] + [None, 0]
+
+    def test_leased(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (1000, 60)
+        self.get_organization_quota.return_value = (1000, 60)
+        self.quota.lease_size = 100
+
+        quotas = self.quota.get_quotas(self.project)
+
+        def get_usage(timestamp):
+            return self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp)
+
+        # The first lease only reserves a single item.
+        assert not self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+        assert get_usage(timestamp) == [1, 1]
+
+        # Leases double while they are used up right away, but never exceed
+        # a percent of the limit.
+        for n in (2, 4, 8, 10, 10):
+            for _ in xrange(n):
+                assert not self.quota.is_rate_limited(
+                    self.project, timestamp=timestamp).is_limited
+        assert get_usage(timestamp) == [35, 35]
+
+        # The next item needs a new lease.
+        assert not self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+        assert get_usage(timestamp) == [45, 45]
+
+        # Unspent items are refunded once the window rolls over.
+        assert not self.quota.is_rate_limited(self.project, timestamp=timestamp + 60).is_limited
+        assert get_usage(timestamp) == [36, 36]
+        assert get_usage(timestamp + 60) == [1, 1]
+
+    def test_leased_is_exact_for_small_limits(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (5, 60)
+        self.get_organization_quota.return_value = (100, 60)
+        self.quota.lease_size = 100
+
+        for _ in xrange(5):
+            assert not self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+
+        result = self.quota.is_rate_limited(self.project, timestamp=timestamp)
+        assert result.is_limited
+        assert result.reason_code == 'project_quota'
+
+        quotas = self.quota.get_quotas(self.project)
+        assert self.quota.get_usage(
+            self.project.organization_id, quotas, timestamp=timestamp) == [5, 5]
+
+    def test_leased_releases_evicted_leases(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (1000, 60)
+        self.quota.lease_size = 100
+        self.quota.lease_max_entries = 1
+
+        other_project = self.create_project(organization=self.project.organization)
+
+        def get_usage(project, timestamp):
+            return self.quota.get_usage(
+                project.organization_id,
+                self.quota.get_quotas_with_limits(project),
+                timestamp=timestamp,
+            )
+
+        # The second lease reserves two items, one of which is left over.
+        for _ in xrange(2):
+            assert not self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+        assert get_usage(self.project, timestamp) == [3]
+
+        # Only one lease is kept, so the least recently used one is released.
+        assert not self.quota.is_rate_limited(other_project, timestamp=timestamp).is_limited
+        assert get_usage(self.project, timestamp) == [2]
+        assert len(self.quota._leases) == 1
+
+        # Leases of windows that have rolled over are released as well.
+        self.quota.lease_max_entries = 10
+        for _ in xrange(2):
+            assert not self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+        assert get_usage(self.project, timestamp) == [5]
+        assert not self.quota.is_rate_limited(other_project, timestamp=timestamp + 60).is_limited
+        assert get_usage(self.project, timestamp) == [4]
+        assert len(self.quota._leases) == 1
@@ -2,6 +2,11 @@
 
 from __future__ import absolute_import
 
+import pytest
+
+from mock import patch
+
+from sentry.exceptions import InvalidConfiguration
 from sentry.ratelimits.redis import RedisRateLimiter
 from sentry.testutils import TestCase
 
@@ -17,3 +22,82 @@ class RedisRateLimiterTest(TestCase):
     def test_simple_key(self):
         assert not self.backend.is_limited('foo', 1)
         assert self.backend.is_limited('foo', 1)
+
+    def test_multi(self):
+        assert self.backend.is_limited_multi([
+            ('foo', 1, None, None),
+            ('bar', 1, self.project, None),
+        ]) == [False, False]
+        assert self.backend.is_limited_multi([
+            ('foo', 1, None, None),
+            ('baz', 1, None, None),
+        ]) == [True, False]
+
+
+class SlidingWindowRateLimiterTest(TestCase):
+    def setUp(self):
+        self.backend = RedisRateLimiter(algorithm='sliding_window')
+
+    @patch('sentry.ratelimits.redis.time')
+    def test_limits_trailing_window(self, time):
+        time.return_value = 600
+        assert not self.backend.is_limited('foo', 2, window=10)
+        time.return_value = 609
+        assert not self.backend.is_limited('foo', 2, window=10)
+        assert self.backend.is_limited('foo', 2, window=10)
+
+        # A fixed window would accept two more here.
+        time.return_value = 610
+        assert self.backend.is_limited('foo', 2, window=10)
+
+        # Half of the previous window still overlaps the trailing window.
+        time.return_value = 615
+        assert not self.backend.is_limited('foo', 2, window=10)
+        assert self.backend.is_limited('foo', 2, window=10)
+
+        time.return_value = 630
+        assert not self.backend.is_limited('foo', 2, window=10)
+
+    @patch('sentry.ratelimits.redis.time')
+    def test_multi(self, time):
+        time.return_value = 600
+        assert self.backend.is_limited_multi([
+            ('foo', 1, None, 10),
+            ('foo', 1, self.project, 10),
+        ]) == [False, False]
+        assert self.backend.is_limited_multi([
+            ('foo', 1, None, 10),
+            ('bar', 1, None, 10),
+        ]) == [True, False]
+
+
+class TokenBucketRateLimiterTest(TestCase):
+    def setUp(self):
+        self.backend = RedisRateLimiter(algorithm='token_bucket', burst=2)
+
+    @patch('sentry.ratelimits.redis.time')
+    def test_burst(self, time):
+        time.return_value = 600
+        for _ in range(4):
+            assert not self.backend.is_limited('foo', 2, window=10)
+        assert self.backend.is_limited('foo', 2, window=10)
+
+        # Tokens are refilled at the rate of two per ten seconds.
+        time.return_value = 605
+        assert not self.backend.is_limited('foo', 2, window=10)
+        assert self.backend.is_limited('foo', 2, window=10)
+
+        time.return_value = 630
+        for _ in range(4):
+            assert not self.backend.is_limited('foo', 2, window=10)
+        assert self.backend.is_limited('foo', 2, window=10)
+
+    def test_zero_limit(self):
+        assert self.backend.is_limited_multi([
+            ('foo', 0, None, 10),
+            ('bar', 1, None, 10),
+        ]) == [True, False]
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(InvalidConfiguration):
+            RedisRateLimiter(algorithm='foo')
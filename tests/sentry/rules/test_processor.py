@@ -4,6 +4,7 @@ from __future__ import absolute_import
 
 from datetime import timedelta
 from django.utils import timezone
+from mock import patch
 
 from sentry.models import GroupRuleStatus, Rule
 from sentry.plugins import plugins
@@ -59,6 +60,66 @@ class RuleProcessorTest(TestCase):
         results = list(rp.apply())
         assert len(results) == 1
 
+    @patch('sentry.tsdb.get_sums', return_value={})
+    def test_shares_condition_results(self, get_sums):
+        event = self.create_event()
+        get_sums.return_value = {event.group_id: 10}
+
+        Rule.objects.filter(project=event.project).delete()
+        rules = [
+            Rule.objects.create(
+                project=event.project,
+                data={
+                    'conditions': [{
+                        'id': 'sentry.rules.conditions.event_frequency.EventFrequencyCondition',
+                        'interval': '1h',
+                        'value': value,
+                    }],
+                    'actions': [{
+                        'id': 'sentry.rules.actions.notify_event.NotifyEventAction',
+                    }],
+                }
+            ) for value in (5, 5, 20)
+        ]
+
+        rp = RuleProcessor(
+            event,
+            is_new=False,
+            is_regression=False,
+            is_new_group_environment=False,
+            has_reappeared=False)
+        results = list(rp.apply())
+        assert len(results) == 1
+        _, futures = results[0]
+        assert set(f.rule for f in futures) == set(rules[:2])
+
+        # the same frequency question is only asked once
+        assert get_sums.call_count == 1
+        assert GroupRuleStatus.objects.filter(group=event.group).count() == 3
+
+    def test_get_rule_statuses(self):
+        event = self.create_event()
+        Rule.objects.filter(project=event.project).delete()
+        rules = [
+            Rule.objects.create(project=event.project, data={}) for _ in range(3)
+        ]
+        existing = GroupRuleStatus.objects.create(
+            rule=rules[0],
+            group=event.group,
+            project=event.project,
+        )
+
+        rp = RuleProcessor(
+            event,
+            is_new=False,
+            is_regression=False,
+            is_new_group_environment=False,
+            has_reappeared=False)
+        statuses = rp.get_rule_statuses(rules)
+        assert set(statuses) == set(r.id for r in rules)
+        assert statuses[rules[0].id] == existing
+        assert GroupRuleStatus.objects.filter(group=event.group).count() == 3
+
 
 class EventCompatibilityProxyTest(TestCase):
     def test_simple(self):
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import time
 
+import mock
 import msgpack
 from exam import fixture
 
@@ -49,3 +50,53 @@ class RedisScriptMinHashIndexBackendTestCase(MinHashIndexBackendTestMixin, TestC
 
         result = self.index.export('example', [('index', 2)], timestamp=timestamp)
         assert len(result) == 1
+
+    def test_record_multi(self):
+        timestamp = int(time.time())
+        results = self.index.record_multi([
+            ('example', '1', [('index', 'hello world')], timestamp),
+            ('example', '2', [], timestamp),
+            ('other', '3', [('index', 'hello world')], timestamp),
+        ])
+        assert len(results) == 3
+        assert results[1] is None
+
+        assert self.index.classify_multi([
+            ('example', [('index', 0, 'hello world')]),
+            ('other', [('index', 0, 'hello world')]),
+            ('missing', [('index', 0, 'hello world')]),
+        ], timestamp=timestamp) == [
+            self.index.classify('example', [('index', 0, 'hello world')], timestamp=timestamp),
+            self.index.classify('other', [('index', 0, 'hello world')], timestamp=timestamp),
+            [],
+        ] == [
+            [('1', [1.0])],
+            [('3', [1.0])],
+            [],
+        ]
+
+    def test_record_multi_without_loaded_script(self):
+        self.index.cluster.script_flush()
+        self.index.record_multi([
+            ('example', '1', [('index', 'hello world')], None),
+        ])
+        assert self.index.classify('example', [('index', 0, 'hello world')]) == [
+            ('1', [1.0]),
+        ]
+
+    def test_record_multi_uses_pipeline(self):
+        # Make sure the script is loaded on the server.
+        self.index.record('example', '1', [('index', 'hello world')])
+
+        with mock.patch.object(
+            self.index, '_RedisScriptMinHashIndexBackend__index',
+        ) as index:
+            results = self.index.record_multi([
+                ('example', '2', [('index', 'hello world')], None),
+                ('other', '3', [('index', 'hello world')], None),
+            ])
+        assert not index.called
+        assert len(results) == 2
+        assert self.index.classify('other', [('index', 0, 'hello world')]) == [
+            ('3', [1.0]),
+        ]
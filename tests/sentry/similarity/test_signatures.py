@@ -1,9 +1,16 @@
 from __future__ import absolute_import
 
+import mock
+import os
+import random
+import pytest
+
 from collections import Counter
 from unittest import TestCase
 
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import (
+    MinHashSignatureBuilder, VectorizedMinHashSignatureBuilder, np
+)
 
 
 class MinHashSignatureBuilderTestCase(TestCase):
@@ -38,3 +45,32 @@ class MinHashSignatureBuilderTestCase(TestCase):
             estimation,
             delta=0.1,  # totally made up constant, seems reasonable
         )
+
+
+@pytest.mark.skipif(np is None, reason='requires numpy')
+class VectorizedMinHashSignatureBuilderTestCase(TestCase):
+    def test_signatures_are_identical(self):
+        random.seed(0)
+        for columns, rows in ((16, 0xFFFF), (32, 0xFFFFFFF)):
+            expected = MinHashSignatureBuilder(columns, rows)
+            get_signature = VectorizedMinHashSignatureBuilder(columns, rows)
+            get_signature.min_hashes_per_block = 0
+            for _ in range(100):
+                features = set(
+                    os.urandom(random.randint(0, 40))
+                    for _ in range(random.randint(1, 50))
+                )
+                assert get_signature(features) == expected(features)
+
+            assert get_signature('hello world') == expected('hello world')
+            assert get_signature([u'f\xf4o', u'bar']) == expected([b'f\xc3\xb4o', b'bar'])
+
+    def test_empty_features(self):
+        with pytest.raises(ValueError):
+            VectorizedMinHashSignatureBuilder(16, 0xFFFF)([])
+
+    def test_falls_back_for_small_feature_sets(self):
+        get_signature = VectorizedMinHashSignatureBuilder(16, 0xFFFF)
+        with mock.patch.object(MinHashSignatureBuilder, '__call__') as call:
+            get_signature([b'x' * 400])
+            assert call.called
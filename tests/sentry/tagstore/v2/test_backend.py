@@ -430,6 +430,38 @@ class TagStorage(TestCase):
 
         assert models.GroupTagValue.objects.count() == 0
 
+    def test_incr_tag_values_times_seen_multi(self):
+        now = timezone.now()
+
+        with self.tasks():
+            for _ in range(2):
+                self.ts.incr_tag_values_times_seen_multi(
+                    self.proj1.id,
+                    self.proj1group1.id,
+                    self.proj1env1.id,
+                    [
+                        (self.key1, self.value1, None),
+                        (self.key1, 'value2', None),
+                    ],
+                    now,
+                )
+
+        for environment_id in [self.proj1env1.id, None]:
+            for value in [self.value1, 'value2']:
+                assert self.ts.get_tag_value(
+                    self.proj1.id,
+                    environment_id,
+                    self.key1,
+                    value,
+                ).times_seen == 2
+                assert self.ts.get_group_tag_value(
+                    self.proj1.id,
+                    self.proj1group1.id,
+                    environment_id,
+                    self.key1,
+                    value,
+                ).times_seen == 2
+
     def test_get_group_event_filter(self):
         tags = {
             'abc': 'xyz',
@@ -1,7 +1,27 @@
 from __future__ import absolute_import
 
-from sentry.stacktraces import find_stacktraces_in_data, normalize_in_app
+from mock import patch
+
+from sentry.stacktraces import (
+    StacktraceProcessor, find_stacktraces_in_data, normalize_in_app, process_stacktraces
+)
 from sentry.testutils import TestCase
+from sentry.utils.cache import cache
+
+
+class FunctionNameProcessor(StacktraceProcessor):
+    def handles_frame(self, frame, stacktrace_info):
+        return True
+
+    def preprocess_frame(self, processable_frame):
+        processable_frame.set_cache_key_from_values(['fn', processable_frame['function']])
+
+    def process_frame(self, processable_frame, processing_task):
+        function = processable_frame.cache_value
+        if function is None:
+            function = processable_frame['function'].upper()
+            processable_frame.set_cache_value(function)
+        return [dict(processable_frame.frame, function=function)], None, None
 
 
 class FindStacktracesTest(TestCase):
@@ -209,3 +229,38 @@ class NormalizeInApptest(TestCase):
         normalize_in_app(data)
         assert data['stacktrace']['frames'][1]['in_app'] is False
         assert data['stacktrace']['frames'][2]['in_app'] is False
+
+
+class ProcessStacktracesTest(TestCase):
+    def process(self):
+        data = {
+            'project': self.project.id,
+            'stacktrace': {
+                'frames': [
+                    {'function': 'foo'},
+                    {'function': 'bar'},
+                    {'function': 'foo'},
+                ],
+            },
+        }
+        return process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [
+                FunctionNameProcessor(data, infos, project=self.project),
+            ],
+        )
+
+    def test_frame_cache(self):
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, \
+                patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            data = self.process()
+            assert [f['function'] for f in data['stacktrace']['frames']] == ['FOO', 'BAR', 'FOO']
+            assert get_many.call_count == 1
+            assert set_many.call_count == 1
+            assert sorted(set_many.call_args[0][0].values()) == ['BAR', 'FOO']
+
+            # All frames are served from the cache, nothing is written.
+            data = self.process()
+            assert [f['function'] for f in data['stacktrace']['frames']] == ['FOO', 'BAR', 'FOO']
+            assert get_many.call_count == 2
+            assert set_many.call_count == 1
@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+
+import pytz
+
+from datetime import datetime, timedelta
+
+from mock import patch
+
+from sentry.testutils import TestCase
+from sentry.tsdb.base import TSDBModel, ONE_MINUTE, ONE_HOUR
+from sentry.tsdb.coalescing import CoalescingTSDB
+from sentry.tsdb.redis import RedisTSDB
+from sentry.utils.dates import to_timestamp
+
+
+class CoalescingTSDBTest(TestCase):
+    def setUp(self):
+        self.db = CoalescingTSDB(
+            backend=RedisTSDB,
+            backend_options={
+                'rollups': (
+                    (10, 30),
+                    (ONE_MINUTE, 120),
+                    (ONE_HOUR, 24),
+                ),
+                'vnodes': 64,
+                'enable_frequency_sketches': True,
+                'hosts': {
+                    i - 6: {
+                        'db': i,
+                    } for i in range(6, 9)
+                },
+            },
+            flush_interval=60,
+        )
+
+    def tearDown(self):
+        self.db.close()
+        with self.db.backend.cluster.all() as client:
+            client.flushdb()
+
+    def test_incr(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=1)
+        epoch = int(to_timestamp(now))
+        epoch -= epoch % 10
+
+        with patch.object(self.db.backend, 'incr_batch',
+                          wraps=self.db.backend.incr_batch) as incr_batch:
+            self.db.incr(TSDBModel.project, 1, now)
+            self.db.incr(TSDBModel.project, 1, now, count=2)
+            self.db.incr(TSDBModel.project, 1, now, environment_id=1)
+            self.db.incr_multi([
+                (TSDBModel.project, 1),
+                (TSDBModel.project, 2),
+            ], now + timedelta(seconds=1))
+            assert incr_batch.call_count == 0
+
+            # Reads see the pending increments.
+            assert self.db.get_range(
+                TSDBModel.project, [1, 2], now, now, rollup=10) == {
+                1: [(epoch, 5)],
+                2: [(epoch, 1)],
+            }
+            assert incr_batch.call_count == 1
+            assert len(incr_batch.call_args[0][0]) == 3
+
+        assert self.db.get_range(
+            TSDBModel.project, [1], now, now, rollup=10, environment_ids=[1]) == {
+            1: [(epoch, 1)],
+        }
+
+    def test_max_pending(self):
+        self.db.max_pending = 2
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+
+        self.db.incr(TSDBModel.project, 1, now)
+        self.db.incr(TSDBModel.project, 1, now)
+        assert len(self.db._pending) == 1
+
+        self.db.incr(TSDBModel.project, 2, now)
+        assert len(self.db._pending) == 0
+
+        assert self.db.backend.get_sums(TSDBModel.project, [1, 2], now, now) == {
+            1: 2,
+            2: 1,
+        }
+
+    def test_keeps_increments_on_failure(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+
+        self.db.incr(TSDBModel.project, 1, now)
+        with patch.object(self.db.backend, 'incr_batch', side_effect=Exception('boom')):
+            self.db.flush_pending()
+        assert len(self.db._pending) == 1
+
+        self.db.incr(TSDBModel.project, 1, now)
+        self.db.flush_pending()
+        assert self.db.backend.get_sums(TSDBModel.project, [1], now, now) == {1: 2}
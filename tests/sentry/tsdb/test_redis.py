@@ -142,6 +142,23 @@ class RedisTSDBTest(TestCase):
             2: 4,
         }
 
+        results = self.db.get_range(
+            TSDBModel.project, [1, 2], dts[0], dts[-1], environment_ids=[1, 2])
+        assert results == {
+            1: [
+                (timestamp(dts[0]), 0),
+                (timestamp(dts[1]), 1),
+                (timestamp(dts[2]), 0),
+                (timestamp(dts[3]), 4),
+            ],
+            2: [
+                (timestamp(dts[0]), 0),
+                (timestamp(dts[1]), 0),
+                (timestamp(dts[2]), 0),
+                (timestamp(dts[3]), 4),
+            ],
+        }
+
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {
             1: 4,
@@ -207,6 +224,26 @@ class RedisTSDBTest(TestCase):
             2: 0,
         }
 
+    def test_incr_batch(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+
+        self.db.incr_batch([
+            (TSDBModel.project, 1, now, 2, None),
+            (TSDBModel.project, 2, None, 1, 1),
+        ])
+
+        # The increment without a timestamp may fall into the next bucket.
+        end = now + timedelta(seconds=10)
+        assert self.db.get_sums(TSDBModel.project, [1, 2], now, end) == {
+            1: 2,
+            2: 1,
+        }
+        assert self.db.get_sums(
+            TSDBModel.project, [1, 2], now, end, environment_id=1) == {
+            1: 0,
+            2: 1,
+        }
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -2,7 +2,8 @@
 
 from __future__ import absolute_import
 
-from sentry.utils.db import get_db_engine
+from sentry.models import Project
+from sentry.utils.db import attach_foreignkey_from_cache, get_db_engine
 from sentry.testutils import TestCase
 
 
@@ -14,3 +15,18 @@ class GetDbEngineTest(TestCase):
     def test_no_path(self):
         with self.settings(DATABASES={'default': {'ENGINE': 'mysql'}}):
             self.assertEquals(get_db_engine(), 'mysql')
+
+
+class AttachForeignkeyFromCacheTest(TestCase):
+    def test_attaches_cached_instances(self):
+        org = self.create_organization()
+        other_org = self.create_organization()
+        project = self.create_project(organization=org)
+        other_project = self.create_project(organization=other_org)
+        # Warm the cache.
+        attach_foreignkey_from_cache([Project.objects.get(id=project.id)], Project.organization)
+
+        projects = list(Project.objects.filter(id__in=[project.id, other_project.id]))
+        attach_foreignkey_from_cache(projects, Project.organization)
+        with self.assertNumQueries(0):
+            assert set(p.organization for p in projects) == set([org, other_org])
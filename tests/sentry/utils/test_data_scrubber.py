@@ -504,3 +504,41 @@ class SensitiveDataFilterTest(TestCase):
         proc.apply(data)
 
         assert data['breadcrumbs']['values'][0]['message'] == FILTER_MASK
+
+    def test_compiled_fields_are_shared(self):
+        proc = SensitiveDataFilter(fields=['Foo', 'bar'])
+        other = SensitiveDataFilter(fields=['bar', 'foo'])
+        assert proc.fields_re is other.fields_re
+
+        assert SensitiveDataFilter(include_defaults=False).fields_re is None
+
+    def test_untouched_containers_are_not_copied(self):
+        untouched = {'foo': ['bar', {'baz': 1}]}
+        data = {
+            'extra': {
+                'untouched': untouched,
+                'password': 'hello',
+            },
+        }
+
+        proc = SensitiveDataFilter()
+        proc.apply(data)
+
+        assert data['extra']['password'] == FILTER_MASK
+        assert data['extra']['untouched'] is untouched
+
+    def test_copies_keep_container_types(self):
+        data = {
+            'extra': {
+                'pairs': (('password', 'hello'), ['foo', 'bar']),
+                'list': [['password', 'hello']],
+                'values': ('hello', '4571234567890111'),
+            },
+        }
+
+        proc = SensitiveDataFilter()
+        proc.apply(data)
+
+        assert data['extra']['pairs'] == (('password', FILTER_MASK), ['foo', 'bar'])
+        assert data['extra']['list'] == [['password', FILTER_MASK]]
+        assert data['extra']['values'] == ('hello', FILTER_MASK)
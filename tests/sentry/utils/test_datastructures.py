@@ -2,7 +2,7 @@ from __future__ import absolute_import
 
 import pytest
 
-from sentry.utils.datastructures import BidirectionalMapping
+from sentry.utils.datastructures import BidirectionalMapping, SizedLRUCache
 
 
 def test_bidirectional_mapping():
@@ -38,3 +38,36 @@ def test_bidirectional_mapping():
     del value['c']
 
     assert len(value) == len(value.inverse()) == 2
+
+
+def test_sized_lru_cache():
+    cache = SizedLRUCache(10)
+
+    cache.set('a', 1, 4)
+    cache.set('b', 2, 4)
+    assert cache.get('a') == 1
+    assert cache.size == 8
+
+    # 'b' is the least recently used entry and has to go
+    cache.set('c', 3, 4)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.size == 8
+
+    cache.set('a', 4, 2)
+    assert cache.get('a') == 4
+    assert cache.size == 6
+
+    # values larger than the whole cache are never stored
+    cache.set('d', 5, 11)
+    assert 'd' not in cache
+    assert cache.size == 6
+
+    cache.delete('a')
+    assert 'a' not in cache
+    assert cache.size == 4
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
@@ -56,6 +56,17 @@ class TrimTest(TestCase):
         a = {'a': {'b': {'c': []}}}
         assert trm(a) == {'a': {'b': {'c': '[]'}}}
 
+    def test_nested_size(self):
+        # Nested containers count with the length of their representation.
+        assert trim([['a' * 10], 'b' * 600], max_size=30) == [
+            ['a' * 10],
+            'b' * 11 + '...',
+        ]
+        assert trim([('a' * 10, ), 'b' * 600], max_size=30) == [
+            ('a' * 10, ),
+            'b' * 10 + '...',
+        ]
+
 
 class TrimDictTest(TestCase):
     def test_large_dict(self):
@@ -1,11 +1,59 @@
 from __future__ import absolute_import
 
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import pytz
+import threading
+import time
+
+from mock import patch
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
 
 from sentry.models import GroupRelease, Release
+from sentry.net.http import connection_from_url
 from sentry.testutils import TestCase
-from sentry.utils.snuba import get_snuba_translators, zerofill
+from sentry.utils import json
+from sentry.utils.snuba import (
+    _cached_snuba_query, get_snuba_translators, options_override, raw_query,
+    snap_time_window, zerofill,
+)
+
+
+@contextmanager
+def snuba_server(respond=None):
+    """
+    Runs a stand-in for the snuba query API on a local port, and sends
+    queries to it. Yields the list of received query bodies.
+    """
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            requests.append(body)
+            if respond is not None:
+                respond(body)
+            data = json.dumps({'data': [{'count': len(requests)}], 'meta': [{'name': 'count'}]})
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    pool = connection_from_url('http://127.0.0.1:{}'.format(server.server_port))
+    try:
+        with patch('sentry.utils.snuba._snuba_pool', pool):
+            yield requests
+    finally:
+        server.shutdown()
+        server.server_close()
 
 
 class SnubaUtilsTest(TestCase):
@@ -183,3 +231,98 @@ class SnubaUtilsTest(TestCase):
 
         assert results[0]['time'] == 1546387200
         assert results[7]['time'] == 1546992000
+
+    def test_snap_time_window(self):
+        assert snap_time_window(
+            datetime(2019, 1, 2, 0, 10), datetime(2019, 1, 2, 0, 50), 3600,
+        ) == (datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 2, 1, 0))
+        assert snap_time_window(
+            datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 2, 1, 0), 3600,
+        ) == (datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 2, 1, 0))
+
+    def test_query_cache(self):
+        hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+
+        def run_query(end, rollup=3600, groupby=('time', )):
+            return raw_query(
+                start=end - timedelta(hours=2),
+                end=end,
+                groupby=list(groupby),
+                filter_keys={'project_id': [self.proj1.id]},
+                aggregations=[['count()', '', 'count']],
+                rollup=rollup,
+                referrer='test',
+            )
+
+        with snuba_server() as requests:
+            assert run_query(hour + timedelta(minutes=10))['data'] == [{'count': 1}]
+            assert run_query(hour + timedelta(minutes=10))['data'] == [{'count': 2}]
+
+            with self.options({'snuba.query-cache-ttl': 3600}):
+                assert run_query(hour + timedelta(minutes=10))['data'] == [{'count': 3}]
+                # Bounds within the same rollup interval share the cached result.
+                assert run_query(hour + timedelta(minutes=50))['data'] == [{'count': 3}]
+                # Consistent queries are never cached.
+                with options_override({'consistent': True}):
+                    assert run_query(hour + timedelta(minutes=10))['data'] == [{'count': 4}]
+
+                # Queries without a rollup keep their exact bounds.
+                end = hour + timedelta(minutes=10)
+                assert run_query(end, rollup=None)['data'] == [{'count': 5}]
+                assert run_query(end, rollup=None)['data'] == [{'count': 5}]
+                assert run_query(hour + timedelta(minutes=50), rollup=None)['data'] == \
+                    [{'count': 6}]
+
+                # So do queries with a rollup which are not grouped by time.
+                assert run_query(end, groupby=())['data'] == [{'count': 7}]
+
+        assert len(requests) == 7
+        assert requests[2]['from_date'] == (hour - timedelta(hours=2)).isoformat()
+        assert requests[2]['to_date'] == (hour + timedelta(hours=1)).isoformat()
+        assert requests[4]['from_date'] == (end - timedelta(hours=2)).isoformat()
+        assert requests[4]['to_date'] == end.isoformat()
+        assert requests[6]['from_date'] == (end - timedelta(hours=2)).isoformat()
+        assert requests[6]['to_date'] == end.isoformat()
+
+    def test_query_cache_key_ignores_order(self):
+        with snuba_server() as requests:
+            first = _cached_snuba_query(
+                {'project': [1], 'filter_keys': OrderedDict([('a', 1), ('b', 2)])}, {}, 60)
+            second = _cached_snuba_query(
+                {'filter_keys': OrderedDict([('b', 2), ('a', 1)]), 'project': [1]}, {}, 60)
+
+        assert first == second
+        assert len(requests) == 1
+
+    def test_query_cache_coalesces_concurrent_queries(self):
+        waiting = []
+        release = threading.Event()
+
+        def incr(key, **kwargs):
+            if key == 'snuba.query-cache.coalesced':
+                waiting.append(key)
+
+        with snuba_server(respond=lambda body: release.wait(10)) as requests, \
+                patch('sentry.utils.metrics.incr', side_effect=incr):
+            results = []
+
+            def run_query():
+                results.append(_cached_snuba_query(
+                    {'project': [self.proj1.id], 'from_date': 'coalesce'}, {}, 60))
+
+            threads = [threading.Thread(target=run_query) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+
+            # Only send the response once every other thread is waiting.
+            deadline = time.time() + 10
+            while len(waiting) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+
+            for thread in threads:
+                thread.join()
+
+        assert len(requests) == 1
+        assert len(set(results)) == 1
+        assert results[0][0] == 200
@@ -620,6 +620,26 @@ class StoreViewTest(TestCase):
             'version': '0.0.0',
         }
 
+    @mock.patch('sentry.coreapi.ClientApiHelper.insert_data_to_database')
+    def test_duplicate_event_id(self, mock_insert_data_to_database):
+        body = {
+            'event_id': 'a' * 32,
+            'message': 'foo bar',
+        }
+
+        mock_insert_data_to_database.side_effect = Exception('Boom!')
+        resp = self._postWithHeader(body)
+        assert resp.status_code == 500, (resp.status_code, resp.content)
+
+        # A failed event does not claim its ID.
+        mock_insert_data_to_database.side_effect = None
+        resp = self._postWithHeader(body)
+        assert resp.status_code == 200, (resp.status_code, resp.content)
+
+        resp = self._postWithHeader(body)
+        assert resp.status_code == 403, (resp.status_code, resp.content)
+        assert mock_insert_data_to_database.call_count == 2
+
     @mock.patch('sentry.coreapi.ClientApiHelper.insert_data_to_database', Mock())
     def test_accepted_signal(self):
         mock_event_accepted = Mock()
@@ -1 +1,21 @@
 from __future__ import absolute_import
+
+import mock
+
+from django.test import RequestFactory
+
+from sentry.testutils import TestCase
+from sentry.web.forms.accounts import AuthenticationForm
+
+
+class AuthenticationFormTest(TestCase):
+    @mock.patch('sentry.web.forms.accounts.ratelimiter.is_limited', return_value=True)
+    def test_ip_limit_does_not_count_username(self, is_limited):
+        request = RequestFactory().post('/auth/login/', REMOTE_ADDR='127.0.0.1')
+        form = AuthenticationForm(request)
+        form.cleaned_data = {'username': 'foo'}
+
+        # An IP over its limit must not be able to lock out the username.
+        assert form.is_rate_limited()
+        assert is_limited.call_count == 1
+        assert is_limited.call_args[0][0] == u'auth:ip:127.0.0.1'